@@ -26,11 +26,21 @@ def run_backtest(
     strategy_type: str,
     strategy_params: dict[str, Any],
     tickers: Union[str, List[str]],
+    persist: bool = True,
+    compact: bool = False,
+    float32: bool = False,
 ) -> tuple[pl.DataFrame, dict]:
-    """Execute the backtest using the given strategy and parameters."""
+    """
+    Execute the backtest using the given strategy and parameters.
+
+    Results are saved unless ``persist`` is False, which optimisers use to
+    avoid a database write for every candidate they evaluate. Callers that
+    only need the metrics can pass ``compact`` and ``float32`` to shrink the
+    returned results, as described in ``Backtester.run``.
+    """
     strategy = create_strategy(strategy_type, strategy_params)
     backtester = Backtester(data, strategy, tickers=tickers)
-    results = backtester.run()
+    results = backtester.run(persist=persist, compact=compact, float32=float32)
     metrics = backtester.get_performance_metrics()
     assert (
         metrics is not None
@@ -42,17 +52,22 @@ def create_strategy(
     strategy_type: str, strategy_params: dict[str, Any]
 ) -> BaseStrategy:
     """Create a trading strategy instance based on ``strategy_type``."""
+    return get_strategy_class(strategy_type)(strategy_params)  # type: ignore[call-arg]
+
+
+def get_strategy_class(strategy_type: str) -> type[BaseStrategy]:
+    """Return the strategy class implementing ``strategy_type``."""
     if strategy_type not in TRADING_STRATEGIES:
         raise ValueError("Invalid strategy type")
 
     match strategy_type:
         case "Buy and Hold":
-            return BuyAndHoldStrategy(strategy_params)
+            return BuyAndHoldStrategy
         case "Triple EMA Crossover (TEMO)":
-            return MovingAverageCrossoverStrategy(strategy_params)
+            return MovingAverageCrossoverStrategy
         case "Mean Reversion":
-            return MeanReversionStrategy(strategy_params)
+            return MeanReversionStrategy
         case "Pairs Trading":
-            return PairsTradingStrategy(strategy_params)
+            return PairsTradingStrategy
         case _:
             raise ValueError(f"Unexpected strategy type: {strategy_type}")
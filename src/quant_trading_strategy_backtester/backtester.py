@@ -10,14 +10,38 @@ this repository.
 import json
 import platform
 from datetime import date, datetime
+from typing import Any, NamedTuple
 
+import numpy as np
 import polars as pl
 import streamlit as st
 
+from quant_trading_strategy_backtester.cache import get_derived_returns
 from quant_trading_strategy_backtester.models import Session
 from quant_trading_strategy_backtester.models import StrategyModel as StrategyModel
 from quant_trading_strategy_backtester.strategies.base import BaseStrategy
 
+TRADING_DAYS_PER_YEAR = 252
+
+# The columns kept by compact backtest results.
+COMPACT_RESULT_COLUMNS = ["Date", "positions", "strategy_returns", "equity_curve"]
+
+# The metrics reported for each backtest, in display order.
+PERFORMANCE_METRICS = [
+    "Total Return",
+    "Sharpe Ratio",
+    "Max Drawdown",
+    "CAGR",
+    "Annualised Volatility",
+    "Sortino Ratio",
+    "Calmar Ratio",
+    "Max Drawdown Duration",
+    "Hit Rate",
+    "Skewness",
+    "Kurtosis",
+    "Exposure",
+]
+
 
 def is_running_locally() -> bool:
     """
@@ -31,6 +55,26 @@ def is_running_locally() -> bool:
     return bool(platform.processor())
 
 
+class BatchResults(NamedTuple):
+    """
+    Results of evaluating several position series against the same data.
+
+    Every array has one row per bar and one column per position series, in
+    the order the series were passed to ``Backtester.run_batch``.
+
+    Attributes:
+        strategy_returns: Per-bar strategy returns.
+        cumulative_returns: Cumulative product of ``1 + strategy_returns``.
+        equity_curves: Portfolio value over time for each series.
+        metrics: Performance metrics for each series.
+    """
+
+    strategy_returns: np.ndarray
+    cumulative_returns: np.ndarray
+    equity_curves: np.ndarray
+    metrics: list[dict[str, float]]
+
+
 class Backtester:
     """
     Backtests trading strategies.
@@ -60,22 +104,93 @@ class Backtester:
         self.results: None | pl.DataFrame = None
         self.session = session or Session()
         self.tickers = tickers
+        self._metrics: dict[str, float] | None = None
 
-    def run(self) -> pl.DataFrame:
+    def run(
+        self,
+        persist: bool = True,
+        lazy: bool = False,
+        compact: bool = False,
+        float32: bool = False,
+    ) -> pl.DataFrame:
         """
         Runs the backtest.
 
         Generates trading signals using the strategy, calculates returns,
-        stores the results, and saves them to the database.
+        stores the results, and optionally saves them to the database.
+
+        Args:
+            persist: Whether to save the results. Optimisers evaluating many
+                     candidates should pass False and save the winners in bulk
+                     with ``save_strategy_results``.
+            lazy: Whether to build the signals, returns and metrics as one
+                  lazy query plan and collect it once, letting Polars optimise
+                  and parallelise the whole backtest.
+            compact: Whether to keep only the ``COMPACT_RESULT_COLUMNS`` of the
+                     results, dropping the strategy's indicator columns.
+            float32: Whether to store the float columns of the results as
+                     float32, halving their memory.
 
         Returns:
             A DataFrame containing the backtest results.
         """
-        signals = self.strategy.generate_signals(self.data)
-        self.results = self._calculate_returns(signals)
-        self.save_results()
+        if lazy and not self.data.is_empty():
+            plan = self.build_plan()
+            results_plan = plan.select(COMPACT_RESULT_COLUMNS) if compact else plan
+            self.results, metrics = pl.collect_all(
+                [results_plan, plan.select(performance_metric_expressions())]
+            )
+            self._metrics = metrics.row(0, named=True)
+        else:
+            signals = self.strategy.generate_signals(self.data)
+            self.results = self._calculate_returns(signals)
+            self._metrics = None
+            if compact or float32:
+                # Compacting drops the cumulative returns and float32 loses
+                # precision, so calculate the metrics from the full results.
+                self._metrics = self.get_performance_metrics()
+        self.results = shape_results(self.results, compact, float32)
+        if persist:
+            self.save_results()
         return self.results
 
+    def build_plan(self) -> pl.LazyFrame:
+        """
+        Builds the backtest as a lazy query plan.
+
+        The plan produces the same columns as ``run``: the strategy's signals
+        followed by the asset returns, strategy returns, cumulative returns
+        and equity curve.
+
+        Returns:
+            A LazyFrame producing the backtest results.
+        """
+        data = self.data.lazy()
+        signals = self.strategy.generate_signals_lazy(data)
+        asset_returns = data.select(
+            _asset_returns_expression(self.data.columns).alias("asset_returns")
+        )
+        strategy_returns = pl.col("strategy_returns")
+        return (
+            pl.concat([signals, asset_returns], how="horizontal")
+            .with_columns(
+                (pl.col("positions").shift(1) * pl.col("asset_returns")).alias(
+                    "strategy_returns"
+                )
+            )
+            .with_columns(
+                strategy_returns.replace(
+                    {float("inf"): None, float("-inf"): None}
+                ).fill_null(0)
+            )
+            .with_columns(
+                (1 + strategy_returns).cum_prod().alias("cumulative_returns"),
+                (self.initial_capital * (1 + strategy_returns).cum_prod()).alias(
+                    "equity_curve"
+                ),
+            )
+        )
+
     def _calculate_returns(self, signals: pl.DataFrame) -> pl.DataFrame:
         """
         Calculates returns based on the generated signals.
@@ -93,24 +208,7 @@ class Backtester:
         if "Date" not in signals.columns:
             raise ValueError("'Date' column is missing from the signals DataFrame")
 
-        # Pairs trading
-        if "Close_1" in self.data.columns and "Close_2" in self.data.columns:
-            asset_returns = (
-                self.data["Close_1"] - self.data["Close_1"].shift(1)
-            ) / self.data["Close_1"].shift(1) - (
-                self.data["Close_2"] - self.data["Close_2"].shift(1)
-            ) / self.data[
-                "Close_2"
-            ].shift(
-                1
-            )
-        # Single asset trading
-        elif "Close" in self.data.columns:
-            asset_returns = (
-                self.data["Close"] - self.data["Close"].shift(1)
-            ) / self.data["Close"].shift(1)
-        else:
-            raise ValueError("Data does not contain required 'Close' columns")
+        asset_returns = self._calculate_asset_returns()
 
         portfolio = signals.with_columns(
             [
@@ -142,44 +240,80 @@ class Backtester:
 
         return portfolio
 
+    def _calculate_asset_returns(self) -> pl.Series:
+        """
+        Calculates the per-bar returns of the traded asset or asset pair.
+
+        The returns are shared through a cache keyed by the closing prices, so
+        repeated backtests on the same data only calculate them once.
+
+        Returns:
+            The simple returns of the asset, or the difference between the
+            simple returns of the two assets for pairs trading.
+        """
+        derived_returns = get_derived_returns(self.data)
+        # Pairs trading
+        if "spread" in derived_returns:
+            return derived_returns["spread"]
+        # Single asset trading
+        return derived_returns["simple_returns"]
+
+    def run_batch(self, positions: pl.DataFrame | np.ndarray) -> BatchResults:
+        """
+        Evaluates many position series against the data in one vectorised pass.
+
+        Each column of ``positions`` is treated as the ``positions`` column a
+        strategy would produce for one parameter set. Returns, cumulative
+        returns, equity curves and metrics are computed for all columns at
+        once, which avoids rebuilding a backtest per parameter set. Batch runs
+        are not saved to the database.
+
+        Args:
+            positions: A matrix of positions with one row per bar in ``data``
+                and one column per parameter set.
+
+        Returns:
+            The batch results, with one column per position series.
+        """
+        if isinstance(positions, pl.DataFrame):
+            positions = positions.cast(pl.Float64).to_numpy()
+        positions = np.asarray(positions, dtype=np.float64)
+        if positions.ndim == 1:
+            positions = positions[:, np.newaxis]
+        if positions.shape[0] != self.data.height:
+            raise ValueError(
+                f"Expected {self.data.height} rows of positions, "
+                f"got {positions.shape[0]}"
+            )
+
+        asset_returns = self._calculate_asset_returns().cast(pl.Float64).to_numpy()
+        return evaluate_position_batch(asset_returns, positions, self.initial_capital)
+
     def get_performance_metrics(self) -> dict[str, float] | None:
         """
         Calculates key performance metrics from the trading strategy backtest.
 
-        Computes the total return, Sharpe ratio, and maximum drawdown based on
-        the backtest results.
+        Computes a full tearsheet from the backtest results in a single pass:
+        the total return, Sharpe ratio and maximum drawdown, along with the
+        CAGR, annualised volatility, Sortino and Calmar ratios, maximum
+        drawdown duration in bars, hit rate, skewness, excess kurtosis and
+        exposure.
 
         Returns:
-            A dictionary containing performance metrics, or None if the backtest
-            hasn't been run yet.
+            A dictionary containing the metrics in ``PERFORMANCE_METRICS``, or
+            None if the backtest hasn't been run yet.
         """
         if self.results is None:
             return None
-
-        total_return = (
-            float(self.results["cumulative_returns"].cast(pl.Float64).tail(1).item())
-            - 1
-        )
-
-        # Measure the risk-adjusted return, assuming 252 trading days per year.
-        returns_mean = float(self.results["strategy_returns"].cast(pl.Float64).mean())  # type: ignore
-        returns_std = float(self.results["strategy_returns"].cast(pl.Float64).std())  # type: ignore
-        if returns_std != 0:
-            sharpe_ratio = float((252**0.5) * returns_mean / returns_std)
-        else:
-            sharpe_ratio = float("nan")
-
-        # Measure the maximum loss from a peak to a trough of the equity curve.
-        drawdowns = (
-            self.results["equity_curve"] / self.results["equity_curve"].cum_max() - 1
+        if self._metrics is not None:
+            return dict(self._metrics)
+
+        return (
+            self.results.lazy()
+            .select(performance_metric_expressions())
+            .collect()
+            .row(0, named=True)
         )
-        max_drawdown = float(drawdowns.cast(pl.Float64).min())  # type: ignore
-
-        return {
-            "Total Return": total_return,
-            "Sharpe Ratio": sharpe_ratio,
-            "Max Drawdown": max_drawdown,
-        }
 
     def save_results(self) -> None:
         """
@@ -190,83 +324,354 @@ class Backtester:
         if metrics is None:
             raise ValueError("Backtest hasn't been run yet. Call run() first.")
 
-        strategy_params = self.strategy.get_parameters()
-        strategy_name = self.strategy.__class__.__name__
-
-        # Extract tickers from data columns if not provided
-        if self.tickers is None:
-            if "Close_1" in self.data.columns and "Close_2" in self.data.columns:
-                pass
-            else:
-                pass
-
-        # Determine start and end dates
-        start_date_row = self.data.select(
-            pl.col("Date").dt.year().alias("year"),
-            pl.col("Date").dt.month().alias("month"),
-            pl.col("Date").dt.day().alias("day"),
-        ).row(0)
-        end_date_row = self.data.select(
-            pl.col("Date").dt.year().alias("year"),
-            pl.col("Date").dt.month().alias("month"),
-            pl.col("Date").dt.day().alias("day"),
-        ).row(-1)
-
-        start_date = date(start_date_row[0], start_date_row[1], start_date_row[2])
-        end_date = date(end_date_row[0], end_date_row[1], end_date_row[2])
-
-        if is_running_locally():
-            try:
+        record = build_result_record(
+            self.data,
+            self.strategy.__class__.__name__,
+            self.strategy.get_parameters(),
+            metrics,
+            self.tickers,
+        )
+        save_strategy_results([record], self.session)
+
+
+def evaluate_position_batch(
+    asset_returns: np.ndarray, positions: np.ndarray, initial_capital: float
+) -> BatchResults:
+    """
+    Evaluates many position series against their asset returns at once.
+
+    Args:
+        asset_returns: The per-bar returns of the traded asset, either one
+            series shared by every position series or one column per series.
+        positions: A matrix of positions with one row per bar and one column
+            per series.
+        initial_capital: The initial capital of each backtest.
+
+    Returns:
+        The batch results, with one column per position series.
+    """
+    if asset_returns.ndim == 1:
+        asset_returns = asset_returns[:, np.newaxis]
+    strategy_returns = np.zeros_like(positions)
+    strategy_returns[1:] = positions[:-1] * asset_returns[1:]
+    # Missing and infinite returns count as flat, as in _calculate_returns.
+    strategy_returns[~np.isfinite(strategy_returns)] = 0.0
+
+    cumulative_returns = np.cumprod(1 + strategy_returns, axis=0)
+    equity_curves = initial_capital * cumulative_returns
+    metrics = _calculate_batch_metrics(
+        positions, strategy_returns, cumulative_returns, equity_curves
+    )
+    return BatchResults(strategy_returns, cumulative_returns, equity_curves, metrics)
+
+
+def shape_results(
+    results: pl.DataFrame, compact: bool = False, float32: bool = False
+) -> pl.DataFrame:
+    """
+    Reduces the memory held by backtest results.
+
+    Args:
+        results: The backtest results.
+        compact: Whether to keep only the ``COMPACT_RESULT_COLUMNS``.
+        float32: Whether to cast the float64 columns to float32.
+
+    Returns:
+        The reshaped results.
+    """
+    if compact:
+        results = results.select(
+            column for column in COMPACT_RESULT_COLUMNS if column in results.columns
+        )
+    if float32:
+        results = results.with_columns(pl.col(pl.Float64).cast(pl.Float32))
+    return results
+
+
+def performance_metric_expressions() -> list[pl.Expr]:
+    """
+    Builds the expressions for the metrics of ``get_performance_metrics``.
+
+    The expressions aggregate the columns of the backtest results, so they
+    can be appended to a lazy backtest plan as well as applied to collected
+    results. Selected together, Polars shares the common subexpressions such
+    as the cast returns, their moments and the drawdowns, so the whole
+    tearsheet is computed in a single pass.
+
+    Returns:
+        Expressions for every metric in ``PERFORMANCE_METRICS``.
+    """
+    strategy_returns = pl.col("strategy_returns").cast(pl.Float64)
+    equity_curve = pl.col("equity_curve").cast(pl.Float64)
+    annualisation = TRADING_DAYS_PER_YEAR**0.5
+
+    total_return = pl.col("cumulative_returns").cast(pl.Float64).last() - 1
+    cagr = (total_return + 1).pow(TRADING_DAYS_PER_YEAR / pl.len()) - 1
+
+    # Measure the risk-adjusted return, assuming 252 trading days per year.
+    returns_mean = strategy_returns.mean()
+    returns_std = strategy_returns.std()
+    sharpe_ratio = (
+        pl.when(returns_std != 0)
+        .then(annualisation * returns_mean / returns_std)
+        .otherwise(float("nan"))
+    )
+    # The Sortino ratio only penalises returns below zero.
+    downside_deviation = strategy_returns.clip(upper_bound=0.0).pow(2).mean().sqrt()
+    sortino_ratio = (
+        pl.when(downside_deviation != 0)
+        .then(annualisation * returns_mean / downside_deviation)
+        .otherwise(float("nan"))
+    )
+
+    # Measure the maximum loss from a peak to a trough of the equity curve,
+    # and the longest time spent below a previous peak.
+    drawdown = equity_curve / equity_curve.cum_max() - 1
+    max_drawdown = drawdown.min()
+    bar_index = pl.int_range(pl.len())
+    last_peak = pl.when(drawdown == 0).then(bar_index).forward_fill()
+    max_drawdown_duration = (bar_index - last_peak).max().cast(pl.Float64)
+    calmar_ratio = (
+        pl.when(max_drawdown != 0)
+        .then(cagr / max_drawdown.abs())
+        .otherwise(float("nan"))
+    )
+
+    # A bar is exposed to the asset when the previous bar held a position.
+    exposed = pl.col("positions").cast(pl.Float64).shift(1, fill_value=0.0) != 0
+
+    return [
+        total_return.alias("Total Return"),
+        sharpe_ratio.alias("Sharpe Ratio"),
+        max_drawdown.alias("Max Drawdown"),
+        cagr.alias("CAGR"),
+        (annualisation * returns_std).alias("Annualised Volatility"),
+        sortino_ratio.alias("Sortino Ratio"),
+        calmar_ratio.alias("Calmar Ratio"),
+        max_drawdown_duration.alias("Max Drawdown Duration"),
+        ((strategy_returns > 0).sum() / (strategy_returns != 0).sum()).alias(
+            "Hit Rate"
+        ),
+        strategy_returns.skew().alias("Skewness"),
+        strategy_returns.kurtosis().alias("Kurtosis"),
+        exposed.mean().cast(pl.Float64).alias("Exposure"),
+    ]
+
+
+def _asset_returns_expression(columns: list[str]) -> pl.Expr:
+    """
+    Builds an expression for the per-bar returns of the traded asset or asset
+    pair, matching ``Backtester._calculate_asset_returns``.
+    """
+    close_1 = pl.col("Close_1")
+    close_2 = pl.col("Close_2")
+    # Pairs trading
+    if "Close_1" in columns and "Close_2" in columns:
+        return (close_1 - close_1.shift(1)) / close_1.shift(1) - (
+            close_2 - close_2.shift(1)
+        ) / close_2.shift(1)
+    # Single asset trading
+    if "Close" in columns:
+        close = pl.col("Close")
+        return (close - close.shift(1)) / close.shift(1)
+    raise ValueError("Data does not contain required 'Close' columns")
+
+
+def build_result_record(
+    data: pl.DataFrame,
+    strategy_name: str,
+    strategy_params: dict[str, Any],
+    metrics: dict[str, float],
+    tickers: str | list[str] | None,
+) -> dict[str, Any]:
+    """
+    Builds the record stored for a backtest run.
+
+    Args:
+        data: The historical data the backtest was run on.
+        strategy_name: The class name of the strategy.
+        strategy_params: The parameters of the strategy.
+        metrics: The performance metrics of the run.
+        tickers: The ticker or tickers used in the backtest.
+
+    Returns:
+        A dictionary describing the run, suitable for ``save_strategy_results``.
+    """
+    # Determine start and end dates
+    start_date_row = data.select(
+        pl.col("Date").dt.year().alias("year"),
+        pl.col("Date").dt.month().alias("month"),
+        pl.col("Date").dt.day().alias("day"),
+    ).row(0)
+    end_date_row = data.select(
+        pl.col("Date").dt.year().alias("year"),
+        pl.col("Date").dt.month().alias("month"),
+        pl.col("Date").dt.day().alias("day"),
+    ).row(-1)
+
+    return {
+        "name": strategy_name,
+        "parameters": strategy_params,
+        "total_return": metrics["Total Return"],
+        "sharpe_ratio": metrics["Sharpe Ratio"],
+        "max_drawdown": metrics["Max Drawdown"],
+        "tickers": tickers,
+        "start_date": date(start_date_row[0], start_date_row[1], start_date_row[2]),
+        "end_date": date(end_date_row[0], end_date_row[1], end_date_row[2]),
+    }
+
+
+def save_strategy_results(records: list[dict[str, Any]], session=None) -> None:
+    """
+    Saves backtest records to either the local database or session state,
+    depending on the environment.
+
+    All records are written in a single transaction, so optimisers can
+    evaluate candidates without persisting them and save only the winning
+    runs at the end.
+
+    Args:
+        records: Records created by ``build_result_record``.
+        session: The database session to use. A new session is created if
+                 not provided.
+    """
+    if not records:
+        return
+
+    if is_running_locally():
+        session = session or Session()
+        try:
+            saved = 0
+            for record in records:
                 # Check if a strategy with the same name, parameters, and date
                 # range already exists
                 existing_strategy = (
-                    self.session.query(StrategyModel)
+                    session.query(StrategyModel)
                     .filter_by(
-                        name=strategy_name,
-                        parameters=json.dumps(strategy_params),
-                        start_date=start_date,
-                        end_date=end_date,
+                        name=record["name"],
+                        parameters=json.dumps(record["parameters"]),
+                        start_date=record["start_date"],
+                        end_date=record["end_date"],
                     )
                     .first()
                 )
 
                 if existing_strategy is None:
-                    new_strategy = StrategyModel(
-                        name=strategy_name,
-                        parameters=json.dumps(strategy_params),
-                        total_return=metrics["Total Return"],
-                        sharpe_ratio=metrics["Sharpe Ratio"],
-                        max_drawdown=metrics["Max Drawdown"],
-                        tickers=json.dumps(self.tickers),
-                        start_date=start_date,
-                        end_date=end_date,
+                    session.add(
+                        StrategyModel(
+                            name=record["name"],
+                            parameters=json.dumps(record["parameters"]),
+                            total_return=record["total_return"],
+                            sharpe_ratio=record["sharpe_ratio"],
+                            max_drawdown=record["max_drawdown"],
+                            tickers=json.dumps(record["tickers"]),
+                            start_date=record["start_date"],
+                            end_date=record["end_date"],
+                        )
                     )
-                    self.session.add(new_strategy)
-                    self.session.commit()
-                    print(f"Strategy {strategy_name} saved successfully.")
+                    saved += 1
+                    print(f"Strategy {record['name']} saved successfully.")
                 else:
                     print(
-                        f"Strategy {strategy_name} with same parameters already exists. Skipping save."
+                        f"Strategy {record['name']} with same parameters already exists. Skipping save."
                     )
-            except Exception as e:
-                self.session.rollback()
-                raise ValueError(f"Failed to save strategy results: {str(e)}")
-        else:
-            # Use Streamlit session state for cloud deployment
-            if "strategy_results" not in st.session_state:
-                st.session_state.strategy_results = []
-
+            if saved:
+                session.commit()
+        except Exception as e:
+            session.rollback()
+            raise ValueError(f"Failed to save strategy results: {str(e)}")
+    else:
+        # Use Streamlit session state for cloud deployment
+        if "strategy_results" not in st.session_state:
+            st.session_state.strategy_results = []
+
+        for record in records:
             st.session_state.strategy_results.append(
-                {
-                    "date_created": datetime.now(),
-                    "name": strategy_name,
-                    "parameters": strategy_params,
-                    "total_return": metrics["Total Return"],
-                    "sharpe_ratio": metrics["Sharpe Ratio"],
-                    "max_drawdown": metrics["Max Drawdown"],
-                    "tickers": self.tickers,
-                    "start_date": start_date,
-                    "end_date": end_date,
-                }
+                {"date_created": datetime.now()} | record
             )
-            print(f"Strategy {strategy_name} saved to session state.")
+            print(f"Strategy {record['name']} saved to session state.")
+
+
+def _calculate_batch_metrics(
+    positions: np.ndarray,
+    strategy_returns: np.ndarray,
+    cumulative_returns: np.ndarray,
+    equity_curves: np.ndarray,
+) -> list[dict[str, float]]:
+    """
+    Calculates the same metrics as ``Backtester.get_performance_metrics`` for
+    every column of a batch of backtests.
+
+    Args:
+        positions: Per-bar positions, one column per backtest.
+        strategy_returns: Per-bar strategy returns, one column per backtest.
+        cumulative_returns: Cumulative returns, one column per backtest.
+        equity_curves: Equity curves, one column per backtest.
+
+    Returns:
+        A list of metrics dictionaries, one per column.
+    """
+    num_bars, num_series = strategy_returns.shape
+    if num_bars == 0:
+        return [
+            dict.fromkeys(PERFORMANCE_METRICS, float("nan")) for _ in range(num_series)
+        ]
+
+    annualisation = TRADING_DAYS_PER_YEAR**0.5
+    metrics: dict[str, np.ndarray] = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        metrics["Total Return"] = cumulative_returns[-1] - 1
+        metrics["CAGR"] = (
+            cumulative_returns[-1] ** (TRADING_DAYS_PER_YEAR / num_bars) - 1
+        )
+
+        # Measure the risk-adjusted return, assuming 252 trading days per year.
+        returns_mean = strategy_returns.mean(axis=0)
+        if num_bars > 1:
+            returns_std = strategy_returns.std(axis=0, ddof=1)
+        else:
+            returns_std = np.full(num_series, np.nan)
+        metrics["Sharpe Ratio"] = np.where(
+            returns_std != 0, annualisation * returns_mean / returns_std, np.nan
+        )
+        metrics["Annualised Volatility"] = annualisation * returns_std
+        downside_deviation = np.sqrt(
+            (np.minimum(strategy_returns, 0.0) ** 2).mean(axis=0)
+        )
+        metrics["Sortino Ratio"] = np.where(
+            downside_deviation != 0,
+            annualisation * returns_mean / downside_deviation,
+            np.nan,
+        )
+
+        # Measure the maximum loss from a peak to a trough of the equity curve,
+        # and the longest time spent below a previous peak.
+        drawdowns = equity_curves / np.maximum.accumulate(equity_curves, axis=0) - 1
+        metrics["Max Drawdown"] = drawdowns.min(axis=0)
+        bar_index = np.arange(num_bars)[:, np.newaxis]
+        last_peak = np.maximum.accumulate(
+            np.where(drawdowns == 0, bar_index, 0), axis=0
+        )
+        metrics["Max Drawdown Duration"] = (bar_index - last_peak).max(axis=0)
+        metrics["Calmar Ratio"] = np.where(
+            metrics["Max Drawdown"] != 0,
+            metrics["CAGR"] / np.abs(metrics["Max Drawdown"]),
+            np.nan,
+        )
+
+        metrics["Hit Rate"] = (strategy_returns > 0).sum(axis=0) / (
+            strategy_returns != 0
+        ).sum(axis=0)
+        # Biased sample skewness and excess kurtosis, as Polars calculates.
+        deviations = strategy_returns - returns_mean
+        second_moment = (deviations**2).mean(axis=0)
+        metrics["Skewness"] = (deviations**3).mean(axis=0) / second_moment**1.5
+        metrics["Kurtosis"] = (deviations**4).mean(axis=0) / second_moment**2 - 3
+
+        # A bar is exposed to the asset when the previous bar held a position.
+        metrics["Exposure"] = (positions[:-1] != 0).sum(axis=0) / num_bars
+
+    return [
+        {name: float(metrics[name][i]) for name in PERFORMANCE_METRICS}
+        for i in range(num_series)
+    ]
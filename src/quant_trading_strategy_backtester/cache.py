@@ -0,0 +1,170 @@
+"""
+Contains in-memory caches shared by backtests that run on the same data, such
+as the derived return series used by the optimisers.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+import numpy as np
+import polars as pl
+
+DERIVED_RETURNS_CACHE_SIZE = 32
+
+
+class LRUCache:
+    """
+    A thread-safe mapping that evicts the least recently used entry once it
+    holds more than ``maxsize`` entries.
+
+    Attributes:
+        maxsize: The maximum number of entries kept in the cache.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Gets a cached value and marks it as recently used.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The cached value, or None if the key is not cached.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Caches a value, evicting the least recently used entry if needed.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def dataset_fingerprint(data: pl.DataFrame) -> str:
+    """
+    Computes a content fingerprint of a DataFrame.
+
+    The fingerprint covers the column names, dtypes, null masks and values,
+    so two frames with the same contents share a fingerprint regardless of
+    object identity. It is a single hash over the raw column buffers, which
+    is far cheaper than the calculations it is used to skip.
+
+    Args:
+        data: The DataFrame to fingerprint.
+
+    Returns:
+        A hexadecimal digest identifying the contents of ``data``.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(data.shape).encode())
+    for name, series in data.to_dict().items():
+        digest.update(f"{name}:{series.dtype}".encode())
+        physical = series.to_physical()
+        if physical.dtype.is_numeric() or physical.dtype == pl.Boolean:
+            digest.update(physical.is_null().to_numpy().tobytes())
+            values = physical.fill_null(0).to_numpy()
+            digest.update(np.ascontiguousarray(values).tobytes())
+        else:
+            digest.update("\x1f".join(map(str, series.to_list())).encode())
+    return digest.hexdigest()
+
+
+_derived_returns_cache = LRUCache(DERIVED_RETURNS_CACHE_SIZE)
+
+
+def get_derived_returns(data: pl.DataFrame) -> dict[str, pl.Series]:
+    """
+    Gets the return series derived from the closing prices in ``data``.
+
+    Results are cached by the content fingerprint of the closing prices, so
+    repeated backtests on the same prices reuse them, even from a different
+    DataFrame.
+
+    Args:
+        data: Historical price data with either a 'Close' column or
+              'Close_1' and 'Close_2' columns.
+
+    Returns:
+        A dictionary with the following series:
+        - 'simple_returns': The simple returns of the asset, or of the first
+          asset for pairs data.
+        - 'log_returns': The log returns of the same asset.
+        - 'spread': For pairs data, the difference between the simple returns
+          of the two assets. Absent for single asset data.
+    """
+    if "Close_1" in data.columns and "Close_2" in data.columns:
+        close_columns = [data["Close_1"], data["Close_2"]]
+    elif "Close" in data.columns:
+        close_columns = [data["Close"]]
+    else:
+        raise ValueError("Data does not contain required 'Close' columns")
+
+    key = dataset_fingerprint(pl.DataFrame(close_columns))
+    derived = _derived_returns_cache.get(key)
+    if derived is None:
+        derived = _calculate_derived_returns(close_columns)
+        _derived_returns_cache.put(key, derived)
+    return derived
+
+
+def clear_derived_returns_cache() -> None:
+    """Removes every cached set of derived returns."""
+    _derived_returns_cache.clear()
+
+
+def _calculate_derived_returns(close_columns: list[pl.Series]) -> dict[str, pl.Series]:
+    """
+    Calculates the derived return series for ``get_derived_returns``.
+
+    Args:
+        close_columns: The closing price columns of the data.
+
+    Returns:
+        The derived return series.
+    """
+    close = close_columns[0]
+    simple_returns = (close - close.shift(1)) / close.shift(1)
+    derived = {
+        "simple_returns": simple_returns,
+        "log_returns": (close / close.shift(1)).log(),
+    }
+    if len(close_columns) == 2:
+        close_2 = close_columns[1]
+        derived["spread"] = simple_returns - (close_2 - close_2.shift(1)) / (
+            close_2.shift(1)
+        )
+    return derived
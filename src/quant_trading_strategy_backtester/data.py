@@ -4,97 +4,195 @@ Yahoo Finance and Wikipedia.
 """
 
 import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import polars as pl
 import streamlit as st
 import yfinance as yf
 
-from quant_trading_strategy_backtester.utils import logger
+from quant_trading_strategy_backtester.price_store import PriceStore
+from quant_trading_strategy_backtester.universe import UNIVERSE_SCHEMA, UniverseSnapshot
+from quant_trading_strategy_backtester.utils import (
+    PRICE_STORE_DIR,
+    UNIVERSE_SNAPSHOT_PATH,
+    UNIVERSE_SNAPSHOT_TTL,
+    logger,
+)
+
+MAX_CONCURRENT_METADATA_REQUESTS = 16
+# Legal suffixes ignored when comparing company names.
+COMPANY_SUFFIXES = {
+    "co",
+    "company",
+    "corp",
+    "corporation",
+    "inc",
+    "incorporated",
+    "limited",
+    "ltd",
+    "plc",
+}
+
+price_store = PriceStore(PRICE_STORE_DIR)
+# The fetcher is looked up when called, as it is defined further down.
+universe_snapshot = UniverseSnapshot(
+    UNIVERSE_SNAPSHOT_PATH, UNIVERSE_SNAPSHOT_TTL, lambda: fetch_sp500_universe()
+)
 
 
-@st.cache_data
 def load_yfinance_data_one_ticker(
     ticker: str, start_date: datetime.date, end_date: datetime.date
 ) -> pl.DataFrame:
     """
     Fetches historical stock data for a ticker from Yahoo Finance.
 
+    Prices are kept in the local price store, so only dates that have not
+    been loaded before are downloaded.
+
     Args:
         ticker: The stock ticker symbol.
         start_date: The start date for the data.
-        end_date: The end date for the data.
+        end_date: The end date for the data, inclusive.
 
     Returns:
         A Polars DataFrame containing the historical stock data.
     """
-    data = yf.download(ticker, start=start_date, end=end_date)
-    # Handle MultiIndex columns by taking just the first level
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = data.columns.get_level_values(0)
-    # Reset index to make Date a regular column
-    data = data.reset_index()
-
-    return pl.from_pandas(data)
+    return price_store.load(ticker, start_date, end_date, download_yfinance_data)
 
 
-@st.cache_data
 def load_yfinance_data_two_tickers(
     ticker1: str, ticker2: str, start_date: datetime.date, end_date: datetime.date
 ) -> pl.DataFrame:
     """
     Fetches historical stock data for two tickers from Yahoo Finance.
 
+    Each ticker is loaded through the local price store, so a ticker shared
+    by several pairs is only downloaded once. The closing prices are joined
+    on their dates, keeping the dates on which both tickers have a price.
+
     Args:
         ticker1: The first stock ticker symbol.
         ticker2: The second stock ticker symbol.
         start_date: The start date for the data.
-        end_date: The end date for the data.
+        end_date: The end date for the data, inclusive.
 
     Returns:
         A Polars DataFrame containing the historical stock data for both tickers.
     """
-    data1 = yf.download(ticker1, start=start_date, end=end_date)
-    data2 = yf.download(ticker2, start=start_date, end=end_date)
-    data1 = data1.reset_index()
-    data2 = data2.reset_index()
-    combined_data = pl.DataFrame(
-        {
-            "Date": pl.from_pandas(data1["Date"]),
-            "Close_1": pl.from_pandas(data1["Close"]),
-            "Close_2": pl.from_pandas(data2["Close"]),
-        }
+    data1 = load_yfinance_data_one_ticker(ticker1, start_date, end_date)
+    data2 = load_yfinance_data_one_ticker(ticker2, start_date, end_date)
+    if data1.is_empty() or data2.is_empty():
+        return pl.DataFrame(
+            schema={
+                "Date": pl.Datetime("ns"),
+                "Close_1": pl.Float64,
+                "Close_2": pl.Float64,
+            }
+        )
+
+    combined_data = (
+        data1.select("Date", pl.col("Close").cast(pl.Float64).alias("Close_1"))
+        .join(
+            data2.select("Date", pl.col("Close").cast(pl.Float64).alias("Close_2")),
+            on="Date",
+            how="inner",
+        )
+        .filter(pl.col("Close_1").is_finite() & pl.col("Close_2").is_finite())
+        .sort("Date")
     )
 
     return combined_data
 
 
-@st.cache_data
-def get_ticker_market_cap(ticker: str) -> tuple[str, float | None]:
+def load_yfinance_data_many_tickers(
+    tickers: list[str], start_date: datetime.date, end_date: datetime.date
+) -> pl.DataFrame:
+    """
+    Fetches historical stock data for many tickers from Yahoo Finance.
+
+    Tickers already held in the local price store for the whole date range
+    are read locally. The rest are downloaded together in one batched request
+    instead of one request per ticker. Tickers missing from the batched
+    response are downloaded on their own, so a failed or partial batch is
+    not stored as an empty range.
+
+    Args:
+        tickers: The stock ticker symbols.
+        start_date: The start date for the data.
+        end_date: The end date for the data, inclusive.
+
+    Returns:
+        A long Polars DataFrame with 'Date' and 'Ticker' columns followed by
+        the price columns, sorted by ticker in the order given and then by
+        date. Tickers without data are left out.
+    """
+    to_download = [
+        ticker
+        for ticker in tickers
+        if price_store.missing_ranges(ticker, start_date, end_date)
+    ]
+    downloaded = (
+        download_yfinance_data_many_tickers(to_download, start_date, end_date)
+        if to_download
+        else {}
+    )
+
+    def fetch_downloaded(
+        ticker: str, start: datetime.date, end: datetime.date
+    ) -> pl.DataFrame:
+        data = downloaded.get(ticker)
+        if data is None:
+            return download_yfinance_data(ticker, start, end)
+        return data.filter(pl.col("Date").cast(pl.Date).is_between(start, end))
+
+    frames = []
+    for ticker in tickers:
+        data = price_store.load(ticker, start_date, end_date, fetch_downloaded)
+        if not data.is_empty():
+            frames.append(data.with_columns(pl.lit(ticker).alias("Ticker")))
+    if not frames:
+        return pl.DataFrame(schema={"Date": pl.Datetime("ns"), "Ticker": pl.String})
+
+    combined_data = pl.concat(frames, how="diagonal_relaxed")
+    return combined_data.select("Date", "Ticker", pl.exclude("Date", "Ticker"))
+
+
+def download_yfinance_data(
+    ticker: str, start_date: datetime.date, end_date: datetime.date
+) -> pl.DataFrame:
     """
-    Fetch market cap data for a single ticker from Yahoo Finance.
+    Downloads historical stock data for a ticker from Yahoo Finance, bypassing
+    the local price store.
 
     Args:
         ticker: The stock ticker symbol.
+        start_date: The start date for the data.
+        end_date: The end date for the data, inclusive.
 
     Returns:
-        A tuple containing the ticker symbol and market cap if available.
+        A Polars DataFrame containing the historical stock data.
     """
-    data = yf.Ticker(ticker).info
-    market_cap = data.get("marketCap")
-    if market_cap is None:
-        logger.error(f"Market cap data for {ticker} is unavailable")
-        return ticker, None
+    # Yahoo Finance treats the end date as exclusive.
+    data = yf.download(
+        ticker, start=start_date, end=end_date + datetime.timedelta(days=1)
+    )
+    # Handle MultiIndex columns by taking just the first level
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    # Reset index to make Date a regular column
+    data = data.reset_index()
 
-    return ticker, market_cap
+    return pl.from_pandas(data)
 
 
-@st.cache_data
 def get_top_sp500_companies(num_companies: int) -> list[tuple[str, float]]:
     """
-    Fetches the top X companies in the S&P 500 index by market cap using
-    yfinance.
+    Fetches the top X companies in the S&P 500 index by market cap.
+
+    The companies come from the local universe snapshot, which is refreshed
+    in the background once it is older than its time to live.
 
     Args:
         num_companies: The number of top companies to fetch.
@@ -104,29 +202,132 @@ def get_top_sp500_companies(num_companies: int) -> list[tuple[str, float]]:
         of each company in the top X of the S&P 500 index, sorted by market
         cap.
     """
+    sp500_companies = (
+        universe_snapshot.load()
+        .filter(pl.col("Market Cap").is_not_null())
+        .sort("Market Cap", descending=True, maintain_order=True)
+    )
+    if num_companies > 0:
+        sp500_companies = sp500_companies.head(num_companies)
+
+    return list(sp500_companies.select("Ticker", "Market Cap").iter_rows())
+
+
+def fetch_sp500_universe() -> pl.DataFrame:
+    """
+    Fetches the S&P 500 constituents and their metadata from Wikipedia and
+    Yahoo Finance.
+
+    Returns:
+        A DataFrame with the 'Ticker', 'Market Cap', 'Long Name' and 'Sector'
+        of each constituent. Metadata that could not be fetched is null.
+    """
     # Fetch the list of S&P 500 companies from the Wikipedia table.
     SOURCE = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
     sp500_constituents = pd.read_html(SOURCE)[0]
     tickers = sp500_constituents["Symbol"].to_list()
+    sectors = sp500_constituents["GICS Sector"].to_list()
+
+    # Fetch the metadata with a bounded number of concurrent requests.
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_METADATA_REQUESTS) as executor:
+        metadata = list(executor.map(get_ticker_metadata, tickers))
+    for ticker, (market_cap, _) in zip(tickers, metadata):
+        if market_cap is None:
+            logger.error(f"Market cap data for {ticker} is unavailable")
 
-    # Fetch market cap data with threading for faster execution.
-    sp500_companies = []
-    with ThreadPoolExecutor() as executor:
-        future_to_ticker = {
-            executor.submit(get_ticker_market_cap, ticker): ticker for ticker in tickers
-        }
-        for future in as_completed(future_to_ticker):
-            ticker, market_cap = future.result()
-            if market_cap is not None:
-                sp500_companies.append((ticker, market_cap))
-
-    # Sort companies by market cap (descending) and take the top X companies.
-    sorted_companies = sorted(sp500_companies, key=lambda x: x[1], reverse=True)
-    top_companies = (
-        sorted_companies[:num_companies] if num_companies > 0 else sorted_companies
+    return pl.DataFrame(
+        {
+            "Ticker": tickers,
+            "Market Cap": [market_cap for market_cap, _ in metadata],
+            "Long Name": [long_name for _, long_name in metadata],
+            "Sector": sectors,
+        },
+        schema=UNIVERSE_SCHEMA,
     )
 
-    return top_companies
+
+def get_ticker_metadata(ticker: str) -> tuple[float | None, str | None]:
+    """
+    Fetch the market cap and long name of a ticker from Yahoo Finance.
+
+    Args:
+        ticker: The stock ticker symbol.
+
+    Returns:
+        A tuple containing the market cap and long name, each None if
+        unavailable.
+    """
+    try:
+        info = yf.Ticker(ticker).info
+    except Exception as e:
+        logger.error(f"Failed to fetch metadata for {ticker}: {e}")
+        return None, None
+
+    return info.get("marketCap"), info.get("longName")
+
+
+def get_company_identity_index(tickers: list[str]) -> dict[str, str]:
+    """
+    Maps each ticker to an identifier of the company that issued it, so that
+    share classes of the same company, such as GOOG and GOOGL, share an
+    identifier.
+
+    Identifiers come from the long names in the universe snapshot. Only the
+    tickers missing from the snapshot have their names fetched, once per
+    ticker rather than once per pair of tickers.
+
+    Args:
+        tickers: The stock ticker symbols.
+
+    Returns:
+        A dictionary mapping each ticker to its normalised company name, or to
+        the ticker itself when the company name is unavailable.
+    """
+    universe = universe_snapshot.load_if_available()
+    long_names: dict[str, str | None] = {}
+    if universe is not None:
+        long_names = dict(
+            universe.filter(pl.col("Ticker").is_in(tickers))
+            .select("Ticker", "Long Name")
+            .iter_rows()
+        )
+
+    unknown = [ticker for ticker in tickers if not long_names.get(ticker)]
+    if unknown:
+        with ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_METADATA_REQUESTS
+        ) as executor:
+            for ticker, (_, long_name) in zip(
+                unknown, executor.map(get_ticker_metadata, unknown)
+            ):
+                long_names[ticker] = long_name
+
+    identity_index = {}
+    for ticker in tickers:
+        long_name = long_names.get(ticker)
+        company = normalise_company_name(long_name) if long_name else ""
+        # Tickers without a known company only match themselves.
+        identity_index[ticker] = company or f"ticker:{ticker}"
+    return identity_index
+
+
+def normalise_company_name(name: str) -> str:
+    """
+    Normalises a company name for comparison by removing case, punctuation,
+    share class designations and common legal suffixes.
+
+    Args:
+        name: The company name.
+
+    Returns:
+        The normalised company name.
+    """
+    name = re.sub(r"\(.*?\)", " ", name.casefold())
+    name = re.sub(r"\bclass [a-z]\b", " ", name)
+    words = re.sub(r"[^\w\s]", " ", name).split()
+    while words and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
 
 
 @st.cache_data
@@ -167,3 +368,41 @@ def is_same_company(ticker1: str, ticker2: str) -> bool:
     except Exception as e:
         logger.error(f"Error comparing {ticker1} and {ticker2}: {e}")
         return False
+
+
+def download_yfinance_data_many_tickers(
+    tickers: list[str], start_date: datetime.date, end_date: datetime.date
+) -> dict[str, pl.DataFrame]:
+    """
+    Downloads historical stock data for several tickers from Yahoo Finance in
+    one batched request, bypassing the local price store.
+
+    Args:
+        tickers: The stock ticker symbols.
+        start_date: The start date for the data.
+        end_date: The end date for the data, inclusive.
+
+    Returns:
+        A dictionary mapping each ticker with data to a Polars DataFrame of
+        its historical stock data.
+    """
+    # Yahoo Finance treats the end date as exclusive.
+    data = yf.download(
+        tickers,
+        start=start_date,
+        end=end_date + datetime.timedelta(days=1),
+        group_by="ticker",
+    )
+    if not isinstance(data.columns, pd.MultiIndex):
+        if len(tickers) == 1:
+            return {tickers[0]: pl.from_pandas(data.reset_index())}
+        logger.error("Batched download did not return data grouped by ticker")
+        return {}
+
+    ticker_data = {}
+    for ticker in data.columns.get_level_values(0).unique():
+        # Dates on which only other tickers traded are entirely missing.
+        ticker_prices = data[ticker].dropna(how="all")
+        if not ticker_prices.empty:
+            ticker_data[ticker] = pl.from_pandas(ticker_prices.reset_index())
+    return ticker_data
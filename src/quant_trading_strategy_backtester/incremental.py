@@ -0,0 +1,623 @@
+"""
+An incremental backtesting engine that updates a backtest one bar at a time.
+
+It keeps the state each strategy needs, such as rolling window sums, EMAs and
+running return moments, so appending a bar to a long history costs O(1)
+instead of re-running the backtest from the first bar.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any
+
+import polars as pl
+
+from quant_trading_strategy_backtester.backtester import (
+    PERFORMANCE_METRICS,
+    TRADING_DAYS_PER_YEAR,
+)
+from quant_trading_strategy_backtester.strategies.base import BaseStrategy
+from quant_trading_strategy_backtester.strategies.buy_and_hold import (
+    BuyAndHoldStrategy,
+)
+from quant_trading_strategy_backtester.strategies.mean_reversion import (
+    MeanReversionStrategy,
+)
+from quant_trading_strategy_backtester.strategies.moving_average_crossover import (
+    MovingAverageCrossoverStrategy,
+)
+from quant_trading_strategy_backtester.strategies.pairs_trading import (
+    PairsTradingStrategy,
+)
+
+# The columns of the results produced by IncrementalBacktester.
+RESULT_COLUMNS = [
+    "Date",
+    "signal",
+    "positions",
+    "asset_returns",
+    "strategy_returns",
+    "cumulative_returns",
+    "equity_curve",
+]
+
+
+class RollingWindow:
+    """
+    Rolling sum, mean and sample standard deviation over the last ``window``
+    values, updated in O(1) per value.
+
+    Like the Polars rolling functions with ``min_samples`` equal to the
+    window size, the statistics are None until the window is full or while
+    it holds a missing value, and NaN while it holds a NaN.
+
+    Attributes:
+        window: The number of values in each window.
+    """
+
+    def __init__(self, window: int) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self._values: deque[float | None] = deque()
+        self._missing = 0
+        self._nans = 0
+        # The sum of the finite values, plus their count, mean and sum of
+        # squared deviations, updated with Welford's method.
+        self._sum = 0.0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value: float | None) -> None:
+        """
+        Adds a value, removing the oldest value once the window is full.
+
+        Args:
+            value: The new value, or None if it is missing.
+        """
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(value)
+        self._add(value)
+
+    def sum(self) -> float | None:
+        """Gets the sum of the window, or None if it is not complete."""
+        if not self._is_complete():
+            return None
+        return math.nan if self._nans else self._sum
+
+    def mean(self) -> float | None:
+        """Gets the mean of the window, or None if it is not complete."""
+        total = self.sum()
+        return None if total is None else total / self.window
+
+    def std(self) -> float | None:
+        """
+        Gets the sample standard deviation of the window, or None if it is
+        not complete.
+        """
+        if not self._is_complete():
+            return None
+        if self._nans or self.window < 2:
+            return math.nan
+        # Rounding can leave tiny negative variances for constant windows.
+        return math.sqrt(max(self._m2 / (self.window - 1), 0.0))
+
+    def _is_complete(self) -> bool:
+        return len(self._values) == self.window and self._missing == 0
+
+    def _add(self, value: float | None) -> None:
+        if value is None:
+            self._missing += 1
+        elif math.isnan(value):
+            self._nans += 1
+        else:
+            self._sum += value
+            self._count += 1
+            delta = value - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (value - self._mean)
+
+    def _remove(self, value: float | None) -> None:
+        if value is None:
+            self._missing -= 1
+        elif math.isnan(value):
+            self._nans -= 1
+        else:
+            self._sum -= value
+            self._count -= 1
+            if self._count == 0:
+                self._mean = 0.0
+                self._m2 = 0.0
+            else:
+                delta = value - self._mean
+                self._mean -= delta / self._count
+                self._m2 -= delta * (value - self._mean)
+
+
+class ExponentialMean:
+    """
+    An exponentially weighted mean updated in O(1) per value, matching the
+    Polars ``ewm_mean`` with ``adjust=True``.
+
+    Attributes:
+        alpha: The smoothing factor.
+    """
+
+    def __init__(self, span: int) -> None:
+        self.alpha = 2 / (span + 1)
+        self._weighted_sum = 0.0
+        self._weight = 0.0
+
+    def push(self, value: float) -> float:
+        """
+        Adds a value.
+
+        Args:
+            value: The new value.
+
+        Returns:
+            The exponentially weighted mean including ``value``.
+        """
+        decay = 1 - self.alpha
+        self._weighted_sum = self._weighted_sum * decay + value
+        self._weight = self._weight * decay + 1
+        return self._weighted_sum / self._weight
+
+
+class RunningMoments:
+    """
+    The mean, variance, skewness and kurtosis of a growing series, updated in
+    O(1) per value with the one-pass formulas of Welford and Terriberry.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._m3 = 0.0
+        self._m4 = 0.0
+
+    def push(self, value: float) -> None:
+        """
+        Adds a value.
+
+        Args:
+            value: The new value.
+        """
+        previous_count = self.count
+        self.count += 1
+        delta = value - self.mean
+        delta_n = delta / self.count
+        delta_n2 = delta_n * delta_n
+        term = delta * delta_n * previous_count
+        self.mean += delta_n
+        self._m4 += (
+            term * delta_n2 * (self.count * self.count - 3 * self.count + 3)
+            + 6 * delta_n2 * self._m2
+            - 4 * delta_n * self._m3
+        )
+        self._m3 += term * delta_n * (self.count - 2) - 3 * delta_n * self._m2
+        self._m2 += term
+
+    def std(self) -> float:
+        """Gets the sample standard deviation, or NaN for under two values."""
+        if self.count < 2:
+            return math.nan
+        return math.sqrt(self._m2 / (self.count - 1))
+
+    def skew(self) -> float:
+        """Gets the biased sample skewness, as Polars calculates it."""
+        return _divide(math.sqrt(self.count) * self._m3, self._m2**1.5)
+
+    def kurtosis(self) -> float:
+        """Gets the biased excess kurtosis, as Polars calculates it."""
+        return _divide(self.count * self._m4, self._m2**2) - 3
+
+
+class IncrementalSignals(ABC):
+    """
+    The state a strategy needs to generate its signal for each new bar.
+    """
+
+    @abstractmethod
+    def update(self, bar: dict[str, Any]) -> float:
+        """
+        Generates the signal for the next bar.
+
+        Args:
+            bar: The prices of the bar, keyed by column name.
+
+        Returns:
+            The signal for the bar, matching the strategy's 'signal' column.
+        """
+
+    def position(self, signal: float, previous_signal: float | None) -> float:
+        """
+        Gets the position change for a bar from its signal.
+
+        Args:
+            signal: The signal for the bar.
+            previous_signal: The signal for the previous bar, or None for the
+                             first bar.
+
+        Returns:
+            The bar's value of the strategy's 'positions' column.
+        """
+        return 0.0 if previous_signal is None else signal - previous_signal
+
+
+class BuyAndHoldSignals(IncrementalSignals):
+    """Incremental signals for ``BuyAndHoldStrategy``."""
+
+    def update(self, bar: dict[str, Any]) -> float:
+        return 1.0
+
+    def position(self, signal: float, previous_signal: float | None) -> float:
+        return 1.0
+
+
+class MeanReversionSignals(IncrementalSignals):
+    """Incremental signals for ``MeanReversionStrategy``."""
+
+    def __init__(self, strategy: MeanReversionStrategy) -> None:
+        self.std_dev = strategy.std_dev
+        self._close = RollingWindow(strategy.window)
+
+    def update(self, bar: dict[str, Any]) -> float:
+        close = bar["Close"]
+        self._close.push(close)
+        mean = self._close.mean()
+        std = self._close.std()
+        if mean is None or std is None:
+            return 0.0
+        if std == 0:
+            # The strategy replaces a zero standard deviation with NaN, and
+            # Polars orders NaN above every number, so the bar is a buy.
+            return 1.0
+        if _less_than(close, mean - self.std_dev * std):
+            return 1.0
+        if _less_than(mean + self.std_dev * std, close):
+            return -1.0
+        return 0.0
+
+
+class PairsTradingSignals(IncrementalSignals):
+    """Incremental signals for ``PairsTradingStrategy``."""
+
+    def __init__(self, strategy: PairsTradingStrategy) -> None:
+        self.entry_z_score = strategy.entry_z_score
+        self.exit_z_score = strategy.exit_z_score
+        self._spread = RollingWindow(strategy.window)
+        self._signal = 0.0
+
+    def update(self, bar: dict[str, Any]) -> float:
+        spread = bar["Close_1"] - bar["Close_2"]
+        self._spread.push(spread)
+        mean = self._spread.mean()
+        std = self._spread.std()
+        z_score = 0.0 if mean is None or not std else (spread - mean) / std
+
+        # Positions are held between the entry and exit thresholds.
+        if _less_than(self.entry_z_score, z_score):
+            self._signal = -1.0
+        elif _less_than(z_score, -self.entry_z_score):
+            self._signal = 1.0
+        elif _less_than(abs(z_score), self.exit_z_score):
+            self._signal = 0.0
+        return self._signal
+
+
+class TemoSignals(IncrementalSignals):
+    """Incremental signals for ``MovingAverageCrossoverStrategy``."""
+
+    def __init__(self, strategy: MovingAverageCrossoverStrategy) -> None:
+        self._ema_10 = ExponentialMean(10)
+        self._ema_80 = ExponentialMean(80)
+        self._true_range = RollingWindow(strategy.atr_period)
+        self._plus_dm = RollingWindow(strategy.adx_period)
+        self._minus_dm = RollingWindow(strategy.adx_period)
+        self._dx = RollingWindow(strategy.adx_period)
+        self._gains = RollingWindow(strategy.cmo_period)
+        self._losses = RollingWindow(strategy.cmo_period)
+        self._previous: dict[str, Any] | None = None
+
+    def update(self, bar: dict[str, Any]) -> float:
+        high, low, close = bar["High"], bar["Low"], bar["Close"]
+        ema_10 = self._ema_10.push(close)
+        ema_80 = self._ema_80.push(close)
+
+        previous = self._previous
+        self._previous = bar
+        if previous is None:
+            # The moves need a previous bar, so they count as zero on the
+            # first bar, and the true range is just the bar's range.
+            true_range = high - low
+            plus_dm = minus_dm = gain = loss = 0.0
+        else:
+            true_range = max(
+                high - low,
+                abs(high - previous["Close"]),
+                abs(low - previous["Close"]),
+            )
+            up_move = high - previous["High"]
+            down_move = previous["Low"] - low
+            plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+            minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+            delta = close - previous["Close"]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+
+        self._true_range.push(true_range)
+        atr = self._true_range.mean()
+        self._plus_dm.push(plus_dm)
+        self._minus_dm.push(minus_dm)
+        plus_di = _scaled_ratio(self._plus_dm.sum(), atr)
+        minus_di = _scaled_ratio(self._minus_dm.sum(), atr)
+        if plus_di is None or minus_di is None:
+            dx = None
+        else:
+            dx = _divide(abs(plus_di - minus_di), plus_di + minus_di) * 100
+        self._dx.push(dx)
+        adx = self._dx.mean()
+
+        self._gains.push(gain)
+        self._losses.push(loss)
+        gain_sum = self._gains.sum()
+        loss_sum = self._losses.sum()
+        if gain_sum is None or loss_sum is None:
+            cmo = None
+        else:
+            cmo = _divide(100 * (gain_sum - loss_sum), gain_sum + loss_sum)
+
+        if adx is None or cmo is None:
+            return 0.0
+        if _less_than(ema_80, ema_10) and _less_than(40, adx) and _less_than(40, cmo):
+            return 1.0
+        if _less_than(ema_10, ema_80) and _less_than(40, adx) and _less_than(cmo, -40):
+            return -1.0
+        return 0.0
+
+
+class IncrementalBacktester:
+    """
+    Backtests a strategy incrementally, one bar at a time.
+
+    Appending a bar updates the strategy state, the returns, the equity curve
+    and the running metric state in O(1), however long the history is. The
+    returns, cumulative returns and equity curve use the same arithmetic as
+    ``Backtester.run``, so they are identical for identical positions. The
+    rolling indicators and the return moments behind the metrics use O(1)
+    update formulas, which match the full calculation to floating-point
+    rounding.
+
+    Attributes:
+        strategy: The trading strategy to backtest.
+        initial_capital: The initial capital for the backtest.
+    """
+
+    def __init__(self, strategy: BaseStrategy, initial_capital: float = 100000.0):
+        self.strategy = strategy
+        self.initial_capital = initial_capital
+        self._signals = create_incremental_signals(strategy)
+        self._rows: dict[str, list[Any]] = {column: [] for column in RESULT_COLUMNS}
+        self._previous_bar: dict[str, Any] | None = None
+        self._previous_signal: float | None = None
+        self._previous_position: float | None = None
+        self._cumulative_return = 1.0
+        self._peak_equity = -math.inf
+        self._max_drawdown = math.inf
+        self._bars_since_peak = 0
+        self._max_drawdown_duration = 0
+        self._returns = RunningMoments()
+        self._downside_sum_of_squares = 0.0
+        self._num_gains = 0
+        self._num_nonzero_returns = 0
+        self._num_exposed = 0
+
+    def update(self, bar: dict[str, Any]) -> dict[str, Any]:
+        """
+        Appends a bar to the backtest.
+
+        Args:
+            bar: The bar's 'Date' and prices, with the columns the strategy
+                 needs: 'Close', or 'High', 'Low' and 'Close' for TEMO, or
+                 'Close_1' and 'Close_2' for pairs trading.
+
+        Returns:
+            The results row for the bar, with the columns of
+            ``RESULT_COLUMNS``.
+        """
+        signal = self._signals.update(bar)
+        position = self._signals.position(signal, self._previous_signal)
+
+        asset_return = self._asset_return(bar)
+        if self._previous_position is None or asset_return is None:
+            strategy_return = 0.0
+        else:
+            strategy_return = self._previous_position * asset_return
+            # Missing and infinite returns count as flat, as in Backtester.
+            if not math.isfinite(strategy_return) and not math.isnan(strategy_return):
+                strategy_return = 0.0
+
+        self._cumulative_return *= 1 + strategy_return
+        equity = self.initial_capital * self._cumulative_return
+        self._update_metric_state(strategy_return, equity)
+
+        self._previous_bar = bar
+        self._previous_signal = signal
+        self._previous_position = position
+
+        row = {
+            "Date": bar["Date"],
+            "signal": signal,
+            "positions": position,
+            "asset_returns": asset_return,
+            "strategy_returns": strategy_return,
+            "cumulative_returns": self._cumulative_return,
+            "equity_curve": equity,
+        }
+        for column, value in row.items():
+            self._rows[column].append(value)
+        return row
+
+    def extend(self, data: pl.DataFrame) -> pl.DataFrame:
+        """
+        Appends every bar of ``data`` to the backtest in order.
+
+        Args:
+            data: The new bars.
+
+        Returns:
+            The results rows for the new bars.
+        """
+        rows = [self.update(bar) for bar in data.iter_rows(named=True)]
+        return pl.DataFrame(rows, schema=self._schema(data), orient="row")
+
+    @property
+    def results(self) -> pl.DataFrame:
+        """The results of every bar appended so far."""
+        return pl.DataFrame(self._rows, schema=self._schema())
+
+    def get_performance_metrics(self) -> dict[str, float] | None:
+        """
+        Gets the performance metrics of the bars appended so far in O(1).
+
+        Returns:
+            A dictionary with the same metrics as
+            ``Backtester.get_performance_metrics``, or None if no bars have
+            been appended.
+        """
+        num_bars = self._returns.count
+        if num_bars == 0:
+            return None
+
+        annualisation = TRADING_DAYS_PER_YEAR**0.5
+        total_return = self._cumulative_return - 1
+        cagr = _power(self._cumulative_return, TRADING_DAYS_PER_YEAR / num_bars) - 1
+        returns_mean = self._returns.mean
+        returns_std = self._returns.std()
+        downside_deviation = math.sqrt(self._downside_sum_of_squares / num_bars)
+
+        metrics = {
+            "Total Return": total_return,
+            "Sharpe Ratio": _ratio_or_nan(annualisation * returns_mean, returns_std),
+            "Max Drawdown": self._max_drawdown,
+            "CAGR": cagr,
+            "Annualised Volatility": annualisation * returns_std,
+            "Sortino Ratio": _ratio_or_nan(
+                annualisation * returns_mean, downside_deviation
+            ),
+            "Calmar Ratio": _ratio_or_nan(cagr, abs(self._max_drawdown)),
+            "Max Drawdown Duration": float(self._max_drawdown_duration),
+            "Hit Rate": _divide(self._num_gains, self._num_nonzero_returns),
+            "Skewness": self._returns.skew(),
+            "Kurtosis": self._returns.kurtosis(),
+            "Exposure": self._num_exposed / num_bars,
+        }
+        return {name: metrics[name] for name in PERFORMANCE_METRICS}
+
+    def _update_metric_state(self, strategy_return: float, equity: float) -> None:
+        """Updates the running state behind the metrics with a new bar."""
+        self._peak_equity = max(self._peak_equity, equity)
+        drawdown = equity / self._peak_equity - 1
+        self._max_drawdown = min(self._max_drawdown, drawdown)
+        self._bars_since_peak = 0 if drawdown == 0 else self._bars_since_peak + 1
+        self._max_drawdown_duration = max(
+            self._max_drawdown_duration, self._bars_since_peak
+        )
+
+        self._returns.push(strategy_return)
+        self._downside_sum_of_squares += min(strategy_return, 0.0) ** 2
+        self._num_gains += strategy_return > 0
+        self._num_nonzero_returns += strategy_return != 0
+        # A bar is exposed to the asset when the previous bar held a position.
+        self._num_exposed += bool(self._previous_position)
+
+    def _asset_return(self, bar: dict[str, Any]) -> float | None:
+        """Calculates the asset return of a bar, as in the derived returns."""
+        previous = self._previous_bar
+        if previous is None:
+            return None
+        if "Close_1" in bar and "Close_2" in bar:
+            return _simple_return(previous["Close_1"], bar["Close_1"]) - (
+                _simple_return(previous["Close_2"], bar["Close_2"])
+            )
+        return _simple_return(previous["Close"], bar["Close"])
+
+    def _schema(self, data: pl.DataFrame | None = None) -> dict[str, Any]:
+        date_type: pl.DataType = pl.Date()
+        if data is not None and "Date" in data.columns:
+            date_type = data.schema["Date"]
+        elif self._rows["Date"]:
+            date_type = pl.Series(self._rows["Date"][:1]).dtype
+        return {"Date": date_type} | {
+            column: pl.Float64 for column in RESULT_COLUMNS[1:]
+        }
+
+
+def create_incremental_signals(strategy: BaseStrategy) -> IncrementalSignals:
+    """
+    Creates the incremental signal state for a strategy.
+
+    Args:
+        strategy: The strategy to generate signals for.
+
+    Returns:
+        The incremental signal state.
+    """
+    if isinstance(strategy, BuyAndHoldStrategy):
+        return BuyAndHoldSignals()
+    if isinstance(strategy, MeanReversionStrategy):
+        return MeanReversionSignals(strategy)
+    if isinstance(strategy, PairsTradingStrategy):
+        return PairsTradingSignals(strategy)
+    if isinstance(strategy, MovingAverageCrossoverStrategy):
+        return TemoSignals(strategy)
+    raise TypeError(
+        f"{strategy.__class__.__name__} does not support incremental backtests"
+    )
+
+
+def _less_than(left: float, right: float) -> bool:
+    """Compares two floats the way Polars does, ordering NaN above numbers."""
+    if math.isnan(right):
+        return not math.isnan(left)
+    return left < right
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """Divides two floats with IEEE semantics, as Polars does."""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return math.nan
+        return math.copysign(math.inf, numerator) * math.copysign(1, denominator)
+    return numerator / denominator
+
+
+def _ratio_or_nan(numerator: float, denominator: float) -> float:
+    """Divides two floats, giving NaN for a zero or NaN denominator."""
+    if denominator == 0 or math.isnan(denominator):
+        return math.nan
+    return numerator / denominator
+
+
+def _power(base: float, exponent: float) -> float:
+    """Raises a float to a power, giving NaN instead of complex results."""
+    if base < 0 and not exponent.is_integer():
+        return math.nan
+    return base**exponent
+
+
+def _scaled_ratio(numerator: float | None, denominator: float | None) -> float | None:
+    """Calculates 100 * numerator / denominator, or None if either is None."""
+    if numerator is None or denominator is None:
+        return None
+    return _divide(100 * numerator, denominator)
+
+
+def _simple_return(previous_close: float, close: float) -> float:
+    """Calculates a simple return with the same arithmetic as Polars."""
+    return _divide(close - previous_close, previous_close)
@@ -0,0 +1,228 @@
+"""
+Contains a persistent cache of backtest metrics, so that repeated or
+interrupted optimisations reuse the combinations they have already
+evaluated instead of backtesting them again.
+"""
+
+import contextlib
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+from quant_trading_strategy_backtester.backtester import PERFORMANCE_METRICS
+
+# Bump whenever the backtest or the definition of a metric changes, so that
+# metrics computed before the change are no longer served.
+METRICS_VERSION = 1
+
+# The version cached metrics are stored under. Adding, removing or renaming a
+# performance metric changes it as well.
+CACHE_VERSION = hashlib.sha256(
+    json.dumps([METRICS_VERSION, PERFORMANCE_METRICS]).encode()
+).hexdigest()[:16]
+
+
+class MetricsCache:
+    """
+    Stores the performance metrics of backtests in a SQLite file.
+
+    Entries are keyed by the cache version, the content fingerprint of the
+    price data (see ``dataset_fingerprint``), the strategy type and the
+    canonical form of the strategy parameters, so they stay valid across
+    processes and sessions for as long as the backtest, the data and the
+    parameters are unchanged. The file is only created once something is
+    stored.
+
+    Attributes:
+        path: The path of the SQLite file.
+        version: The version entries are stored and looked up under.
+                 Defaults to ``CACHE_VERSION``.
+    """
+
+    def __init__(self, path: str | os.PathLike, version: str = CACHE_VERSION) -> None:
+        self.path = Path(path)
+        self.version = version
+        self._lock = threading.Lock()
+
+    def get_many(
+        self,
+        fingerprint: str,
+        strategy_type: str,
+        param_combinations: list[dict[str, Any]],
+    ) -> list[dict[str, float] | None]:
+        """
+        Looks up the metrics of several parameter sets on the same data.
+
+        Args:
+            fingerprint: The fingerprint of the price data.
+            strategy_type: The type of strategy.
+            param_combinations: The parameter sets to look up.
+
+        Returns:
+            The cached metrics of each parameter set, in the order given, or
+            None for parameter sets that are not cached.
+        """
+        if not param_combinations or not self.path.exists():
+            return [None] * len(param_combinations)
+        keys = [canonical_params(params) for params in param_combinations]
+        found: dict[str, dict[str, float]] = {}
+        with self._connect() as connection:
+            # Look the keys up in batches, as SQLite limits the number of
+            # parameters of a statement.
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                rows = connection.execute(
+                    "SELECT params, metrics FROM metrics "
+                    "WHERE version = ? AND fingerprint = ? AND strategy = ? "
+                    f"AND params IN ({', '.join('?' * len(batch))})",
+                    [self.version, fingerprint, strategy_type, *batch],
+                )
+                found.update((params, json.loads(metrics)) for params, metrics in rows)
+        return [found.get(key) for key in keys]
+
+    def get(
+        self, fingerprint: str, strategy_type: str, params: dict[str, Any]
+    ) -> dict[str, float] | None:
+        """
+        Looks up the metrics of a parameter set.
+
+        Args:
+            fingerprint: The fingerprint of the price data.
+            strategy_type: The type of strategy.
+            params: The strategy parameters.
+
+        Returns:
+            The cached metrics, or None if they are not cached.
+        """
+        return self.get_many(fingerprint, strategy_type, [params])[0]
+
+    def put_many(
+        self,
+        fingerprint: str,
+        strategy_type: str,
+        param_combinations: list[dict[str, Any]],
+        metrics_list: list[dict[str, float]],
+    ) -> None:
+        """
+        Stores the metrics of several parameter sets in one transaction,
+        replacing any already cached.
+
+        Args:
+            fingerprint: The fingerprint of the price data.
+            strategy_type: The type of strategy.
+            param_combinations: The parameter sets.
+            metrics_list: The metrics of each parameter set.
+        """
+        if not param_combinations:
+            return
+        rows = [
+            (
+                self.version,
+                fingerprint,
+                strategy_type,
+                canonical_params(params),
+                _dump(metrics),
+            )
+            for params, metrics in zip(param_combinations, metrics_list)
+        ]
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+    def put(
+        self,
+        fingerprint: str,
+        strategy_type: str,
+        params: dict[str, Any],
+        metrics: dict[str, float],
+    ) -> None:
+        """
+        Stores the metrics of a parameter set, replacing any already cached.
+
+        Args:
+            fingerprint: The fingerprint of the price data.
+            strategy_type: The type of strategy.
+            params: The strategy parameters.
+            metrics: The metrics to store.
+        """
+        self.put_many(fingerprint, strategy_type, [params], [metrics])
+
+    def clear(self) -> None:
+        """Removes every cached entry, whatever its version."""
+        if self.path.exists():
+            with self._connect() as connection:
+                connection.execute("DELETE FROM metrics")
+
+    def __len__(self) -> int:
+        if not self.path.exists():
+            return 0
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM metrics WHERE version = ?", [self.version]
+            ).fetchone()[0]
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Opens a connection to the cache file, creating it if needed, and
+        commits on success.
+        """
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            try:
+                with connection:
+                    connection.execute(
+                        "CREATE TABLE IF NOT EXISTS metrics ("
+                        "version TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+                        "strategy TEXT NOT NULL, params TEXT NOT NULL, "
+                        "metrics TEXT NOT NULL, "
+                        "PRIMARY KEY (version, fingerprint, strategy, params)) "
+                        "WITHOUT ROWID"
+                    )
+                    yield connection
+            finally:
+                connection.close()
+
+
+def canonical_params(params: dict[str, Any]) -> str:
+    """
+    Builds the canonical form of a parameter set, used as its cache key.
+
+    Parameters are sorted by name, NumPy scalars are converted to Python
+    numbers, and whole floats are written as integers, so equal parameter
+    sets have the same key however they were built.
+
+    Args:
+        params: The strategy parameters.
+
+    Returns:
+        A JSON string identifying the parameter set.
+    """
+    return json.dumps(
+        {name: _canonical_value(value) for name, value in params.items()},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+def _canonical_value(value: Any) -> Any:
+    """Convert a parameter value to its canonical JSON-compatible form."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isfinite(value) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _dump(metrics: dict[str, float]) -> str:
+    """Serialise metrics as JSON, with every value as a Python float."""
+    return json.dumps({name: float(value) for name, value in metrics.items()})
@@ -16,13 +16,23 @@ from quant_trading_strategy_backtester.backtest_runner import (
     run_backtest,
 )
 from quant_trading_strategy_backtester.data import get_top_sp500_companies
+from quant_trading_strategy_backtester.metrics_cache import MetricsCache
 from quant_trading_strategy_backtester.optimiser_core import (
     optimise_buy_and_hold_ticker,
     optimise_pairs_trading_tickers,
     optimise_single_ticker_strategy_ticker,
     optimise_strategy_params,
+    rank_single_ticker_strategy_tickers,
 )
-from quant_trading_strategy_backtester.utils import NUM_TOP_COMPANIES_ONE_TICKER
+from quant_trading_strategy_backtester.search import search_strategy_params
+from quant_trading_strategy_backtester.streamlit_ui import streamlit_progress
+from quant_trading_strategy_backtester.utils import (
+    METRICS_CACHE_PATH,
+    NUM_TOP_COMPANIES_ONE_TICKER,
+)
+
+# The metrics of every backtest run from the app, shared across sessions.
+metrics_cache = MetricsCache(METRICS_CACHE_PATH)
 
 
 def run_optimisation(
@@ -54,17 +64,21 @@ def run_optimisation(
 
     if strategy_type == "Buy and Hold":
         top_companies = get_top_sp500_companies(NUM_TOP_COMPANIES_ONE_TICKER)
-        best_ticker, strategy_params, metrics = optimise_buy_and_hold_ticker(
-            top_companies, start_date, end_date
-        )
+        with streamlit_progress() as progress:
+            best_ticker, strategy_params, metrics = optimise_buy_and_hold_ticker(
+                top_companies, start_date, end_date, progress=progress
+            )
         st.success(f"Best ticker for Buy and Hold: {best_ticker}")
     else:
-        strategy_params, metrics = optimiser_core.optimise_strategy_params(
-            data,
-            strategy_type,
-            cast(dict[str, range | list[int | float]], strategy_params),
-            tickers,
-        )
+        with streamlit_progress() as progress:
+            strategy_params, metrics = optimiser_core.optimise_strategy_params(
+                data,
+                strategy_type,
+                cast(dict[str, range | list[int | float]], strategy_params),
+                tickers,
+                cache=metrics_cache,
+                progress=progress,
+            )
 
     end_time = time.time()
     duration = end_time - start_time
@@ -82,6 +96,8 @@ __all__ = [
     "optimise_single_ticker_strategy_ticker",
     "optimise_strategy_params",
     "optimise_pairs_trading_tickers",
+    "rank_single_ticker_strategy_tickers",
+    "search_strategy_params",
     "run_backtest",
     "create_strategy",
 ]
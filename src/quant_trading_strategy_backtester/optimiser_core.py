@@ -2,55 +2,110 @@
 
 from __future__ import annotations
 
+import contextlib
 import datetime
+import heapq
 import itertools
+import math
+import multiprocessing
+import os
 import time
-from typing import Any, List, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, List, Tuple, Union
 
+import numpy as np
 import polars as pl
-import streamlit as st
 
-from quant_trading_strategy_backtester.backtest_runner import run_backtest
+from quant_trading_strategy_backtester.backtest_runner import (
+    create_strategy,
+    get_strategy_class,
+    run_backtest,
+)
+from quant_trading_strategy_backtester.backtester import (
+    PERFORMANCE_METRICS,
+    Backtester,
+    build_result_record,
+    performance_metric_expressions,
+    save_strategy_results,
+)
+from quant_trading_strategy_backtester.cache import dataset_fingerprint
 from quant_trading_strategy_backtester.data import (
-    is_same_company,
-    load_yfinance_data_one_ticker,
+    get_company_identity_index,
+    load_yfinance_data_many_tickers,
     load_yfinance_data_two_tickers,
 )
+from quant_trading_strategy_backtester.metrics_cache import MetricsCache
+from quant_trading_strategy_backtester.pair_screen import screen_pairs
+from quant_trading_strategy_backtester.pairs_grid import evaluate_pairs_grid
+from quant_trading_strategy_backtester.portfolio import PortfolioBacktester
+from quant_trading_strategy_backtester.price_matrix import (
+    SharedPriceMatrix,
+    build_price_matrix,
+    get_pair_data,
+)
+from quant_trading_strategy_backtester.progress import (
+    ProgressCallback,
+    no_progress,
+)
+
+# The number of chunks a serial grid search is split into by default, so the
+# progress is reported while the search runs.
+SERIAL_CHUNK_COUNT = 20
 
 
 def optimise_buy_and_hold_ticker(
     top_companies: List[Tuple[str, float]],
     start_date: datetime.date,
     end_date: datetime.date,
+    save_top_k: int = 0,
+    progress: ProgressCallback = no_progress,
 ) -> tuple[str, dict[str, Any], dict[str, float]]:
-    """Return the best ticker for the Buy and Hold strategy."""
+    """
+    Return the best ticker for the Buy and Hold strategy.
+
+    Candidates are not saved as they are evaluated. The ``save_top_k`` best
+    runs by total return are saved in one transaction at the end. Progress is
+    reported to ``progress`` after each ticker.
+    """
     best_ticker = None
     best_metrics = None
     best_total_return = float("-inf")
+    candidates: list[tuple[float, dict[str, Any]]] = []
 
     total_tickers = len(top_companies)
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    ticker_data = _load_ticker_data(top_companies, start_date, end_date)
 
     for i, (ticker, _) in enumerate(top_companies):
-        status_text.text(f"Evaluating ticker {i + 1} / {total_tickers}: {ticker}")
-        progress_bar.progress((i + 1) / total_tickers)
+        progress(
+            (i + 1) / total_tickers,
+            f"Evaluating ticker {i + 1} / {total_tickers}: {ticker}",
+        )
 
-        data = load_yfinance_data_one_ticker(ticker, start_date, end_date)
-        if data is None or data.is_empty():
+        data = ticker_data.get((ticker,))
+        if data is None:
             continue
 
-        backtester = run_backtest(data, "Buy and Hold", {}, ticker)
+        backtester = run_backtest(
+            data, "Buy and Hold", {}, ticker, persist=False, compact=True
+        )
         # run_backtest returns (results, metrics)
         _, metrics = backtester
+        if metrics and save_top_k > 0:
+            candidates.append(
+                (
+                    metrics["Total Return"],
+                    build_result_record(
+                        data, "BuyAndHoldStrategy", {}, metrics, ticker
+                    ),
+                )
+            )
 
         if metrics and metrics["Total Return"] > best_total_return:
             best_total_return = metrics["Total Return"]
             best_ticker = ticker
             best_metrics = metrics
 
-    progress_bar.empty()
-    status_text.empty()
+    _save_top_candidates(candidates, save_top_k)
 
     if not best_ticker or not best_metrics:
         raise ValueError("Buy and Hold optimisation failed")
@@ -64,41 +119,86 @@ def optimise_single_ticker_strategy_ticker(
     end_date: datetime.date,
     strategy_type: str,
     strategy_params: dict[str, Any],
+    save_top_k: int = 0,
+    progress: ProgressCallback = no_progress,
 ) -> str:
-    """Find the best ticker for single ticker strategies."""
-    best_ticker = None
-    best_sharpe_ratio = float("-inf")
-
-    total_tickers = len(top_companies)
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-
-    fixed_params = {
-        k: v[0] if isinstance(v, (list, range)) else v
-        for k, v in strategy_params.items()
-    }
-
-    for i, (ticker, _) in enumerate(top_companies):
-        status_text.text(f"Evaluating ticker {i + 1} / {total_tickers}: {ticker}")
-        progress_bar.progress((i + 1) / total_tickers)
-
-        data = load_yfinance_data_one_ticker(ticker, start_date, end_date)
-        if data is None or data.is_empty():
-            continue
+    """
+    Find the best ticker for single ticker strategies.
+
+    Candidates are not saved as they are evaluated. The ``save_top_k`` best
+    runs by Sharpe ratio are saved in one transaction at the end. Progress is
+    reported to ``progress`` before and after scoring.
+    """
+    progress(0.0, f"Scoring {len(top_companies)} tickers...")
+    rankings = rank_single_ticker_strategy_tickers(
+        top_companies, start_date, end_date, strategy_type, strategy_params
+    )
+    progress(1.0, f"Scored {len(top_companies)} tickers")
 
-        _, current_metrics = run_backtest(data, strategy_type, fixed_params, ticker)
+    if save_top_k > 0:
+        data = load_yfinance_data_many_tickers(
+            rankings["Ticker"].head(save_top_k).to_list(), start_date, end_date
+        )
+        strategy_name = get_strategy_class(strategy_type).__name__
+        fixed_params = _fixed_params(strategy_params)
+        save_strategy_results(
+            [
+                build_result_record(
+                    data.filter(pl.col("Ticker") == metrics["Ticker"]).drop("Ticker"),
+                    strategy_name,
+                    fixed_params,
+                    metrics,
+                    metrics["Ticker"],
+                )
+                for metrics in rankings.head(save_top_k).iter_rows(named=True)
+                if not math.isnan(metrics["Sharpe Ratio"])
+            ]
+        )
 
-        if current_metrics["Sharpe Ratio"] > best_sharpe_ratio:
-            best_sharpe_ratio = current_metrics["Sharpe Ratio"]
-            best_ticker = ticker
+    # NaN scores rank last, so a NaN at the top means no ticker has a score.
+    if rankings.is_empty() or math.isnan(rankings["Sharpe Ratio"][0]):
+        raise ValueError("Single ticker strategy ticker optimisation failed")
 
-    progress_bar.empty()
-    status_text.empty()
+    return rankings["Ticker"][0]
 
-    if not best_ticker:
-        raise ValueError("Single ticker strategy ticker optimisation failed")
 
-    return best_ticker
+def rank_single_ticker_strategy_tickers(
+    top_companies: List[Tuple[str, float]],
+    start_date: datetime.date,
+    end_date: datetime.date,
+    strategy_type: str,
+    strategy_params: dict[str, Any],
+    rank_by: str = "Sharpe Ratio",
+) -> pl.DataFrame:
+    """
+    Rank tickers by the metrics of a single ticker strategy run on each.
+
+    The prices of every ticker are loaded into one long frame, and the
+    strategy's signals and metrics for all of them are calculated in a single
+    query rather than one backtest per ticker.
+
+    Args:
+        top_companies: The (ticker, market cap) pairs to rank.
+        start_date: The start date for the data.
+        end_date: The end date for the data.
+        strategy_type: The single ticker strategy to run.
+        strategy_params: The strategy parameters. The first value of any
+                         range or list is used.
+        rank_by: The metric to rank by. Higher values rank first.
+
+    Returns:
+        A DataFrame with a 'Ticker' column and one column per metric, from
+        the best ticker to the worst. Tickers without data are left out.
+    """
+    tickers = [ticker for ticker, _ in top_companies]
+    data = load_yfinance_data_many_tickers(tickers, start_date, end_date)
+    strategy = create_strategy(strategy_type, _fixed_params(strategy_params))
+    if data.is_empty():
+        return pl.DataFrame(
+            schema={"Ticker": pl.String}
+            | {metric: pl.Float64 for metric in PERFORMANCE_METRICS}
+        )
+    return PortfolioBacktester(data, strategy).score_tickers(rank_by)
 
 
 def optimise_strategy_params(
@@ -106,43 +206,361 @@ def optimise_strategy_params(
     strategy_type: str,
     parameter_ranges: dict[str, Union[range, list[int | float]]],
     tickers: Union[str, List[str]],
+    save_top_k: int = 0,
+    n_jobs: int = 1,
+    chunk_size: int | None = None,
+    lazy: bool = False,
+    cache: MetricsCache | None = None,
+    progress: ProgressCallback = no_progress,
 ) -> tuple[dict[str, int | float], dict[str, float]]:
-    """Search parameter ranges and return the best parameter set."""
-    best_params = None
-    best_metrics = None
-    best_sharpe_ratio = float("-inf")
-
+    """
+    Search parameter ranges and return the best parameter set.
+
+    Combinations are evaluated in chunks, each as a single batch. With
+    ``n_jobs`` above 1 the chunks are spread over a process pool whose workers
+    receive the data once when they start and return only metrics. The best
+    parameters are the same as in a serial run, with ties going to the
+    combination that comes first.
+
+    Candidates are not saved as they are evaluated. The ``save_top_k`` best
+    combinations by Sharpe ratio are saved in one transaction at the end.
+
+    With a ``cache``, combinations already evaluated on the same data are
+    read from it instead of being backtested again, and the metrics of every
+    chunk are stored in it as soon as the chunk is evaluated, so an
+    interrupted search resumes where it stopped.
+
+    Args:
+        data: Historical price data.
+        strategy_type: The type of strategy being optimised.
+        parameter_ranges: The values to search for each parameter.
+        tickers: The ticker or tickers used in the backtest.
+        save_top_k: The number of best combinations to save.
+        n_jobs: The number of worker processes. Values below 1 use every CPU.
+        chunk_size: The number of combinations per chunk. Defaults to about
+                    ``SERIAL_CHUNK_COUNT`` chunks when serial, or about four
+                    chunks per worker. Smaller chunks bound peak memory.
+        lazy: Whether to evaluate each chunk as lazy backtest plans collected
+              together with ``evaluate_param_combinations_lazy``, rather than
+              as one vectorised batch.
+        cache: The metrics cache to consult and update, if any.
+        progress: The callback receiving the progress after each chunk.
+
+    Returns:
+        A tuple containing the best parameters and their metrics.
+    """
     param_names = list(parameter_ranges.keys())
     param_values = [
         list(value) if isinstance(value, range) else value
         for value in parameter_ranges.values()
     ]
+    combination_params = [
+        dict(zip(param_names, params)) for params in itertools.product(*param_values)
+    ]
+    batch_metrics, _ = evaluate_param_combinations_in_chunks(
+        data,
+        strategy_type,
+        combination_params,
+        tickers,
+        n_jobs=n_jobs,
+        chunk_size=chunk_size,
+        lazy=lazy,
+        cache=cache,
+        progress=progress,
+    )
 
-    param_combinations = list(itertools.product(*param_values))
-    total_combinations = len(param_combinations)
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    best_index = select_best_index(batch_metrics)
+    if best_index is None or not combination_params[best_index]:
+        raise ValueError("Parameter optimisation failed")
+    best_params = combination_params[best_index]
+
+    # Re-run the winning combination through the standard backtest so that its
+    # metrics match a regular run exactly.
+    _, best_metrics = run_backtest(
+        data, strategy_type, best_params, tickers, persist=False, compact=True
+    )
+    if not best_metrics:
+        raise ValueError("Parameter optimisation failed")
 
-    for i, params in enumerate(param_combinations):
-        status_text.text(
-            f"Evaluating parameter combination {i + 1} / {total_combinations}"
+    if save_top_k > 0:
+        batch_metrics[best_index] = best_metrics
+        save_top_combinations(
+            data, strategy_type, combination_params, batch_metrics, tickers, save_top_k
         )
-        progress_bar.progress((i + 1) / total_combinations)
 
-        current_params = dict(zip(param_names, params))
-        _, metrics = run_backtest(data, strategy_type, current_params, tickers)
+    return best_params, best_metrics
+
 
+def evaluate_param_combinations_in_chunks(
+    data: pl.DataFrame,
+    strategy_type: str,
+    param_combinations: list[dict[str, Any]],
+    tickers: Union[str, List[str]],
+    n_jobs: int = 1,
+    chunk_size: int | None = None,
+    lazy: bool = False,
+    cache: MetricsCache | None = None,
+    progress: ProgressCallback = no_progress,
+) -> tuple[list[dict[str, float]], int]:
+    """
+    Evaluate parameter combinations in chunks, each as a single batch.
+
+    With ``n_jobs`` above 1 the chunks are spread over a process pool whose
+    workers receive the data once when they start and return only metrics.
+    With a ``cache``, combinations already evaluated on the same data are
+    read from it, and the metrics of every chunk are stored in it as soon as
+    the chunk is evaluated.
+
+    Args:
+        data: Historical price data.
+        strategy_type: The type of strategy being evaluated.
+        param_combinations: The parameter sets to evaluate.
+        tickers: The ticker or tickers used in the backtest.
+        n_jobs: The number of worker processes. Values below 1 use every CPU.
+        chunk_size: The number of combinations per chunk. Defaults to about
+                    ``SERIAL_CHUNK_COUNT`` chunks when serial, or about four
+                    chunks per worker. Smaller chunks bound peak memory.
+        lazy: Whether to evaluate each chunk as lazy backtest plans collected
+              together with ``evaluate_param_combinations_lazy``, rather than
+              as one vectorised batch.
+        cache: The metrics cache to consult and update, if any.
+        progress: The callback receiving the progress after each chunk.
+
+    Returns:
+        The performance metrics of each combination, in the order given, and
+        the number of combinations backtested rather than read from the
+        cache.
+    """
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    total_combinations = len(param_combinations)
+
+    # Only evaluate the combinations missing from the cache.
+    cached_metrics: list[dict[str, float] | None] = [None] * total_combinations
+    fingerprint = ""
+    if cache is not None:
+        fingerprint = dataset_fingerprint(data)
+        cached_metrics = cache.get_many(fingerprint, strategy_type, param_combinations)
+    missing = [i for i, metrics in enumerate(cached_metrics) if metrics is None]
+    batch_metrics = [metrics or {} for metrics in cached_metrics]
+    num_evaluated = total_combinations - len(missing)
+
+    if n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    if chunk_size is None:
+        num_chunks = n_jobs * 4 if n_jobs > 1 else SERIAL_CHUNK_COUNT
+        chunk_size = max(1, math.ceil(len(missing) / num_chunks))
+    chunk_indices = [
+        missing[i : i + chunk_size] for i in range(0, len(missing), chunk_size)
+    ]
+    chunks = [[param_combinations[i] for i in indices] for indices in chunk_indices]
+
+    with contextlib.ExitStack() as stack:
+        if n_jobs > 1 and len(chunks) > 1:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=min(n_jobs, len(chunks)),
+                    mp_context=_POOL_CONTEXT,
+                    initializer=_init_grid_worker,
+                    initargs=(data, strategy_type, tickers, lazy),
+                )
+            )
+            chunk_metrics: Iterable[list[dict[str, float]]] = executor.map(
+                _evaluate_grid_chunk, chunks
+            )
+        else:
+            evaluate = (
+                evaluate_param_combinations_lazy
+                if lazy
+                else evaluate_param_combinations
+            )
+            chunk_metrics = (
+                evaluate(data, strategy_type, chunk, tickers) for chunk in chunks
+            )
+
+        # Results arrive in chunk order, so the metrics are in the same order
+        # as for a serial run.
+        for chunk, indices, metrics_list in zip(chunks, chunk_indices, chunk_metrics):
+            for i, metrics in zip(indices, metrics_list):
+                batch_metrics[i] = metrics
+            if cache is not None:
+                cache.put_many(fingerprint, strategy_type, chunk, metrics_list)
+            num_evaluated += len(indices)
+            progress(
+                num_evaluated / total_combinations,
+                f"Evaluated parameter combination {num_evaluated} / "
+                f"{total_combinations}",
+            )
+
+    return batch_metrics, len(missing)
+
+
+def save_top_combinations(
+    data: pl.DataFrame,
+    strategy_type: str,
+    param_combinations: list[dict[str, Any]],
+    metrics_list: list[dict[str, float]],
+    tickers: Union[str, List[str]],
+    save_top_k: int,
+) -> None:
+    """
+    Save the best parameter combinations by Sharpe ratio in one transaction.
+
+    Records are only built for the saved combinations, and ties keep the
+    combination that comes first.
+
+    Args:
+        data: Historical price data.
+        strategy_type: The type of strategy that was evaluated.
+        param_combinations: The evaluated parameter sets.
+        metrics_list: The performance metrics of each parameter set.
+        tickers: The ticker or tickers used in the backtest.
+        save_top_k: The number of best combinations to save.
+    """
+    if save_top_k <= 0:
+        return
+    strategy_name = get_strategy_class(strategy_type).__name__
+    top_indices = _top_k_indices(
+        [metrics["Sharpe Ratio"] for metrics in metrics_list], save_top_k
+    )
+    save_strategy_results(
+        [
+            build_result_record(
+                data,
+                strategy_name,
+                param_combinations[i],
+                metrics_list[i],
+                tickers,
+            )
+            for i in top_indices
+        ]
+    )
+
+
+def select_best_index(metrics_list: list[dict[str, float]]) -> int | None:
+    """
+    Return the index of the metrics with the highest Sharpe ratio, keeping
+    the earliest on ties and ignoring NaN.
+
+    Args:
+        metrics_list: The performance metrics of each candidate.
+
+    Returns:
+        The index of the best candidate, or None if no candidate has a Sharpe
+        ratio.
+    """
+    best_index = None
+    best_sharpe_ratio = float("-inf")
+    for i, metrics in enumerate(metrics_list):
         if metrics["Sharpe Ratio"] > best_sharpe_ratio:
             best_sharpe_ratio = metrics["Sharpe Ratio"]
-            best_params = current_params
-            best_metrics = metrics
+            best_index = i
+    return best_index
 
-    progress_bar.empty()
-    status_text.empty()
-    if not best_params or not best_metrics:
-        raise ValueError("Parameter optimisation failed")
 
-    return best_params, best_metrics
+def evaluate_param_combinations(
+    data: pl.DataFrame,
+    strategy_type: str,
+    param_combinations: list[dict[str, Any]],
+    tickers: Union[str, List[str]],
+) -> list[dict[str, float]]:
+    """
+    Evaluate parameter combinations as a single batch without saving them.
+
+    Args:
+        data: Historical price data.
+        strategy_type: The type of strategy being evaluated.
+        param_combinations: The parameter sets to evaluate.
+        tickers: The ticker or tickers used in the backtest.
+
+    Returns:
+        The performance metrics of each combination, in the order given.
+    """
+    if not param_combinations:
+        return []
+    positions = get_strategy_class(strategy_type).generate_positions_grid(
+        data, param_combinations
+    )
+    backtester = Backtester(
+        data,
+        create_strategy(strategy_type, param_combinations[0]),
+        tickers=tickers,
+    )
+    return backtester.run_batch(positions).metrics
+
+
+def evaluate_param_combinations_lazy(
+    data: pl.DataFrame,
+    strategy_type: str,
+    param_combinations: list[dict[str, Any]],
+    tickers: Union[str, List[str]],
+) -> list[dict[str, float]]:
+    """
+    Evaluate parameter combinations as lazy backtest plans collected together,
+    without saving them.
+
+    Each combination becomes a lazy plan from its signals to its metrics, and
+    all plans are run with a single ``pl.collect_all`` call. Polars then
+    optimises the plans together and spreads them over its thread pool. The
+    metrics are the same as those of ``Backtester.run``.
+
+    Args:
+        data: Historical price data.
+        strategy_type: The type of strategy being evaluated.
+        param_combinations: The parameter sets to evaluate.
+        tickers: The ticker or tickers used in the backtest.
+
+    Returns:
+        The performance metrics of each combination, in the order given.
+    """
+    if not param_combinations or data.is_empty():
+        return evaluate_param_combinations(
+            data, strategy_type, param_combinations, tickers
+        )
+    plans = [
+        Backtester(data, create_strategy(strategy_type, params), tickers=tickers)
+        .build_plan()
+        .select(performance_metric_expressions())
+        for params in param_combinations
+    ]
+    return [metrics.row(0, named=True) for metrics in pl.collect_all(plans)]
+
+
+# Worker processes are spawned rather than forked, as forking a process that
+# has started Polars' thread pool can deadlock.
+_POOL_CONTEXT = multiprocessing.get_context("spawn")
+
+# State of a grid search worker process, set once by _init_grid_worker.
+_grid_worker_state: dict[str, Any] = {}
+
+
+def _init_grid_worker(
+    data: pl.DataFrame,
+    strategy_type: str,
+    tickers: Union[str, List[str]],
+    lazy: bool = False,
+) -> None:
+    """Store the data for a grid search worker when its process starts."""
+    _grid_worker_state.update(
+        data=data, strategy_type=strategy_type, tickers=tickers, lazy=lazy
+    )
+
+
+def _evaluate_grid_chunk(
+    param_combinations: list[dict[str, Any]],
+) -> list[dict[str, float]]:
+    """Evaluate a chunk of combinations in a grid search worker."""
+    evaluate = (
+        evaluate_param_combinations_lazy
+        if _grid_worker_state["lazy"]
+        else evaluate_param_combinations
+    )
+    return evaluate(
+        _grid_worker_state["data"],
+        _grid_worker_state["strategy_type"],
+        param_combinations,
+        _grid_worker_state["tickers"],
+    )
 
 
 def optimise_pairs_trading_tickers(
@@ -151,62 +569,443 @@ def optimise_pairs_trading_tickers(
     end_date: datetime.date,
     strategy_params: dict[str, Any],
     optimise: bool,
+    save_top_k: int = 0,
+    n_jobs: int = 1,
+    screen_top_k: int | None = None,
+    screen_method: str = "correlation",
+    progress: ProgressCallback = no_progress,
 ) -> tuple[tuple[str, str], dict[str, Any], dict[str, float]]:
-    """Search for the best ticker pair for pairs trading."""
+    """
+    Search for the best ticker pair for pairs trading.
+
+    With ``screen_top_k`` set, the price history of every ticker is loaded
+    once and the pairs are first narrowed down by ``screen_pairs``, so only
+    the ``screen_top_k`` most promising pairs are backtested.
+
+    Each pair is scored on the dates where both tickers have a price, and
+    ties go to the pair that comes first. When ``optimise`` is True, the
+    price history of every ticker is loaded once into a date-aligned matrix
+    and every pair and parameter combination is evaluated together by
+    ``evaluate_pairs_grid``. Pairs for which no parameter combination has a
+    Sharpe ratio are skipped. The grid is evaluated in this process, as it
+    is already vectorised over pairs and combinations, so ``n_jobs`` is
+    ignored. Otherwise, with ``n_jobs`` above 1, the matrix is put in shared
+    memory and a process pool scores the pairs in parallel, reading the
+    prices without copying them, with the same result as a serial run.
+
+    Candidates are not saved as they are evaluated. The ``save_top_k`` best
+    pairs by Sharpe ratio are saved in one transaction at the end.
+
+    Args:
+        top_companies: The candidate tickers and their market caps.
+        start_date: The start date for the data.
+        end_date: The end date for the data.
+        strategy_params: Fixed strategy parameters, or parameter ranges when
+                         ``optimise`` is True.
+        optimise: Whether to optimise the strategy parameters for each pair.
+        save_top_k: The number of best pairs to save.
+        n_jobs: The number of worker processes when ``optimise`` is False,
+                and ignored otherwise. Values below 1 use every CPU.
+        screen_top_k: The number of pairs to keep after screening, or None
+                      to backtest every pair.
+        screen_method: The statistic to screen pairs by, either
+                       'correlation' or 'cointegration'.
+        progress: The callback receiving the progress after each pair.
+
+    Returns:
+        A tuple containing the best pair, its parameters and its metrics.
+    """
     best_pair = None
     best_params = None
     best_metrics = None
     best_sharpe_ratio = float("-inf")
+    candidates: list[tuple[float, dict[str, Any]]] = []
 
-    ticker_pairs = list(
-        itertools.combinations([company[0] for company in top_companies], 2)
-    )
+    tickers = [company[0] for company in top_companies]
+    # Skip pairs of share classes of the same company.
+    company_ids = get_company_identity_index(tickers)
     ticker_pairs = [
-        pair for pair in ticker_pairs if not is_same_company(pair[0], pair[1])
+        pair
+        for pair in itertools.combinations(tickers, 2)
+        if company_ids[pair[0]] != company_ids[pair[1]]
     ]
-    total_combinations = len(ticker_pairs)
-    progress_bar = st.progress(0)
-    status_text = st.empty()
     prev_pair_processing_time = 0.0
 
-    for i, (ticker1, ticker2) in enumerate(ticker_pairs):
-        start_time = time.time()
-        status_text.text(
-            f"Evaluating pair {i + 1} / {total_combinations}: {ticker1} vs. {ticker2} "
-            f"(prev. pair processing time: {prev_pair_processing_time:.4f} seconds)"
+    price_matrix = None
+    if screen_top_k is not None:
+        progress(0.0, "Screening pairs...")
+        price_matrix = _load_price_matrix(ticker_pairs, start_date, end_date)
+        ticker_pairs = screen_pairs(
+            price_matrix[0],
+            price_matrix[2],
+            ticker_pairs,
+            screen_top_k,
+            screen_method,
         )
-        progress_bar.progress((i + 1) / total_combinations)
-
-        data = load_yfinance_data_two_tickers(ticker1, ticker2, start_date, end_date)
-        if data is None or data.is_empty():
-            continue
+    total_combinations = len(ticker_pairs)
 
+    if n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    with contextlib.ExitStack() as stack:
         if optimise:
-            param_ranges = {
-                k: [v] if isinstance(v, (int, float)) else v
-                for k, v in strategy_params.items()
-            }
-            current_params, current_metrics = optimise_strategy_params(
-                data, "Pairs Trading", param_ranges, [ticker1, ticker2]
+            progress(0.0, "Evaluating every pair and parameter combination...")
+            evaluations = _evaluate_pairs_with_grid(
+                ticker_pairs,
+                price_matrix or _load_price_matrix(ticker_pairs, start_date, end_date),
+                strategy_params,
+                save_top_k > 0,
+            )
+        elif n_jobs > 1 and total_combinations > 1:
+            progress(0.0, "Loading price data for every ticker...")
+            evaluations = _evaluate_pairs_in_parallel(
+                stack,
+                ticker_pairs,
+                price_matrix or _load_price_matrix(ticker_pairs, start_date, end_date),
+                strategy_params,
+                save_top_k > 0,
+                n_jobs,
             )
         else:
-            _, current_metrics = run_backtest(
-                data, "Pairs Trading", strategy_params, [ticker1, ticker2]
+            evaluations = _evaluate_pairs_serially(
+                ticker_pairs,
+                start_date,
+                end_date,
+                strategy_params,
+                save_top_k > 0,
+                price_matrix,
+            )
+
+        start_time = time.time()
+        for i, ((ticker1, ticker2), evaluation) in enumerate(
+            zip(ticker_pairs, evaluations)
+        ):
+            end_time = time.time()
+            prev_pair_processing_time = end_time - start_time
+            start_time = end_time
+            progress(
+                (i + 1) / total_combinations,
+                f"Evaluated pair {i + 1} / {total_combinations}: {ticker1} vs. "
+                f"{ticker2} (pair processing time: "
+                f"{prev_pair_processing_time:.4f} seconds)",
             )
-            current_params = strategy_params
+            if evaluation is None:
+                continue
 
-        if current_metrics["Sharpe Ratio"] > best_sharpe_ratio:
-            best_sharpe_ratio = current_metrics["Sharpe Ratio"]
-            best_pair = (ticker1, ticker2)
-            best_params = current_params
-            best_metrics = current_metrics
+            current_params, current_metrics, record = evaluation
+            if record is not None:
+                candidates.append((current_metrics["Sharpe Ratio"], record))
 
-        end_time = time.time()
-        prev_pair_processing_time = end_time - start_time
+            if current_metrics["Sharpe Ratio"] > best_sharpe_ratio:
+                best_sharpe_ratio = current_metrics["Sharpe Ratio"]
+                best_pair = (ticker1, ticker2)
+                best_params = current_params
+                best_metrics = current_metrics
 
-    progress_bar.empty()
-    status_text.empty()
+    _save_top_candidates(candidates, save_top_k)
     if not best_pair or not best_params or not best_metrics:
         raise ValueError("Pairs trading optimisation failed")
 
     return best_pair, best_params, best_metrics
+
+
+# The parameters chosen for a pair, its metrics, and its record if requested.
+_PairEvaluation = tuple[dict[str, Any], dict[str, float], dict[str, Any] | None]
+
+# The tickers with data, their dates and their date-aligned closing prices.
+_PriceMatrix = tuple[list[str], pl.Series, np.ndarray]
+
+
+def _evaluate_pairs_serially(
+    ticker_pairs: list[tuple[str, str]],
+    start_date: datetime.date,
+    end_date: datetime.date,
+    strategy_params: dict[str, Any],
+    build_records: bool,
+    price_matrix: _PriceMatrix | None = None,
+) -> Iterator[_PairEvaluation | None]:
+    """
+    Evaluate each pair in turn with fixed parameters, yielding None for pairs
+    without data. The pairs are taken from ``price_matrix`` when it is
+    already loaded.
+    """
+    columns = (
+        {}
+        if price_matrix is None
+        else {ticker: i for i, ticker in enumerate(price_matrix[0])}
+    )
+    for ticker1, ticker2 in ticker_pairs:
+        if price_matrix is None:
+            data = load_yfinance_data_two_tickers(
+                ticker1, ticker2, start_date, end_date
+            )
+        elif ticker1 in columns and ticker2 in columns:
+            data = get_pair_data(
+                price_matrix[1], price_matrix[2], columns[ticker1], columns[ticker2]
+            )
+        else:
+            data = None
+        if data is None or data.is_empty():
+            yield None
+            continue
+
+        _, current_metrics = run_backtest(
+            data,
+            "Pairs Trading",
+            strategy_params,
+            [ticker1, ticker2],
+            persist=False,
+            compact=True,
+        )
+        yield _pair_evaluation(
+            data, [ticker1, ticker2], strategy_params, current_metrics, build_records
+        )
+
+
+def _evaluate_pairs_in_parallel(
+    stack: contextlib.ExitStack,
+    ticker_pairs: list[tuple[str, str]],
+    price_matrix: _PriceMatrix,
+    strategy_params: dict[str, Any],
+    build_records: bool,
+    n_jobs: int,
+) -> Iterator[_PairEvaluation | None]:
+    """
+    Evaluate pairs with fixed parameters on a process pool sharing one price
+    matrix, yielding the results in pair order. The pool and shared memory
+    are released when ``stack`` closes.
+    """
+    tickers, dates, prices = price_matrix
+    columns = {ticker: i for i, ticker in enumerate(tickers)}
+
+    shared_prices = SharedPriceMatrix.create(prices)
+    stack.callback(shared_prices.unlink)
+    stack.callback(shared_prices.close)
+
+    pair_columns = [
+        (columns.get(ticker1), columns.get(ticker2), [ticker1, ticker2])
+        for ticker1, ticker2 in ticker_pairs
+    ]
+    chunk_size = max(1, math.ceil(len(pair_columns) / (n_jobs * 4)))
+    chunks = [
+        pair_columns[i : i + chunk_size]
+        for i in range(0, len(pair_columns), chunk_size)
+    ]
+    executor = stack.enter_context(
+        ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(chunks)),
+            mp_context=_POOL_CONTEXT,
+            initializer=_init_pair_worker,
+            initargs=(
+                shared_prices.name,
+                shared_prices.shape,
+                dates,
+                strategy_params,
+                build_records,
+            ),
+        )
+    )
+    for chunk_evaluations in executor.map(_evaluate_pair_chunk, chunks):
+        yield from chunk_evaluations
+
+
+def _evaluate_pairs_with_grid(
+    ticker_pairs: list[tuple[str, str]],
+    price_matrix: _PriceMatrix,
+    strategy_params: dict[str, Any],
+    build_records: bool,
+) -> Iterator[_PairEvaluation | None]:
+    """
+    Evaluate every parameter combination on every pair with one
+    ``evaluate_pairs_grid`` call, yielding the best combination of each pair
+    in pair order. The winners are re-run through the standard backtest so
+    that their metrics match a regular run exactly.
+    """
+    tickers, dates, prices = price_matrix
+    columns = {ticker: i for i, ticker in enumerate(tickers)}
+    param_combinations = [
+        dict(zip(strategy_params, values))
+        for values in itertools.product(*_as_param_ranges(strategy_params).values())
+    ]
+    grid = evaluate_pairs_grid(tickers, prices, ticker_pairs, param_combinations)
+    metrics_by_pair = grid.select(
+        "Ticker 1", "Ticker 2", *PERFORMANCE_METRICS
+    ).partition_by("Ticker 1", "Ticker 2", as_dict=True, include_key=False)
+
+    for ticker1, ticker2 in ticker_pairs:
+        pair_metrics = metrics_by_pair.get((ticker1, ticker2))
+        best_index = (
+            None if pair_metrics is None else select_best_index(pair_metrics.to_dicts())
+        )
+        if best_index is None:
+            yield None
+            continue
+
+        data = get_pair_data(dates, prices, columns[ticker1], columns[ticker2])
+        current_params = param_combinations[best_index]
+        _, current_metrics = run_backtest(
+            data,
+            "Pairs Trading",
+            current_params,
+            [ticker1, ticker2],
+            persist=False,
+            compact=True,
+        )
+        yield _pair_evaluation(
+            data, [ticker1, ticker2], current_params, current_metrics, build_records
+        )
+
+
+def _load_price_matrix(
+    ticker_pairs: list[tuple[str, str]],
+    start_date: datetime.date,
+    end_date: datetime.date,
+) -> _PriceMatrix:
+    """
+    Load every ticker of the pairs in one batched request into a date-aligned
+    price matrix, returning the tickers with data (the matrix columns), the
+    dates and the prices.
+    """
+    tickers = list(dict.fromkeys(ticker for pair in ticker_pairs for ticker in pair))
+    data = load_yfinance_data_many_tickers(tickers, start_date, end_date)
+    ticker_data = {
+        str(ticker): ticker_prices
+        for (ticker,), ticker_prices in data.partition_by(
+            "Ticker", as_dict=True, include_key=False
+        ).items()
+    }
+    dates, prices = build_price_matrix(ticker_data)
+    return list(ticker_data), dates, prices
+
+
+# State of a pair evaluation worker process, set once by _init_pair_worker.
+_pair_worker_state: dict[str, Any] = {}
+
+
+def _init_pair_worker(
+    shared_prices_name: str,
+    shared_prices_shape: tuple[int, int],
+    dates: pl.Series,
+    strategy_params: dict[str, Any],
+    build_records: bool,
+) -> None:
+    """Attach a pair evaluation worker to the shared price matrix."""
+    _pair_worker_state.update(
+        prices=SharedPriceMatrix.attach(shared_prices_name, shared_prices_shape),
+        dates=dates,
+        strategy_params=strategy_params,
+        build_records=build_records,
+    )
+
+
+def _evaluate_pair_chunk(
+    pair_columns: list[tuple[int | None, int | None, list[str]]],
+) -> list[_PairEvaluation | None]:
+    """Evaluate a chunk of pairs in a pair evaluation worker."""
+    prices = _pair_worker_state["prices"].array
+    strategy_params = _pair_worker_state["strategy_params"]
+    evaluations: list[_PairEvaluation | None] = []
+    for column1, column2, tickers in pair_columns:
+        if column1 is None or column2 is None:
+            evaluations.append(None)
+            continue
+        data = get_pair_data(_pair_worker_state["dates"], prices, column1, column2)
+        if data.is_empty():
+            evaluations.append(None)
+            continue
+
+        _, current_metrics = run_backtest(
+            data,
+            "Pairs Trading",
+            strategy_params,
+            tickers,
+            persist=False,
+            compact=True,
+        )
+        evaluations.append(
+            _pair_evaluation(
+                data,
+                tickers,
+                strategy_params,
+                current_metrics,
+                _pair_worker_state["build_records"],
+            )
+        )
+    return evaluations
+
+
+def _pair_evaluation(
+    data: pl.DataFrame,
+    tickers: list[str],
+    params: dict[str, Any],
+    metrics: dict[str, float],
+    build_record: bool,
+) -> _PairEvaluation:
+    """Bundle the result of evaluating a pair, with its record if requested."""
+    record = (
+        build_result_record(data, "PairsTradingStrategy", params, metrics, tickers)
+        if build_record
+        else None
+    )
+    return params, metrics, record
+
+
+def _as_param_ranges(strategy_params: dict[str, Any]) -> dict[str, Any]:
+    """Wrap fixed parameter values so that every parameter is a range."""
+    return {
+        k: [v] if isinstance(v, (int, float)) else list(v)
+        for k, v in strategy_params.items()
+    }
+
+
+def _load_ticker_data(
+    top_companies: List[Tuple[str, float]],
+    start_date: datetime.date,
+    end_date: datetime.date,
+) -> dict[tuple[Any, ...], pl.DataFrame]:
+    """
+    Load the data of every ticker in one bulk request, keyed by (ticker,).
+    Tickers without data are left out.
+    """
+    tickers = [ticker for ticker, _ in top_companies]
+    return load_yfinance_data_many_tickers(tickers, start_date, end_date).partition_by(
+        "Ticker", as_dict=True, include_key=False
+    )
+
+
+def _fixed_params(strategy_params: dict[str, Any]) -> dict[str, Any]:
+    """Return the parameters with the first value of any range or list."""
+    return {
+        k: v[0] if isinstance(v, (list, range)) else v
+        for k, v in strategy_params.items()
+    }
+
+
+def _top_k_indices(scores: list[float], k: int) -> list[int]:
+    """
+    Return the indices of the ``k`` highest scores, best first, keeping the
+    earlier index on ties and ignoring NaN.
+    """
+    return [
+        i
+        for _, i in heapq.nsmallest(
+            k,
+            ((-score, i) for i, score in enumerate(scores) if not math.isnan(score)),
+        )
+    ]
+
+
+def _save_top_candidates(
+    candidates: list[tuple[float, dict[str, Any]]], save_top_k: int
+) -> None:
+    """
+    Save the best-scoring candidate runs in a single transaction.
+
+    Args:
+        candidates: Pairs of (score, record) in evaluation order. Ties keep
+                    the earlier candidate and NaN scores are never saved.
+        save_top_k: The number of candidates to save.
+    """
+    if save_top_k <= 0:
+        return
+    top_indices = _top_k_indices([score for score, _ in candidates], save_top_k)
+    save_strategy_results([candidates[i][1] for i in top_indices])
@@ -0,0 +1,172 @@
+"""
+Screens ticker pairs by how closely their prices move together, so that
+pairs trading only backtests the most promising candidates of a large
+universe.
+"""
+
+import numpy as np
+
+# The statistics a pair can be screened by.
+SCREEN_METHODS = ("correlation", "cointegration")
+
+# The largest number of (bar, pair) elements held in one block when
+# calculating cointegration statistics, which bounds their peak memory.
+MAX_BLOCK_ELEMENTS = 2**22
+
+
+def return_correlation_matrix(prices: np.ndarray) -> np.ndarray:
+    """
+    Calculates the correlation between the simple returns of every pair of
+    tickers.
+
+    The returns of a ticker are missing where it or the previous date has no
+    price. Each correlation uses the dates on which both tickers have a
+    return, and the sums it needs for every pair come from a few matrix
+    products of the return matrix and its mask, rather than one calculation
+    per pair.
+
+    Args:
+        prices: A matrix of closing prices with one row per date and one
+                column per ticker, with NaN where a ticker has no price.
+
+    Returns:
+        A symmetric matrix with the correlation of each pair of columns, or
+        NaN where two tickers have fewer than two shared returns or one of
+        them has constant returns over them.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = (prices[1:] - prices[:-1]) / prices[:-1]
+    valid = np.isfinite(returns)
+    mask = valid.astype(np.float64)
+    # Centre each column on its mean to limit cancellation in the sums.
+    counts = mask.sum(axis=0)
+    with np.errstate(invalid="ignore"):
+        means = np.where(valid, returns, 0.0).sum(axis=0) / counts
+    centred = np.where(valid, returns - np.nan_to_num(means), 0.0)
+
+    n = mask.T @ mask
+    sums = centred.T @ mask
+    squares = (centred**2).T @ mask
+    products = centred.T @ centred
+    covariance = n * products - sums * sums.T
+    variance = n * squares - sums**2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = covariance / np.sqrt(variance * variance.T)
+    correlation[(n < 2) | ~np.isfinite(correlation)] = np.nan
+    return np.clip(correlation, -1.0, 1.0)
+
+
+def engle_granger_statistics(
+    prices: np.ndarray, column_pairs: list[tuple[int, int]]
+) -> np.ndarray:
+    """
+    Calculates the Engle-Granger cointegration statistic of column pairs.
+
+    For each pair, the first column's prices are regressed on the second's
+    with an intercept, on the dates where both are priced. The statistic is
+    the Dickey-Fuller t-statistic of the residuals, from regressing their
+    changes on their previous values. More negative values mean the spread
+    reverts to its mean more reliably. Pairs priced on the same dates are
+    calculated together as columns of one array.
+
+    Args:
+        prices: A matrix of closing prices with one row per date and one
+                column per ticker, with NaN where a ticker has no price.
+        column_pairs: The pairs of columns to test.
+
+    Returns:
+        The statistic of each pair, or NaN where a pair has fewer than three
+        shared dates or a degenerate regression.
+    """
+    statistics = np.full(len(column_pairs), np.nan)
+    priced = np.isfinite(prices)
+    pairs_by_dates: dict[bytes, tuple[np.ndarray, list[int]]] = {}
+    for i, (column1, column2) in enumerate(column_pairs):
+        both_priced = priced[:, column1] & priced[:, column2]
+        if both_priced.sum() >= 3:
+            key = both_priced.tobytes()
+            pairs_by_dates.setdefault(key, (both_priced, []))[1].append(i)
+
+    for both_priced, pair_indices in pairs_by_dates.values():
+        rows = prices[both_priced]
+        block_size = max(1, MAX_BLOCK_ELEMENTS // len(rows))
+        for start in range(0, len(pair_indices), block_size):
+            block = pair_indices[start : start + block_size]
+            statistics[block] = _engle_granger_block(
+                rows[:, [column_pairs[i][0] for i in block]],
+                rows[:, [column_pairs[i][1] for i in block]],
+            )
+    return statistics
+
+
+def screen_pairs(
+    tickers: list[str],
+    prices: np.ndarray,
+    ticker_pairs: list[tuple[str, str]],
+    top_k: int,
+    method: str = "correlation",
+) -> list[tuple[str, str]]:
+    """
+    Keeps the most promising ticker pairs for pairs trading.
+
+    Args:
+        tickers: The tickers of the columns of ``prices``.
+        prices: A matrix of closing prices with one row per date and one
+                column per ticker, with NaN where a ticker has no price.
+        ticker_pairs: The candidate pairs.
+        top_k: The number of pairs to keep.
+        method: 'correlation' to keep the pairs with the most correlated
+                returns, or 'cointegration' to keep the pairs with the most
+                negative Engle-Granger statistic.
+
+    Returns:
+        The kept pairs, in the order of ``ticker_pairs``. Pairs with a ticker
+        missing from ``tickers`` or without a score are never kept, and ties
+        keep the pair that comes first.
+    """
+    if method not in SCREEN_METHODS:
+        raise ValueError(f"Unknown screen method: {method}")
+    columns = {ticker: i for i, ticker in enumerate(tickers)}
+    candidates = [
+        (i, (columns[ticker1], columns[ticker2]))
+        for i, (ticker1, ticker2) in enumerate(ticker_pairs)
+        if ticker1 in columns and ticker2 in columns
+    ]
+    if top_k <= 0 or not candidates:
+        return []
+
+    column_pairs = [column_pair for _, column_pair in candidates]
+    if method == "correlation":
+        correlation = return_correlation_matrix(prices)
+        first, second = np.array(column_pairs).T
+        scores = correlation[first, second]
+    else:
+        scores = -engle_granger_statistics(prices, column_pairs)
+
+    scored = np.flatnonzero(~np.isnan(scores))
+    # A stable sort keeps earlier pairs first on ties.
+    best = scored[np.argsort(-scores[scored], kind="stable")[:top_k]]
+    return [ticker_pairs[candidates[i][0]] for i in np.sort(best)]
+
+
+def _engle_granger_block(close_1: np.ndarray, close_2: np.ndarray) -> np.ndarray:
+    """
+    Calculates the Engle-Granger statistic of a block of pairs priced on the
+    same dates, with one column per pair.
+    """
+    num_rows = len(close_1)
+    x = close_2 - close_2.mean(axis=0)
+    y = close_1 - close_1.mean(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = (x * y).sum(axis=0) / (x**2).sum(axis=0)
+        residuals = y - beta * x
+
+        lagged = residuals[:-1]
+        changes = np.diff(residuals, axis=0)
+        lagged_squares = (lagged**2).sum(axis=0)
+        gamma = (lagged * changes).sum(axis=0) / lagged_squares
+        errors = changes - gamma * lagged
+        variance = (errors**2).sum(axis=0) / (num_rows - 2)
+        statistics = gamma / np.sqrt(variance / lagged_squares)
+    statistics[~np.isfinite(statistics)] = np.nan
+    return statistics
@@ -0,0 +1,178 @@
+"""
+Evaluates pairs trading for many ticker pairs and many parameter combinations
+at once, broadcasting NumPy array operations over a date-aligned price matrix
+instead of running one backtest per pair and combination.
+"""
+
+from typing import Any
+
+import numpy as np
+import polars as pl
+
+from quant_trading_strategy_backtester.backtester import (
+    PERFORMANCE_METRICS,
+    evaluate_position_batch,
+)
+from quant_trading_strategy_backtester.rolling import RollingStatistics
+from quant_trading_strategy_backtester.strategies.pairs_trading import (
+    calculate_hysteresis_signals,
+    calculate_z_score,
+)
+
+# The largest number of (bar, pair, combination) elements held in one block
+# of positions, which bounds the peak memory of a grid evaluation.
+MAX_BLOCK_ELEMENTS = 2**22
+
+
+def evaluate_pairs_grid(
+    tickers: list[str],
+    prices: np.ndarray,
+    ticker_pairs: list[tuple[str, str]],
+    param_combinations: list[dict[str, Any]],
+    initial_capital: float = 100000.0,
+) -> pl.DataFrame:
+    """
+    Evaluates every pairs trading parameter combination on every pair.
+
+    Each pair is traded on the dates where both tickers have a price, as in
+    ``get_pair_data``. Pairs priced on the same dates are evaluated together:
+    their spreads form a matrix with one column per pair, the rolling
+    z-scores for each window come from one prefix-sum precomputation of that
+    matrix, and the signals for every entry and exit threshold are derived
+    with one broadcast over a (bar, pair, combination) array. The positions
+    match ``PairsTradingStrategy.generate_positions_grid``, so the metrics
+    match ``evaluate_param_combinations`` on each pair.
+
+    Args:
+        tickers: The tickers of the columns of ``prices``.
+        prices: A matrix of closing prices with one row per date and one
+                column per ticker, with NaN where a ticker has no price.
+        ticker_pairs: The pairs to evaluate.
+        param_combinations: The pairs trading parameter sets to evaluate.
+        initial_capital: The initial capital of each backtest.
+
+    Returns:
+        A DataFrame with one row per pair and parameter combination, in pair
+        order and then combination order. Its columns are 'Ticker 1',
+        'Ticker 2', 'Combination' (the index into ``param_combinations``),
+        the parameters and the metrics in ``PERFORMANCE_METRICS``. Pairs
+        without a date on which both tickers are priced are left out.
+    """
+    columns = {ticker: i for i, ticker in enumerate(tickers)}
+    priced = np.isfinite(prices)
+
+    # Group the pairs by the dates they are traded on.
+    pairs_by_dates: dict[bytes, tuple[np.ndarray, list[int]]] = {}
+    for pair_index, (ticker1, ticker2) in enumerate(ticker_pairs):
+        if ticker1 not in columns or ticker2 not in columns:
+            continue
+        both_priced = priced[:, columns[ticker1]] & priced[:, columns[ticker2]]
+        if both_priced.any():
+            pairs_by_dates.setdefault(both_priced.tobytes(), (both_priced, []))[
+                1
+            ].append(pair_index)
+
+    num_combinations = len(param_combinations)
+    pair_metrics: dict[int, list[dict[str, float]]] = {}
+    for both_priced, pair_indices in pairs_by_dates.values():
+        rows = prices[both_priced]
+        block_size = max(1, MAX_BLOCK_ELEMENTS // max(1, len(rows) * num_combinations))
+        for start in range(0, len(pair_indices), block_size):
+            block = pair_indices[start : start + block_size]
+            close_1 = rows[:, [columns[ticker_pairs[i][0]] for i in block]]
+            close_2 = rows[:, [columns[ticker_pairs[i][1]] for i in block]]
+            metrics = _evaluate_block(
+                close_1, close_2, param_combinations, initial_capital
+            )
+            for j, pair_index in enumerate(block):
+                pair_metrics[pair_index] = metrics[
+                    j * num_combinations : (j + 1) * num_combinations
+                ]
+
+    records = [
+        {
+            "Ticker 1": ticker_pairs[pair_index][0],
+            "Ticker 2": ticker_pairs[pair_index][1],
+            "Combination": combination,
+        }
+        | params
+        | metrics
+        for pair_index in sorted(pair_metrics)
+        for combination, (params, metrics) in enumerate(
+            zip(param_combinations, pair_metrics[pair_index])
+        )
+    ]
+    if not records:
+        return pl.DataFrame(
+            schema={
+                "Ticker 1": pl.String,
+                "Ticker 2": pl.String,
+                "Combination": pl.Int64,
+            }
+            | {metric: pl.Float64 for metric in PERFORMANCE_METRICS}
+        )
+    return pl.DataFrame(records)
+
+
+def _evaluate_block(
+    close_1: np.ndarray,
+    close_2: np.ndarray,
+    param_combinations: list[dict[str, Any]],
+    initial_capital: float,
+) -> list[dict[str, float]]:
+    """
+    Evaluates every parameter combination on a block of pairs traded on the
+    same dates.
+
+    Args:
+        close_1: The closing prices of the first ticker of each pair, with
+                 one column per pair.
+        close_2: The closing prices of the second ticker of each pair.
+        param_combinations: The parameter sets to evaluate.
+        initial_capital: The initial capital of each backtest.
+
+    Returns:
+        The metrics of each pair and combination, ordered by pair and then
+        by combination.
+    """
+    num_rows, num_pairs = close_1.shape
+    spread = close_1 - close_2
+    stats = RollingStatistics(spread)
+
+    positions = np.zeros((num_rows, num_pairs, len(param_combinations)))
+    columns_by_window: dict[int, list[int]] = {}
+    for i, params in enumerate(param_combinations):
+        columns_by_window.setdefault(int(params["window"]), []).append(i)
+    for window, combination_indices in columns_by_window.items():
+        z_score = calculate_z_score(spread, stats.mean(window), stats.std(window))
+        signal = calculate_hysteresis_signals(
+            z_score[:, :, np.newaxis],
+            np.array(
+                [
+                    float(param_combinations[i]["entry_z_score"])
+                    for i in combination_indices
+                ]
+            ),
+            np.array(
+                [
+                    float(param_combinations[i]["exit_z_score"])
+                    for i in combination_indices
+                ]
+            ),
+        )
+        positions[1:, :, combination_indices] = np.diff(signal, axis=0)
+
+    # The difference between the simple returns of the two assets, as in the
+    # derived returns of pairs data.
+    asset_returns = np.full((num_rows, num_pairs), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        asset_returns[1:] = (close_1[1:] - close_1[:-1]) / close_1[:-1] - (
+            close_2[1:] - close_2[:-1]
+        ) / close_2[:-1]
+
+    num_series = num_pairs * len(param_combinations)
+    return evaluate_position_batch(
+        np.repeat(asset_returns, len(param_combinations), axis=1),
+        positions.reshape(num_rows, num_series),
+        initial_capital,
+    ).metrics
@@ -0,0 +1,227 @@
+"""
+A portfolio backtesting engine that runs a strategy on many tickers at once
+and combines them into one weighted portfolio.
+"""
+
+import polars as pl
+
+from quant_trading_strategy_backtester.backtester import (
+    PERFORMANCE_METRICS,
+    performance_metric_expressions,
+)
+from quant_trading_strategy_backtester.strategies.base import BaseStrategy
+
+
+class PortfolioBacktester:
+    """
+    Backtests a single-asset strategy on every ticker of a long-format frame.
+
+    The signals of each ticker are generated with window expressions
+    partitioned by ticker, and the weighted portfolio returns are aggregated
+    by date in the same lazy query, so no Python code runs per ticker.
+
+    Each ticker's strategy returns are calculated as ``Backtester.run`` would
+    for that ticker alone. The portfolio return of a date is the weighted sum
+    of the strategy returns of the tickers priced on that date.
+
+    Attributes:
+        data: Long-format price data with 'Date', 'Ticker' and 'Close'
+              columns, plus 'High' and 'Low' for strategies that need them.
+        strategy: The trading strategy to run on every ticker.
+        weights: The portfolio weight of each ticker. Defaults to equal weights
+                 summing to one. Tickers without a weight are left out.
+        initial_capital: The initial capital of the portfolio.
+        results: The portfolio results (initialised after running).
+        ticker_results: The per-ticker results (initialised after running).
+    """
+
+    def __init__(
+        self,
+        data: pl.DataFrame,
+        strategy: BaseStrategy,
+        weights: dict[str, float] | None = None,
+        initial_capital: float = 100000.0,
+    ) -> None:
+        if "Ticker" not in data.columns:
+            raise ValueError("Data must contain a 'Ticker' column")
+        self.data = data
+        self.strategy = strategy
+        if weights is None:
+            tickers = data["Ticker"].unique(maintain_order=True).to_list()
+            weights = {ticker: 1 / len(tickers) for ticker in tickers}
+        self.weights = weights
+        self.initial_capital = initial_capital
+        self.results: pl.DataFrame | None = None
+        self.ticker_results: pl.DataFrame | None = None
+        self._metrics: dict[str, float] = {}
+
+    def build_ticker_plan(self) -> pl.LazyFrame:
+        """
+        Builds the per-ticker part of the backtest as a lazy query plan.
+
+        Returns:
+            A plan producing the strategy's signals for every weighted ticker,
+            sorted by ticker and date, with the 'Ticker', 'weight',
+            'asset_returns' and 'strategy_returns' columns.
+        """
+        weights = self._weights_frame()
+        data = (
+            self.data.lazy()
+            .join(weights.lazy(), on="Ticker", how="semi")
+            .sort("Ticker", "Date")
+        )
+        close = pl.col("Close")
+        previous_close = close.shift(1).over("Ticker")
+        asset_returns = data.select(
+            ((close - previous_close) / previous_close).alias("asset_returns")
+        )
+        strategy_returns = pl.col("strategy_returns")
+        return (
+            pl.concat(
+                [
+                    self.strategy.generate_signals_lazy(data, partition_by="Ticker"),
+                    asset_returns,
+                ],
+                how="horizontal",
+            )
+            # Map the weights rather than joining them, as a join does not
+            # keep the ticker and date order the shift below relies on.
+            .with_columns(
+                pl.col("Ticker")
+                .replace_strict(self.weights, return_dtype=pl.Float64)
+                .alias("weight")
+            )
+            .with_columns(
+                (
+                    pl.col("positions").shift(1).over("Ticker")
+                    * pl.col("asset_returns")
+                ).alias("strategy_returns")
+            )
+            .with_columns(
+                # Missing and infinite returns count as flat, as in Backtester.
+                strategy_returns.replace(
+                    {float("inf"): None, float("-inf"): None}
+                ).fill_null(0)
+            )
+        )
+
+    def build_plans(self) -> tuple[pl.LazyFrame, pl.LazyFrame]:
+        """
+        Builds the portfolio backtest as lazy query plans.
+
+        Returns:
+            A tuple containing:
+                - The per-ticker plan from ``build_ticker_plan``.
+                - A plan for the portfolio results, with one row per date and
+                  the 'Date', 'positions', 'strategy_returns',
+                  'cumulative_returns' and 'equity_curve' columns. Here
+                  'positions' is the weighted gross position of the portfolio.
+        """
+        ticker_plan = self.build_ticker_plan()
+        strategy_returns = pl.col("strategy_returns")
+        portfolio_plan = (
+            ticker_plan.group_by("Date")
+            .agg(
+                (pl.col("weight") * pl.col("positions").abs()).sum().alias("positions"),
+                (pl.col("weight") * strategy_returns).sum().alias("strategy_returns"),
+            )
+            .sort("Date")
+            .with_columns(
+                (1 + strategy_returns).cum_prod().alias("cumulative_returns"),
+                (self.initial_capital * (1 + strategy_returns).cum_prod()).alias(
+                    "equity_curve"
+                ),
+            )
+        )
+        return ticker_plan, portfolio_plan
+
+    def score_tickers(self, rank_by: str = "Sharpe Ratio") -> pl.DataFrame:
+        """
+        Ranks the tickers by the metrics of backtesting each one alone.
+
+        Every ticker's equity curve and metrics are calculated in the same
+        query, with a single group-by over the tickers, rather than running
+        one backtest per ticker. The metrics match a ``Backtester`` run on
+        each ticker's data, up to rounding in the grouped mean and standard
+        deviation of the returns.
+
+        Args:
+            rank_by: The metric to rank by, from ``PERFORMANCE_METRICS``.
+                     Higher values rank first.
+
+        Returns:
+            A DataFrame with a 'Ticker' column and one column per metric,
+            with one row per ticker from best to worst. Tickers with a NaN
+            score come last, and ties keep the order of the tickers in the
+            data.
+        """
+        if rank_by not in PERFORMANCE_METRICS:
+            raise ValueError(f"Unknown metric: {rank_by}")
+        strategy_returns = pl.col("strategy_returns")
+        ticker_order = (
+            self._weights_frame().select("Ticker").with_row_index("ticker_order")
+        )
+        return (
+            self.build_ticker_plan()
+            .with_columns(
+                (1 + strategy_returns)
+                .cum_prod()
+                .over("Ticker", order_by="Date")
+                .alias("cumulative_returns"),
+                (self.initial_capital * (1 + strategy_returns).cum_prod())
+                .over("Ticker", order_by="Date")
+                .alias("equity_curve"),
+            )
+            .group_by("Ticker")
+            .agg(performance_metric_expressions())
+            .join(ticker_order.lazy(), on="Ticker")
+            .sort(
+                pl.col(rank_by).fill_nan(None),
+                "ticker_order",
+                descending=[True, False],
+                nulls_last=True,
+            )
+            .drop("ticker_order")
+            .collect()
+        )
+
+    def run(self) -> pl.DataFrame:
+        """
+        Runs the portfolio backtest.
+
+        The per-ticker results, portfolio results and metrics are collected
+        together, so Polars shares the work between them.
+
+        Returns:
+            The portfolio results, as described in ``build_plans``.
+        """
+        ticker_plan, portfolio_plan = self.build_plans()
+        self.ticker_results, self.results, metrics = pl.collect_all(
+            [
+                ticker_plan,
+                portfolio_plan,
+                portfolio_plan.select(performance_metric_expressions()),
+            ]
+        )
+        self._metrics = metrics.row(0, named=True)
+        return self.results
+
+    def get_performance_metrics(self) -> dict[str, float] | None:
+        """
+        Gets the performance metrics of the portfolio.
+
+        Returns:
+            A dictionary with the same metrics as
+            ``Backtester.get_performance_metrics``, or None if the backtest
+            hasn't been run yet.
+        """
+        if self.results is None:
+            return None
+        return dict(self._metrics)
+
+    def _weights_frame(self) -> pl.DataFrame:
+        """Gets the weights as a DataFrame, in the order of the tickers."""
+        return pl.DataFrame(
+            {"Ticker": list(self.weights), "weight": list(self.weights.values())},
+            schema={"Ticker": self.data.schema["Ticker"], "weight": pl.Float64},
+        )
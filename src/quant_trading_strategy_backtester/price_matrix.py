@@ -0,0 +1,143 @@
+"""
+Contains helpers to hold the closing prices of many tickers in one aligned
+matrix, and to share that matrix between processes without copying it.
+"""
+
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import polars as pl
+
+
+def build_price_matrix(
+    ticker_data: dict[str, pl.DataFrame],
+) -> tuple[pl.Series, np.ndarray]:
+    """
+    Aligns the closing prices of several tickers on their dates.
+
+    Args:
+        ticker_data: Historical price data for each ticker, with 'Date' and
+                     'Close' columns.
+
+    Returns:
+        A tuple containing:
+            - The sorted union of the dates of every ticker.
+            - A float64 matrix of closing prices with one row per date and
+              one column per ticker, in the order of ``ticker_data``. Prices
+              missing for a ticker on a date are NaN.
+    """
+    if not ticker_data:
+        return pl.Series("Date", []), np.empty((0, 0))
+
+    aligned = pl.concat(
+        [
+            data.select(
+                pl.col("Date"),
+                pl.col("Close").cast(pl.Float64).alias(ticker),
+            )
+            for ticker, data in ticker_data.items()
+        ],
+        how="align",
+    ).sort("Date")
+    prices = aligned.select(pl.exclude("Date")).fill_null(float("nan"))
+    return aligned["Date"], np.ascontiguousarray(prices.to_numpy(), dtype=np.float64)
+
+
+def get_pair_data(
+    dates: pl.Series, prices: np.ndarray, column1: int, column2: int
+) -> pl.DataFrame:
+    """
+    Builds the pairs trading data for two columns of a price matrix.
+
+    Args:
+        dates: The dates of the rows of ``prices``.
+        prices: A matrix of closing prices with one column per ticker.
+        column1: The column of the first ticker.
+        column2: The column of the second ticker.
+
+    Returns:
+        A DataFrame with 'Date', 'Close_1' and 'Close_2' columns, containing
+        only the dates on which both tickers have a price.
+    """
+    close_1 = prices[:, column1]
+    close_2 = prices[:, column2]
+    both_priced = np.isfinite(close_1) & np.isfinite(close_2)
+    return pl.DataFrame(
+        {
+            "Date": dates.filter(pl.Series(both_priced)),
+            "Close_1": close_1[both_priced],
+            "Close_2": close_2[both_priced],
+        }
+    )
+
+
+class SharedPriceMatrix:
+    """
+    A float64 price matrix stored in shared memory.
+
+    The process that creates the matrix owns the memory block and must call
+    ``unlink`` once every process is done with it. Worker processes attach to
+    the block by name and read the prices without copying them.
+
+    Attributes:
+        name: The name of the shared memory block.
+        shape: The shape of the matrix.
+        array: A NumPy view of the matrix.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: tuple[int, int]):
+        self._shm = shm
+        self.name = shm.name
+        self.shape = shape
+        self.array: np.ndarray = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, prices: np.ndarray) -> "SharedPriceMatrix":
+        """
+        Copies a price matrix into a new shared memory block.
+
+        Args:
+            prices: The price matrix to share.
+
+        Returns:
+            The shared matrix.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim != 2:
+            raise ValueError("Price matrix must be two-dimensional")
+        num_rows, num_columns = prices.shape
+        shm = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+        matrix = cls(shm, (num_rows, num_columns))
+        matrix.array[...] = prices
+        return matrix
+
+    @classmethod
+    def attach(cls, name: str, shape: tuple[int, int]) -> "SharedPriceMatrix":
+        """
+        Attaches to a shared price matrix created by another process.
+
+        Args:
+            name: The name of the shared memory block.
+            shape: The shape of the matrix.
+
+        Returns:
+            The shared matrix.
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # Only the creating process may unlink the block, so stop the
+            # resource tracker from doing so when this process exits.
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return cls(shm, shape)
+
+    def close(self) -> None:
+        """Releases this process's view of the shared matrix."""
+        self.array = np.empty((0, 0))
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Frees the shared memory block. Only the creating process calls this."""
+        self._shm.unlink()
@@ -0,0 +1,209 @@
+"""
+Contains an on-disk store of historical prices per ticker, so that repeated
+runs read prices locally instead of downloading them again.
+"""
+
+import datetime
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable
+
+import polars as pl
+
+# Downloads the prices of a ticker from a start date to an end date, both
+# inclusive, as a DataFrame with a 'Date' column.
+PriceFetcher = Callable[[str, datetime.date, datetime.date], pl.DataFrame]
+
+ONE_DAY = datetime.timedelta(days=1)
+
+
+class PriceStore:
+    """
+    Stores the price history of each ticker as an Arrow IPC file.
+
+    Each ticker also has a small JSON file recording the date range that has
+    been requested from the provider, which can be wider than the dates with
+    prices because of weekends and holidays. Requests within that range are
+    served from the memory-mapped file. Otherwise only the missing dates
+    before or after it are fetched and merged into the file.
+
+    Attributes:
+        directory: The directory holding the price files.
+    """
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        self.directory = Path(directory)
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def load(
+        self,
+        ticker: str,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        fetch: PriceFetcher,
+    ) -> pl.DataFrame:
+        """
+        Loads the prices of a ticker, fetching any dates not yet stored.
+
+        Args:
+            ticker: The stock ticker symbol.
+            start_date: The first date to load.
+            end_date: The last date to load.
+            fetch: The function used to download missing prices.
+
+        Returns:
+            The stored prices from ``start_date`` to ``end_date`` inclusive.
+        """
+        with self._lock(ticker):
+            coverage = self._read_coverage(ticker)
+            missing = self._missing_ranges(coverage, start_date, end_date)
+            # Prices for today may still change, so never mark today covered.
+            last_final_date = min(end_date, datetime.date.today() - ONE_DAY)
+
+            if coverage is None:
+                fetched = fetch(ticker, start_date, end_date)
+                if fetched.is_empty():
+                    # Nothing is stored, as the provider may have failed.
+                    return fetched
+                self._write(ticker, fetched, (start_date, last_final_date))
+            elif missing:
+                covered_start, covered_end = coverage
+                fetched_ranges = [
+                    (start, fetch(ticker, start, end)) for start, end in missing
+                ]
+                # Only extend the coverage over ranges that returned prices,
+                # so that ranges the provider failed on are fetched again.
+                for start, fetched in fetched_ranges:
+                    if fetched.is_empty():
+                        continue
+                    if start < covered_start:
+                        covered_start = start
+                    else:
+                        covered_end = max(last_final_date, covered_end)
+                frames = [fetched for _, fetched in fetched_ranges]
+                if any(not fetched.is_empty() for fetched in frames):
+                    self._write(
+                        ticker,
+                        _merge([self._read(ticker), *frames]),
+                        (covered_start, covered_end),
+                    )
+
+            return self._read(ticker).filter(
+                pl.col("Date").cast(pl.Date).is_between(start_date, end_date)
+            )
+
+    def missing_ranges(
+        self, ticker: str, start_date: datetime.date, end_date: datetime.date
+    ) -> list[tuple[datetime.date, datetime.date]]:
+        """
+        Gets the date ranges that loading a ticker would need to fetch.
+
+        Args:
+            ticker: The stock ticker symbol.
+            start_date: The first date to load.
+            end_date: The last date to load.
+
+        Returns:
+            The inclusive (start, end) date ranges not yet stored, which is
+            empty if the whole range can be served locally.
+        """
+        with self._lock(ticker):
+            return self._missing_ranges(
+                self._read_coverage(ticker), start_date, end_date
+            )
+
+    @staticmethod
+    def _missing_ranges(
+        coverage: tuple[datetime.date, datetime.date] | None,
+        start_date: datetime.date,
+        end_date: datetime.date,
+    ) -> list[tuple[datetime.date, datetime.date]]:
+        if coverage is None:
+            return [(start_date, end_date)]
+        covered_start, covered_end = coverage
+        missing = []
+        if start_date < covered_start:
+            missing.append((start_date, covered_start - ONE_DAY))
+        if end_date > covered_end:
+            missing.append((covered_end + ONE_DAY, end_date))
+        return missing
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        """Gets the lock serialising updates to the files of a ticker."""
+        with self._locks_lock:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _data_path(self, ticker: str) -> Path:
+        return self.directory / f"{_file_stem(ticker)}.arrow"
+
+    def _coverage_path(self, ticker: str) -> Path:
+        return self.directory / f"{_file_stem(ticker)}.json"
+
+    def _read(self, ticker: str) -> pl.DataFrame:
+        return pl.read_ipc(self._data_path(ticker), memory_map=True)
+
+    def _read_coverage(self, ticker: str) -> tuple[datetime.date, datetime.date] | None:
+        """Gets the date range already requested for a ticker, if any."""
+        path = self._coverage_path(ticker)
+        if not path.exists() or not self._data_path(ticker).exists():
+            return None
+        coverage = json.loads(path.read_text())
+        return (
+            datetime.date.fromisoformat(coverage["start_date"]),
+            datetime.date.fromisoformat(coverage["end_date"]),
+        )
+
+    def _write(
+        self,
+        ticker: str,
+        data: pl.DataFrame,
+        coverage: tuple[datetime.date, datetime.date],
+    ) -> None:
+        """
+        Replaces the stored prices and coverage of a ticker.
+
+        Both files are written under temporary names and then renamed, so
+        readers in other processes never see a partly written file.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data_path = self._data_path(ticker)
+        coverage_path = self._coverage_path(ticker)
+        temporary_data_path = data_path.with_suffix(".arrow.tmp")
+        temporary_coverage_path = coverage_path.with_suffix(".json.tmp")
+
+        # Uncompressed files can be memory-mapped when read.
+        data.write_ipc(temporary_data_path, compression="uncompressed")
+        temporary_coverage_path.write_text(
+            json.dumps(
+                {
+                    "start_date": coverage[0].isoformat(),
+                    "end_date": coverage[1].isoformat(),
+                }
+            )
+        )
+        os.replace(temporary_data_path, data_path)
+        os.replace(temporary_coverage_path, coverage_path)
+
+
+def _merge(frames: list[pl.DataFrame]) -> pl.DataFrame:
+    """
+    Combines stored and newly fetched prices, preferring the fetched prices
+    for any date present in both.
+    """
+    non_empty = [frame for frame in frames if not frame.is_empty()]
+    return (
+        pl.concat(non_empty, how="diagonal_relaxed")
+        .unique(subset="Date", keep="last", maintain_order=True)
+        .sort("Date")
+    )
+
+
+def _file_stem(ticker: str) -> str:
+    """Gets a file name for a ticker that is safe on every platform."""
+    return "".join(
+        character if character.isalnum() or character in "-._" else "_"
+        for character in ticker.upper()
+    )
@@ -0,0 +1,60 @@
+"""
+Contains the progress reporting used by the optimisers, which is independent
+of any user interface so that they can run headless.
+"""
+
+import time
+from typing import Callable
+
+# Receives the completed fraction of a task, from 0 to 1, and a status message.
+ProgressCallback = Callable[[float, str], None]
+
+
+def no_progress(fraction: float, message: str) -> None:
+    """Ignores a progress report. The default callback of the optimisers."""
+
+
+class ThrottledProgress:
+    """
+    Forwards progress reports to a callback at a limited rate.
+
+    A report is forwarded if ``min_interval`` seconds have passed since the
+    last forwarded report, or if ``every`` reports have arrived since then.
+    The first report and the report completing the task are always
+    forwarded, so the callback starts and finishes in the right state.
+
+    Attributes:
+        callback: The callback receiving the forwarded reports.
+        min_interval: The shortest time between forwarded reports, in seconds.
+        every: Forward every this many reports regardless of time, or None to
+               throttle by time alone.
+    """
+
+    def __init__(
+        self,
+        callback: ProgressCallback,
+        min_interval: float = 0.1,
+        every: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if every is not None and every <= 0:
+            raise ValueError("every must be positive")
+        self.callback = callback
+        self.min_interval = min_interval
+        self.every = every
+        self._clock = clock
+        self._last_time: float | None = None
+        self._pending = 0
+
+    def __call__(self, fraction: float, message: str) -> None:
+        now = self._clock()
+        self._pending += 1
+        if (
+            self._last_time is None
+            or fraction >= 1
+            or now - self._last_time >= self.min_interval
+            or (self.every is not None and self._pending >= self.every)
+        ):
+            self._last_time = now
+            self._pending = 0
+            self.callback(fraction, message)
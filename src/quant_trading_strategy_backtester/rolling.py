@@ -0,0 +1,104 @@
+"""
+Implements rolling window statistics based on prefix sums, so that the mean
+and standard deviation for any window length can be read off a single
+precomputation in O(n).
+"""
+
+import numpy as np
+
+
+class RollingStatistics:
+    """
+    Rolling mean and standard deviation over the first axis of an array.
+
+    Cumulative sums and sums of squares are computed once. The statistics for
+    a window then come from differences of these prefix sums, so sweeping many
+    window lengths over the same series costs O(n) per window rather than
+    repeating a full rolling calculation for every parameter combination.
+
+    Values are centred on the first row before summing, which keeps the sums
+    of squares small and limits cancellation error for price-like series.
+    Windows containing a missing (NaN) value produce NaN, like the Polars
+    rolling functions with ``min_periods`` equal to the window size.
+
+    Attributes:
+        values: The input values, with time along the first axis.
+    """
+
+    def __init__(self, values: np.ndarray) -> None:
+        self.values = np.asarray(values, dtype=np.float64)
+        missing = np.isnan(self.values)
+        self._centre = self._reference()
+        centred = np.where(missing, 0.0, self.values - self._centre)
+
+        zeros = np.zeros((1,) + self.values.shape[1:])
+        self._sums = np.concatenate([zeros, np.cumsum(centred, axis=0)])
+        self._squares = np.concatenate([zeros, np.cumsum(centred**2, axis=0)])
+        self._missing = np.concatenate([zeros, np.cumsum(missing, axis=0)])
+
+    def _reference(self) -> np.ndarray | float:
+        """
+        Gets the value each series is centred on, namely its first non-missing
+        value.
+        """
+        if len(self.values) == 0:
+            return 0.0
+        first_valid = np.argmax(~np.isnan(self.values), axis=0)
+        reference = np.take_along_axis(
+            self.values, np.expand_dims(np.asarray(first_valid), 0), axis=0
+        )[0]
+        return np.where(np.isnan(reference), 0.0, reference)
+
+    def _window_sums(self, window: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gets the centred sums, sums of squares, and a mask of complete windows
+        ending at each row.
+        """
+        if window <= 0:
+            raise ValueError("window must be positive")
+
+        sums = np.full_like(self.values, np.nan)
+        squares = np.full_like(self.values, np.nan)
+        complete = np.zeros(self.values.shape, dtype=bool)
+        if window <= len(self.values):
+            sums[window - 1 :] = self._sums[window:] - self._sums[:-window]
+            squares[window - 1 :] = self._squares[window:] - self._squares[:-window]
+            complete[window - 1 :] = (
+                self._missing[window:] - self._missing[:-window]
+            ) == 0
+        return sums, squares, complete
+
+    def mean(self, window: int) -> np.ndarray:
+        """
+        Calculates the rolling mean.
+
+        Args:
+            window: The number of rows in each window.
+
+        Returns:
+            The mean of the window ending at each row, or NaN where the window
+            is incomplete or contains missing values.
+        """
+        sums, _, complete = self._window_sums(window)
+        return np.where(complete, sums / window + self._centre, np.nan)
+
+    def std(self, window: int, ddof: int = 1) -> np.ndarray:
+        """
+        Calculates the rolling standard deviation.
+
+        Args:
+            window: The number of rows in each window.
+            ddof: The delta degrees of freedom. Defaults to the sample
+                  standard deviation, matching Polars.
+
+        Returns:
+            The standard deviation of the window ending at each row, or NaN
+            where the window is incomplete or contains missing values.
+        """
+        sums, squares, complete = self._window_sums(window)
+        if window - ddof <= 0:
+            return np.full_like(self.values, np.nan)
+        variance = (squares - sums**2 / window) / (window - ddof)
+        # Rounding can leave tiny negative variances for constant windows.
+        variance = np.maximum(variance, 0.0)
+        return np.where(complete, np.sqrt(variance), np.nan)
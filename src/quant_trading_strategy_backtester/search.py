@@ -0,0 +1,558 @@
+"""
+Contains parameter search strategies that evaluate only part of a parameter
+grid, for grids too large to backtest exhaustively.
+
+Every search takes the same arguments as ``optimise_strategy_params`` plus an
+evaluation budget, and reports how many backtests it ran.
+"""
+
+import itertools
+import math
+import random
+from typing import Any, Callable, List, NamedTuple, Union
+
+import polars as pl
+
+from quant_trading_strategy_backtester.backtest_runner import run_backtest
+from quant_trading_strategy_backtester.cache import dataset_fingerprint
+from quant_trading_strategy_backtester.metrics_cache import MetricsCache
+from quant_trading_strategy_backtester.optimiser_core import (
+    evaluate_param_combinations_in_chunks,
+    optimise_strategy_params,
+    save_top_combinations,
+    select_best_index,
+)
+from quant_trading_strategy_backtester.progress import ProgressCallback, no_progress
+
+# The number of backtests a search runs by default.
+DEFAULT_SEARCH_BUDGET = 200
+
+# The number of combinations a serial search evaluates together in one batch
+# by default, which bounds its peak memory.
+SEARCH_CHUNK_SIZE = 500
+
+# The fewest rows successive halving scores candidates on, so that early
+# rounds still have enough data for long rolling windows.
+MIN_HALVING_ROWS = 126
+
+ParameterRanges = dict[str, Union[range, list[int | float]]]
+
+# The name and values of each parameter.
+_Axes = list[tuple[str, list[Any]]]
+
+
+class SearchResult(NamedTuple):
+    """
+    The result of a parameter search.
+
+    Attributes:
+        params: The best parameters found.
+        metrics: The metrics of the best parameters on the full data, as
+                 from ``run_backtest``.
+        num_backtests: The number of backtests the search ran, counting each
+                       combination once per data slice it was scored on, and
+                       including the final run of the best parameters.
+                       Metrics read from a cache are not counted.
+    """
+
+    params: dict[str, int | float]
+    metrics: dict[str, float]
+    num_backtests: int
+
+
+def grid_search(
+    data: pl.DataFrame,
+    strategy_type: str,
+    parameter_ranges: ParameterRanges,
+    tickers: Union[str, List[str]],
+    budget: int | None = None,
+    seed: int | None = None,
+    cache: MetricsCache | None = None,
+    save_top_k: int = 0,
+    n_jobs: int = 1,
+    chunk_size: int | None = None,
+    lazy: bool = False,
+    progress: ProgressCallback = no_progress,
+) -> SearchResult:
+    """
+    Backtests every parameter combination with ``optimise_strategy_params``,
+    whose default chunk size is used when ``chunk_size`` is None.
+
+    Args:
+        data: Historical price data.
+        strategy_type: The type of strategy being optimised.
+        parameter_ranges: The values to search for each parameter.
+        tickers: The ticker or tickers used in the backtest.
+        budget: Unused, as the whole grid is always evaluated.
+        seed: Unused, as the search is deterministic.
+        cache: The metrics cache to consult and update, if any.
+        save_top_k: The number of best combinations to save.
+        n_jobs: The number of worker processes. Values below 1 use every CPU.
+        chunk_size: The number of combinations per batch. Defaults to
+                    ``SEARCH_CHUNK_SIZE`` when serial, or about four batches
+                    per worker.
+        lazy: Whether to evaluate each batch as lazy backtest plans.
+        progress: The callback receiving the progress after each batch.
+
+    Returns:
+        The best parameters, their metrics and the number of backtests run.
+    """
+    num_backtests = _grid_size(parameter_ranges)
+    if cache is not None:
+        axes = _axes(parameter_ranges)
+        cached = cache.get_many(
+            dataset_fingerprint(data),
+            strategy_type,
+            [_combination(axes, i) for i in range(num_backtests)],
+        )
+        num_backtests -= sum(metrics is not None for metrics in cached)
+    best_params, best_metrics = optimise_strategy_params(
+        data,
+        strategy_type,
+        parameter_ranges,
+        tickers,
+        save_top_k=save_top_k,
+        n_jobs=n_jobs,
+        chunk_size=chunk_size,
+        lazy=lazy,
+        cache=cache,
+        progress=progress,
+    )
+    return SearchResult(best_params, best_metrics, num_backtests + 1)
+
+
+def random_search(
+    data: pl.DataFrame,
+    strategy_type: str,
+    parameter_ranges: ParameterRanges,
+    tickers: Union[str, List[str]],
+    budget: int | None = DEFAULT_SEARCH_BUDGET,
+    seed: int | None = None,
+    cache: MetricsCache | None = None,
+    save_top_k: int = 0,
+    n_jobs: int = 1,
+    chunk_size: int | None = None,
+    lazy: bool = False,
+    progress: ProgressCallback = no_progress,
+) -> SearchResult:
+    """
+    Backtests a random sample of the parameter grid.
+
+    The combinations are sampled without replacement by their position in
+    the grid, so the grid is never built in full. Ties go to the combination
+    that comes first in the grid, as in ``optimise_strategy_params``.
+
+    Args:
+        data: Historical price data.
+        strategy_type: The type of strategy being optimised.
+        parameter_ranges: The values to search for each parameter.
+        tickers: The ticker or tickers used in the backtest.
+        budget: The largest number of backtests to run. Defaults to
+                ``DEFAULT_SEARCH_BUDGET``.
+        seed: The seed of the random sample.
+        cache: The metrics cache to consult and update, if any.
+        save_top_k: The number of best combinations to save.
+        n_jobs: The number of worker processes. Values below 1 use every CPU.
+        chunk_size: The number of combinations per batch. Defaults to
+                    ``SEARCH_CHUNK_SIZE`` when serial, or about four batches
+                    per worker.
+        lazy: Whether to evaluate each batch as lazy backtest plans.
+        progress: The callback receiving the progress after each batch.
+
+    Returns:
+        The best parameters, their metrics and the number of backtests run.
+    """
+    budget = _check_budget(budget)
+    axes = _axes(parameter_ranges)
+    num_candidates = min(_grid_size(parameter_ranges), budget - 1)
+    indices = sorted(
+        random.Random(seed).sample(range(_grid_size(parameter_ranges)), num_candidates)
+    )
+    candidates = [_combination(axes, index) for index in indices]
+    metrics, num_backtests = evaluate_param_combinations_in_chunks(
+        data,
+        strategy_type,
+        candidates,
+        tickers,
+        n_jobs=n_jobs,
+        chunk_size=_chunk_size(chunk_size, n_jobs),
+        lazy=lazy,
+        cache=cache,
+        progress=progress,
+    )
+    return _finish(
+        data, strategy_type, candidates, metrics, tickers, num_backtests, save_top_k
+    )
+
+
+def successive_halving(
+    data: pl.DataFrame,
+    strategy_type: str,
+    parameter_ranges: ParameterRanges,
+    tickers: Union[str, List[str]],
+    budget: int | None = DEFAULT_SEARCH_BUDGET,
+    seed: int | None = None,
+    cache: MetricsCache | None = None,
+    save_top_k: int = 0,
+    n_jobs: int = 1,
+    chunk_size: int | None = None,
+    lazy: bool = False,
+    progress: ProgressCallback = no_progress,
+    eta: int = 3,
+    min_rows: int = MIN_HALVING_ROWS,
+) -> SearchResult:
+    """
+    Narrows down random candidates by scoring them on growing slices of the
+    data.
+
+    Every round scores the remaining candidates on the first rows of the
+    data and keeps the best ``1 / eta`` of them by Sharpe ratio for the next
+    round. Each round uses ``eta`` times as many rows as the one before, and
+    the last round picks the best of the final ``eta`` or fewer candidates
+    on the full data, so most backtests are run on short slices. The number
+    of candidates is the largest for which the whole schedule fits in the
+    budget. Only the candidates of the last round are scored on the full
+    data, so the ``save_top_k`` best are chosen from them.
+
+    Args:
+        data: Historical price data.
+        strategy_type: The type of strategy being optimised.
+        parameter_ranges: The values to search for each parameter.
+        tickers: The ticker or tickers used in the backtest.
+        budget: The largest number of backtests to run. Defaults to
+                ``DEFAULT_SEARCH_BUDGET``.
+        seed: The seed of the random sample of candidates.
+        eta: The factor by which each round cuts the candidates and grows
+             the data.
+        min_rows: The fewest rows a round scores candidates on.
+        cache: The metrics cache to consult and update, if any.
+        save_top_k: The number of best combinations to save.
+        n_jobs: The number of worker processes. Values below 1 use every CPU.
+        chunk_size: The number of combinations per batch. Defaults to
+                    ``SEARCH_CHUNK_SIZE`` when serial, or about four batches
+                    per worker.
+        lazy: Whether to evaluate each batch as lazy backtest plans.
+        progress: The callback receiving the progress after each batch.
+
+    Returns:
+        The best parameters, their metrics and the number of backtests run.
+    """
+    budget = _check_budget(budget)
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    grid_size = _grid_size(parameter_ranges)
+    num_candidates = min(grid_size, budget - 1)
+    while num_candidates > 1 and sum(_halving_schedule(num_candidates, eta)) >= budget:
+        num_candidates -= 1
+    schedule = _halving_schedule(num_candidates, eta)
+
+    axes = _axes(parameter_ranges)
+    indices = sorted(random.Random(seed).sample(range(grid_size), num_candidates))
+    candidates = [_combination(axes, index) for index in indices]
+    num_backtests = 0
+    metrics: list[dict[str, float]] = []
+    for round_index, num_kept in enumerate(schedule):
+        if round_index > 0:
+            # Keep the best candidates, in grid order so that ties still go
+            # to the combination that comes first.
+            kept = sorted(
+                sorted(
+                    range(len(candidates)),
+                    key=lambda i: _sort_key(metrics[i]["Sharpe Ratio"]),
+                )[:num_kept]
+            )
+            candidates = [candidates[i] for i in kept]
+        num_rows = math.ceil(len(data) / eta ** (len(schedule) - 1 - round_index))
+        num_rows = max(num_rows, min(min_rows, len(data)))
+        metrics, num_computed = evaluate_param_combinations_in_chunks(
+            data.head(num_rows),
+            strategy_type,
+            candidates,
+            tickers,
+            n_jobs=n_jobs,
+            chunk_size=_chunk_size(chunk_size, n_jobs),
+            lazy=lazy,
+            cache=cache,
+            progress=progress,
+        )
+        num_backtests += num_computed
+    return _finish(
+        data, strategy_type, candidates, metrics, tickers, num_backtests, save_top_k
+    )
+
+
+def coarse_to_fine_search(
+    data: pl.DataFrame,
+    strategy_type: str,
+    parameter_ranges: ParameterRanges,
+    tickers: Union[str, List[str]],
+    budget: int | None = DEFAULT_SEARCH_BUDGET,
+    seed: int | None = None,
+    cache: MetricsCache | None = None,
+    save_top_k: int = 0,
+    n_jobs: int = 1,
+    chunk_size: int | None = None,
+    lazy: bool = False,
+    progress: ProgressCallback = no_progress,
+    points_per_axis: int = 5,
+) -> SearchResult:
+    """
+    Refines a coarse grid around the best combination found so far.
+
+    The first level backtests about ``points_per_axis`` evenly spaced values
+    of each parameter. Each later level narrows every parameter to the values
+    between the neighbours of the best value in the level before, and
+    backtests evenly spaced values of that narrower range, until the ranges
+    are fully covered, can't be narrowed further or the budget runs out.
+    Combinations are never backtested twice. Parameter values are assumed to
+    be in order.
+
+    Args:
+        data: Historical price data.
+        strategy_type: The type of strategy being optimised.
+        parameter_ranges: The values to search for each parameter.
+        tickers: The ticker or tickers used in the backtest.
+        budget: The largest number of backtests to run. Defaults to
+                ``DEFAULT_SEARCH_BUDGET``.
+        seed: Unused, as the search is deterministic.
+        points_per_axis: The number of values of each parameter per level.
+        cache: The metrics cache to consult and update, if any.
+        save_top_k: The number of best combinations to save.
+        n_jobs: The number of worker processes. Values below 1 use every CPU.
+        chunk_size: The number of combinations per batch. Defaults to
+                    ``SEARCH_CHUNK_SIZE`` when serial, or about four batches
+                    per worker.
+        lazy: Whether to evaluate each batch as lazy backtest plans.
+        progress: The callback receiving the progress after each batch.
+
+    Returns:
+        The best parameters, their metrics and the number of backtests run.
+    """
+    budget = _check_budget(budget)
+    if points_per_axis < 2:
+        raise ValueError("points_per_axis must be at least 2")
+    axes = _axes(parameter_ranges)
+    bounds = [(0, len(values) - 1) for _, values in axes]
+    evaluated: dict[tuple[int, ...], dict[str, float]] = {}
+    num_backtests = 0
+    while True:
+        points = [_spread(low, high, points_per_axis) for low, high in bounds]
+        new = [
+            position
+            for position in itertools.product(*points)
+            if position not in evaluated
+        ][: budget - 1 - len(evaluated)]
+        metrics, num_computed = evaluate_param_combinations_in_chunks(
+            data,
+            strategy_type,
+            [_at(axes, position) for position in new],
+            tickers,
+            n_jobs=n_jobs,
+            chunk_size=_chunk_size(chunk_size, n_jobs),
+            lazy=lazy,
+            cache=cache,
+            progress=progress,
+        )
+        num_backtests += num_computed
+        evaluated.update(zip(new, metrics))
+
+        positions = sorted(evaluated)
+        best_index = select_best_index([evaluated[p] for p in positions])
+        fully_covered = all(
+            len(axis_points) == high - low + 1
+            for axis_points, (low, high) in zip(points, bounds)
+        )
+        if best_index is None or fully_covered or len(evaluated) >= budget - 1:
+            break
+        best = positions[best_index]
+        narrowed = [
+            (
+                max((p for p in axis_points if p < b), default=b),
+                min((p for p in axis_points if p > b), default=b),
+            )
+            for axis_points, b in zip(points, best)
+        ]
+        # Stop once a level adds nothing or the ranges can't be narrowed, as
+        # with two points per axis or a best value between the end points.
+        if not new or narrowed == bounds:
+            break
+        bounds = narrowed
+
+    positions = sorted(evaluated)
+    return _finish(
+        data,
+        strategy_type,
+        [_at(axes, position) for position in positions],
+        [evaluated[position] for position in positions],
+        tickers,
+        num_backtests,
+        save_top_k,
+    )
+
+
+SEARCH_METHODS: dict[str, Callable[..., SearchResult]] = {
+    "grid": grid_search,
+    "random": random_search,
+    "successive_halving": successive_halving,
+    "coarse_to_fine": coarse_to_fine_search,
+}
+
+
+def search_strategy_params(
+    data: pl.DataFrame,
+    strategy_type: str,
+    parameter_ranges: ParameterRanges,
+    tickers: Union[str, List[str]],
+    method: str = "grid",
+    budget: int | None = None,
+    seed: int | None = None,
+    cache: MetricsCache | None = None,
+    save_top_k: int = 0,
+    n_jobs: int = 1,
+    chunk_size: int | None = None,
+    lazy: bool = False,
+    progress: ProgressCallback = no_progress,
+) -> SearchResult:
+    """
+    Searches parameter ranges with the given search method.
+
+    Args:
+        data: Historical price data.
+        strategy_type: The type of strategy being optimised.
+        parameter_ranges: The values to search for each parameter.
+        tickers: The ticker or tickers used in the backtest.
+        method: The search method, from ``SEARCH_METHODS``.
+        budget: The largest number of backtests to run. Defaults to
+                ``DEFAULT_SEARCH_BUDGET``, and is ignored by grid search.
+        seed: The seed of the random searches.
+        cache: The metrics cache to consult and update, if any.
+        save_top_k: The number of best combinations to save.
+        n_jobs: The number of worker processes. Values below 1 use every CPU.
+        chunk_size: The number of combinations per batch. Defaults to
+                    ``SEARCH_CHUNK_SIZE`` when serial, or about four batches
+                    per worker.
+        lazy: Whether to evaluate each batch as lazy backtest plans.
+        progress: The callback receiving the progress after each batch.
+
+    Returns:
+        The best parameters, their metrics and the number of backtests run.
+    """
+    if method not in SEARCH_METHODS:
+        raise ValueError(f"Unknown search method: {method}")
+    return SEARCH_METHODS[method](
+        data,
+        strategy_type,
+        parameter_ranges,
+        tickers,
+        budget=budget,
+        seed=seed,
+        cache=cache,
+        save_top_k=save_top_k,
+        n_jobs=n_jobs,
+        chunk_size=chunk_size,
+        lazy=lazy,
+        progress=progress,
+    )
+
+
+def _check_budget(budget: int | None) -> int:
+    """Return the budget, or the default one, checking that it is usable."""
+    if budget is None:
+        return DEFAULT_SEARCH_BUDGET
+    if budget < 2:
+        raise ValueError("budget must be at least 2")
+    return budget
+
+
+def _axes(parameter_ranges: ParameterRanges) -> _Axes:
+    """Return the name and values of each parameter."""
+    return [(name, list(values)) for name, values in parameter_ranges.items()]
+
+
+def _grid_size(parameter_ranges: ParameterRanges) -> int:
+    """Return the number of combinations in the parameter grid."""
+    return math.prod(len(values) for values in parameter_ranges.values())
+
+
+def _combination(axes: _Axes, index: int) -> dict[str, Any]:
+    """
+    Return the combination at an index of the grid, in the order of
+    ``itertools.product``.
+    """
+    position = []
+    for _, values in reversed(axes):
+        index, value_index = divmod(index, len(values))
+        position.append(value_index)
+    return _at(axes, tuple(reversed(position)))
+
+
+def _at(axes: _Axes, position: tuple[int, ...]) -> dict[str, Any]:
+    """Return the combination with the given value index for each parameter."""
+    return {name: values[i] for (name, values), i in zip(axes, position)}
+
+
+def _spread(low: int, high: int, num_points: int) -> list[int]:
+    """Return up to ``num_points`` evenly spaced integers from low to high."""
+    if high - low + 1 <= num_points:
+        return list(range(low, high + 1))
+    step = (high - low) / (num_points - 1)
+    return sorted({low + round(i * step) for i in range(num_points)})
+
+
+def _halving_schedule(num_candidates: int, eta: int) -> list[int]:
+    """
+    Return the number of candidates in each round of successive halving. The
+    last round has at most ``eta`` candidates, of which the best is the
+    result.
+    """
+    schedule = [num_candidates]
+    while schedule[-1] > eta:
+        schedule.append(math.ceil(schedule[-1] / eta))
+    return schedule
+
+
+def _sort_key(sharpe_ratio: float) -> float:
+    """Sort higher Sharpe ratios first and NaN last."""
+    return math.inf if math.isnan(sharpe_ratio) else -sharpe_ratio
+
+
+def _chunk_size(chunk_size: int | None, n_jobs: int) -> int | None:
+    """
+    Return the batch size of a search, which defaults to ``SEARCH_CHUNK_SIZE``
+    when serial and to the pool's default otherwise.
+    """
+    if chunk_size is None and n_jobs == 1:
+        return SEARCH_CHUNK_SIZE
+    return chunk_size
+
+
+def _finish(
+    data: pl.DataFrame,
+    strategy_type: str,
+    candidates: list[dict[str, Any]],
+    metrics: list[dict[str, float]],
+    tickers: Union[str, List[str]],
+    num_backtests: int,
+    save_top_k: int,
+) -> SearchResult:
+    """
+    Re-run the best candidate through the standard backtest, so that its
+    metrics match a regular run exactly, save the ``save_top_k`` best
+    candidates and bundle the search result.
+    """
+    best_index = select_best_index(metrics)
+    if best_index is None or not candidates[best_index]:
+        raise ValueError("Parameter optimisation failed")
+    best_params = candidates[best_index]
+    _, best_metrics = run_backtest(
+        data, strategy_type, best_params, tickers, persist=False, compact=True
+    )
+    if not best_metrics:
+        raise ValueError("Parameter optimisation failed")
+    if save_top_k > 0:
+        metrics = list(metrics)
+        metrics[best_index] = best_metrics
+        save_top_combinations(
+            data, strategy_type, candidates, metrics, tickers, save_top_k
+        )
+    return SearchResult(best_params, best_metrics, num_backtests + 1)
@@ -9,6 +9,7 @@ different quantitative trading strategies.
 from abc import ABC, abstractmethod
 from typing import Any
 
+import numpy as np
 import polars as pl
 
 TRADING_STRATEGIES = [
@@ -44,6 +45,65 @@ class BaseStrategy(ABC):
         """
         raise NotImplementedError("Method 'generate_signals' must be implemented.")
 
+    def generate_signals_lazy(
+        self, data: pl.LazyFrame, partition_by: str | None = None
+    ) -> pl.LazyFrame:
+        """
+        Generate trading signals as a lazy query plan.
+
+        Lets a backtest append its returns and metrics to the same plan and
+        collect everything at once. The default implementation collects
+        ``data`` and generates the signals eagerly. Strategies can override it
+        to build the signals as expressions instead.
+
+        Args:
+            data: Market data used to generate trading signals.
+            partition_by: A column, such as 'Ticker', splitting long-format
+                          data into independent price series. The signals of
+                          each series are generated separately and the column
+                          is kept in the output. Only strategies that build
+                          their signals as expressions support it.
+
+        Returns:
+            A LazyFrame producing the same signals as ``generate_signals``.
+        """
+        if partition_by is not None:
+            raise ValueError(
+                f"{self.__class__.__name__} does not support partitioned signals"
+            )
+        return self.generate_signals(data.collect()).lazy()
+
+    @classmethod
+    def generate_positions_grid(
+        cls, data: pl.DataFrame, param_combinations: list[dict[str, Any]]
+    ) -> np.ndarray:
+        """
+        Generate the positions for many parameter combinations at once.
+
+        The default implementation generates the signals for each combination
+        in turn. Strategies can override it to share work between
+        combinations.
+
+        Args:
+            data: Market data used to generate trading signals.
+            param_combinations: The parameter sets to generate positions for.
+
+        Returns:
+            A matrix of positions with one row per row of ``data`` and one
+            column per parameter combination, in the order given.
+        """
+        if not param_combinations:
+            return np.empty((data.height, 0))
+        return np.column_stack(
+            [
+                cls(params)  # type: ignore[call-arg]
+                .generate_signals(data)["positions"]
+                .cast(pl.Float64)
+                .to_numpy()
+                for params in param_combinations
+            ]
+        )
+
     def get_parameters(self) -> dict[str, Any]:
         """
         Get the parameters of the strategy.
@@ -52,3 +112,16 @@ class BaseStrategy(ABC):
             A dictionary containing the strategy parameters.
         """
         return self.params
+
+
+def partition_columns(partition_by: str | None) -> list[str]:
+    """Return the partition column to keep in the signals, if any."""
+    return [] if partition_by is None else [partition_by]
+
+
+def over_partition(expr: pl.Expr, partition_by: str | None) -> pl.Expr:
+    """
+    Evaluate a window expression, such as a rolling mean or a diff, within
+    each partition of the data separately, if the data is partitioned.
+    """
+    return expr if partition_by is None else expr.over(partition_by)
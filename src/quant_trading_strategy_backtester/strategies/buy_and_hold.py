@@ -8,7 +8,10 @@ from typing import Any
 
 import polars as pl
 
-from quant_trading_strategy_backtester.strategies.base import BaseStrategy
+from quant_trading_strategy_backtester.strategies.base import (
+    BaseStrategy,
+    partition_columns,
+)
 
 
 class BuyAndHoldStrategy(BaseStrategy):
@@ -42,7 +45,23 @@ class BuyAndHoldStrategy(BaseStrategy):
                 ]
             )
 
-        signals = data.select([pl.col("Date"), pl.col("Close")])
+        return self.generate_signals_lazy(data.lazy()).collect()
+
+    def generate_signals_lazy(
+        self, data: pl.LazyFrame, partition_by: str | None = None
+    ) -> pl.LazyFrame:
+        """
+        Builds the Buy and Hold signals as a lazy query plan.
+
+        Args:
+            data: Historical price data.
+            partition_by: An optional column splitting the data into separate
+                          price series, which is kept in the output.
+
+        Returns:
+            A LazyFrame producing the trading signals.
+        """
+        signals = data.select(["Date", *partition_columns(partition_by), "Close"])
         # Add the 'signal' and 'positions' columns.
         signals = signals.with_columns(
             [
@@ -5,9 +5,15 @@ that asset prices tend to revert to their mean over time.
 
 from typing import Any
 
+import numpy as np
 import polars as pl
 
-from quant_trading_strategy_backtester.strategies.base import BaseStrategy
+from quant_trading_strategy_backtester.rolling import RollingStatistics
+from quant_trading_strategy_backtester.strategies.base import (
+    BaseStrategy,
+    over_partition,
+    partition_columns,
+)
 
 
 class MeanReversionStrategy(BaseStrategy):
@@ -62,15 +68,39 @@ class MeanReversionStrategy(BaseStrategy):
                 ]
             )
 
-        signals = data.select([pl.col("Date"), pl.col("Close")])
+        return self.generate_signals_lazy(data.lazy()).collect()
+
+    def generate_signals_lazy(
+        self, data: pl.LazyFrame, partition_by: str | None = None
+    ) -> pl.LazyFrame:
+        """
+        Builds the mean reversion signals as a lazy query plan.
+
+        Args:
+            data: A LazyFrame containing the price data. Must have a 'Close'
+                  column.
+            partition_by: An optional column splitting the data into separate
+                          price series, such as 'Ticker', whose signals are
+                          generated independently.
+
+        Returns:
+            A LazyFrame producing the same columns as ``generate_signals``.
+        """
+        signals = data.select(["Date", *partition_columns(partition_by), "Close"])
         signals = signals.with_columns(
             [
-                pl.col("Close")
-                .rolling_mean(window_size=self.window, min_periods=self.window)
-                .alias("mean"),
-                pl.col("Close")
-                .rolling_std(window_size=self.window, min_periods=self.window)
-                .alias("std"),
+                over_partition(
+                    pl.col("Close").rolling_mean(
+                        window_size=self.window, min_periods=self.window
+                    ),
+                    partition_by,
+                ).alias("mean"),
+                over_partition(
+                    pl.col("Close").rolling_std(
+                        window_size=self.window, min_periods=self.window
+                    ),
+                    partition_by,
+                ).alias("std"),
             ]
         )
         # Avoid division by zero by replacing 0s with NaN.
@@ -104,7 +134,63 @@ class MeanReversionStrategy(BaseStrategy):
         )
 
         signals = signals.with_columns(
-            [pl.col("signal").diff().fill_null(0).alias("positions")]
+            [
+                over_partition(pl.col("signal").diff(), partition_by)
+                .fill_null(0)
+                .alias("positions")
+            ]
         )
 
         return signals
+
+    @classmethod
+    def generate_positions_grid(
+        cls, data: pl.DataFrame, param_combinations: list[dict[str, Any]]
+    ) -> np.ndarray:
+        """
+        Generates the positions for many parameter combinations at once.
+
+        The rolling mean and standard deviation for every window come from a
+        single prefix-sum precomputation, and all ``std_dev`` bands for a window
+        are evaluated against the same window statistics. The positions match
+        ``generate_signals`` up to floating-point differences in the band
+        values.
+
+        Args:
+            data: A DataFrame containing the price data. Must have a 'Close'
+                  column.
+            param_combinations: The parameter sets to generate positions for.
+
+        Returns:
+            A matrix of positions with one row per row of ``data`` and one
+            column per parameter combination, in the order given.
+        """
+        close = data["Close"].cast(pl.Float64).fill_null(float("nan")).to_numpy()
+        stats = RollingStatistics(close)
+        positions = np.zeros((len(close), len(param_combinations)))
+
+        columns_by_window: dict[int, list[int]] = {}
+        for i, params in enumerate(param_combinations):
+            columns_by_window.setdefault(int(params["window"]), []).append(i)
+
+        for window, columns in columns_by_window.items():
+            mean = stats.mean(window)[:, np.newaxis]
+            std = stats.std(window)[:, np.newaxis]
+            std_devs = np.array(
+                [float(param_combinations[i]["std_dev"]) for i in columns]
+            )
+            upper_band = mean + std_devs * std
+            lower_band = mean - std_devs * std
+
+            signal = np.where(
+                close[:, np.newaxis] < lower_band,
+                1.0,
+                np.where(close[:, np.newaxis] > upper_band, -1.0, 0.0),
+            )
+            # generate_signals replaces a zero standard deviation with NaN, and
+            # Polars orders NaN above every number, so those rows are buys.
+            signal[((std == 0) & ~np.isnan(mean))[:, 0]] = 1.0
+
+            positions[1:, columns] = np.diff(signal, axis=0)
+
+        return positions
@@ -4,7 +4,16 @@ from typing import Any
 
 import polars as pl
 
-from quant_trading_strategy_backtester.strategies.base import BaseStrategy
+from quant_trading_strategy_backtester.cache import LRUCache, dataset_fingerprint
+from quant_trading_strategy_backtester.strategies.base import (
+    BaseStrategy,
+    over_partition,
+    partition_columns,
+)
+
+INDICATOR_CACHE_SIZE = 32
+
+_indicator_cache = LRUCache(INDICATOR_CACHE_SIZE)
 
 
 class MovingAverageCrossoverStrategy(BaseStrategy):
@@ -24,31 +33,53 @@ class MovingAverageCrossoverStrategy(BaseStrategy):
         self.atr_period = int(params.get("atr_period", 14))
 
     def _calculate_indicators(self, df: pl.DataFrame) -> pl.DataFrame:
-        df = df.with_columns(
-            [
-                pl.col("Close").ewm_mean(span=10).alias("ema_10"),
-                pl.col("Close").ewm_mean(span=80).alias("ema_80"),
-                pl.col("Close").ewm_mean(span=20).alias("ema_20"),
-                pl.col("Close").ewm_mean(span=70).alias("ema_70"),
-            ]
+        """
+        Calculates the EMAs, ATR, ADX and CMO indicators for ``df``.
+
+        The indicators only depend on the prices and the indicator periods, not
+        on the position size, so they are cached by the content fingerprint of
+        the price columns and the periods. All indicators are built as expressions and
+        evaluated in a single pass, letting Polars share the common
+        subexpressions instead of materialising each intermediate column.
+
+        Args:
+            df: Historical price data with 'Date', 'High', 'Low' and 'Close'
+                columns.
+
+        Returns:
+            A DataFrame with the 'Date' and 'Close' columns and one column per
+            indicator.
+        """
+        prices = df.select(["Date", "High", "Low", "Close"])
+        key = (
+            dataset_fingerprint(prices),
+            self.adx_period,
+            self.cmo_period,
+            self.atr_period,
         )
+        indicators = _indicator_cache.get(key)
+        if indicators is None:
+            indicators = prices.lazy().select(self._indicator_expressions()).collect()
+            _indicator_cache.put(key, indicators)
+        return indicators
+
+    def _indicator_expressions(self) -> list[pl.Expr]:
+        """Builds the expressions for the columns of ``_calculate_indicators``."""
+        close = pl.col("Close")
+        high = pl.col("High")
+        low = pl.col("Low")
 
         true_range = pl.max_horizontal(
             [
-                pl.col("High") - pl.col("Low"),
-                (pl.col("High") - pl.col("Close").shift(1)).abs(),
-                (pl.col("Low") - pl.col("Close").shift(1)).abs(),
+                high - low,
+                (high - close.shift(1)).abs(),
+                (low - close.shift(1)).abs(),
             ]
         )
-        df = df.with_columns(true_range.alias("tr"))
-        df = df.with_columns(
-            pl.col("tr")
-            .rolling_mean(self.atr_period, min_periods=self.atr_period)
-            .alias("atr")
-        )
+        atr = true_range.rolling_mean(self.atr_period, min_periods=self.atr_period)
 
-        up_move = pl.col("High") - pl.col("High").shift(1)
-        down_move = pl.col("Low").shift(1) - pl.col("Low")
+        up_move = high - high.shift(1)
+        down_move = low.shift(1) - low
         plus_dm = (
             pl.when((up_move > down_move) & (up_move > 0)).then(up_move).otherwise(0)
         )
@@ -57,52 +88,31 @@ class MovingAverageCrossoverStrategy(BaseStrategy):
             .then(down_move)
             .otherwise(0)
         )
-        df = df.with_columns([plus_dm.alias("plus_dm"), minus_dm.alias("minus_dm")])
-        df = df.with_columns(
-            [
-                pl.col("plus_dm").rolling_sum(self.adx_period).alias("plus_dm_sum"),
-                pl.col("minus_dm").rolling_sum(self.adx_period).alias("minus_dm_sum"),
-            ]
-        )
-        df = df.with_columns(
-            [
-                (100 * pl.col("plus_dm_sum") / pl.col("atr")).alias("plus_di"),
-                (100 * pl.col("minus_dm_sum") / pl.col("atr")).alias("minus_di"),
-            ]
-        )
-        df = df.with_columns(
-            (
-                (
-                    (pl.col("plus_di") - pl.col("minus_di")).abs()
-                    / (pl.col("plus_di") + pl.col("minus_di"))
-                )
-                * 100
-            ).alias("dx")
+        plus_di = 100 * plus_dm.rolling_sum(self.adx_period) / atr
+        minus_di = 100 * minus_dm.rolling_sum(self.adx_period) / atr
+        dx = ((plus_di - minus_di).abs() / (plus_di + minus_di)) * 100
+        adx = dx.rolling_mean(self.adx_period, min_periods=self.adx_period)
+
+        delta = close - close.shift(1)
+        gain_sum = (
+            pl.when(delta > 0).then(delta).otherwise(0).rolling_sum(self.cmo_period)
         )
-        df = df.with_columns(
-            pl.col("dx")
-            .rolling_mean(self.adx_period, min_periods=self.adx_period)
-            .alias("adx")
+        loss_sum = (
+            pl.when(delta < 0).then(-delta).otherwise(0).rolling_sum(self.cmo_period)
         )
-
-        delta = pl.col("Close") - pl.col("Close").shift(1)
-        gains = pl.when(delta > 0).then(delta).otherwise(0)
-        losses = pl.when(delta < 0).then(-delta).otherwise(0)
-        df = df.with_columns([gains.alias("gain"), losses.alias("loss")])
-        df = df.with_columns(
-            [
-                pl.col("gain").rolling_sum(self.cmo_period).alias("gain_sum"),
-                pl.col("loss").rolling_sum(self.cmo_period).alias("loss_sum"),
-            ]
-        )
-        df = df.with_columns(
-            (
-                100
-                * (pl.col("gain_sum") - pl.col("loss_sum"))
-                / (pl.col("gain_sum") + pl.col("loss_sum"))
-            ).alias("cmo")
-        )
-        return df
+        cmo = 100 * (gain_sum - loss_sum) / (gain_sum + loss_sum)
+
+        return [
+            pl.col("Date"),
+            close,
+            close.ewm_mean(span=10).alias("ema_10"),
+            close.ewm_mean(span=80).alias("ema_80"),
+            close.ewm_mean(span=20).alias("ema_20"),
+            close.ewm_mean(span=70).alias("ema_70"),
+            atr.alias("atr"),
+            adx.alias("adx"),
+            cmo.alias("cmo"),
+        ]
 
     def generate_signals(self, data: pl.DataFrame) -> pl.DataFrame:
         """Generate trading signals based on TEMO crossover rules."""
@@ -116,8 +126,45 @@ class MovingAverageCrossoverStrategy(BaseStrategy):
                 ]
             )
 
-        df = self._calculate_indicators(data)
+        return self._calculate_indicators(data).with_columns(self._signal_expressions())
+
+    def generate_signals_lazy(
+        self, data: pl.LazyFrame, partition_by: str | None = None
+    ) -> pl.LazyFrame:
+        """
+        Builds the TEMO signals as a lazy query plan.
+
+        The indicators are part of the plan rather than taken from the
+        indicator cache, so the whole backtest can be optimised as one query.
+
+        Args:
+            data: Historical price data with 'Date', 'High', 'Low' and 'Close'
+                  columns.
+            partition_by: An optional column splitting the data into separate
+                          price series, such as 'Ticker', whose indicators and
+                          signals are calculated independently.
+
+        Returns:
+            A LazyFrame producing the same columns as ``generate_signals``.
+        """
+        keys = partition_columns(partition_by)
+        return (
+            data.select(["Date", *keys, "High", "Low", "Close"])
+            .select(
+                *keys,
+                *(
+                    over_partition(indicator, partition_by)
+                    for indicator in self._indicator_expressions()
+                ),
+            )
+            .with_columns(self._signal_expressions(partition_by))
+        )
 
+    def _signal_expressions(self, partition_by: str | None = None) -> list[pl.Expr]:
+        """
+        Builds the signal, position and position size expressions, taking the
+        position changes within each partition of the data, if any.
+        """
         long_cond = (
             (pl.col("ema_10") > pl.col("ema_80"))
             & (pl.col("adx") > 40)
@@ -129,30 +176,12 @@ class MovingAverageCrossoverStrategy(BaseStrategy):
             & (pl.col("cmo") < -40)
         )
 
-        df = df.with_columns(
-            pl.when(long_cond)
-            .then(1.0)
-            .when(short_cond)
-            .then(-1.0)
-            .otherwise(0.0)
-            .alias("signal")
-        )
-        df = df.with_columns(pl.col("signal").diff().fill_null(0.0).alias("positions"))
-        df = df.with_columns(pl.lit(self.position_size).alias("position_size"))
+        signal = pl.when(long_cond).then(1.0).when(short_cond).then(-1.0).otherwise(0.0)
 
-        return df.select(
-            [
-                "Date",
-                "Close",
-                "ema_10",
-                "ema_80",
-                "ema_20",
-                "ema_70",
-                "atr",
-                "adx",
-                "cmo",
-                "signal",
-                "positions",
-                "position_size",
-            ]
-        )
+        return [
+            signal.alias("signal"),
+            over_partition(signal.diff(), partition_by)
+            .fill_null(0.0)
+            .alias("positions"),
+            pl.lit(self.position_size).alias("position_size"),
+        ]
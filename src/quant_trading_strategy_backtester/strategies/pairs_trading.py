@@ -6,8 +6,10 @@ assets will continue.
 
 from typing import Any
 
+import numpy as np
 import polars as pl
 
+from quant_trading_strategy_backtester.rolling import RollingStatistics
 from quant_trading_strategy_backtester.strategies.base import BaseStrategy
 
 
@@ -74,7 +76,26 @@ class PairsTradingStrategy(BaseStrategy):
                     ("positions", pl.Float64),
                 ]
             )
-        if "Close_1" not in data.columns or "Close_2" not in data.columns:
+        return self.generate_signals_lazy(data.lazy()).collect()
+
+    def generate_signals_lazy(
+        self, data: pl.LazyFrame, partition_by: str | None = None
+    ) -> pl.LazyFrame:
+        """
+        Builds the pairs trading signals as a lazy query plan.
+
+        Args:
+            data: A LazyFrame containing the price data. Must have 'Close_1'
+                  and 'Close_2' columns.
+            partition_by: Must be None, as each pair is backtested separately.
+
+        Returns:
+            A LazyFrame producing the same columns as ``generate_signals``.
+        """
+        if partition_by is not None:
+            raise ValueError("Pairs trading does not support partitioned signals")
+        columns = data.collect_schema().names()
+        if "Close_1" not in columns or "Close_2" not in columns:
             raise ValueError("Data must contain 'Close_1' and 'Close_2' columns")
 
         signals = data.select(
@@ -133,3 +154,118 @@ class PairsTradingStrategy(BaseStrategy):
         )
 
         return signals
+
+    @classmethod
+    def generate_positions_grid(
+        cls, data: pl.DataFrame, param_combinations: list[dict[str, Any]]
+    ) -> np.ndarray:
+        """
+        Generates the positions for many parameter combinations at once.
+
+        The z-score only depends on the window, so it is computed once per
+        distinct window from a single prefix-sum precomputation of the spread.
+        The signals for every entry/exit threshold pair using that window are
+        then derived together as a 2-D array, including the forward fill that
+        holds a position between the entry and exit thresholds. The positions
+        match ``generate_signals`` up to floating-point differences in the
+        z-scores.
+
+        Args:
+            data: A DataFrame containing the price data. Must have 'Close_1'
+                  and 'Close_2' columns.
+            param_combinations: The parameter sets to generate positions for.
+
+        Returns:
+            A matrix of positions with one row per row of ``data`` and one
+            column per parameter combination, in the order given.
+        """
+        if "Close_1" not in data.columns or "Close_2" not in data.columns:
+            raise ValueError("Data must contain 'Close_1' and 'Close_2' columns")
+
+        spread = (
+            data.select((pl.col("Close_1") - pl.col("Close_2")).cast(pl.Float64))
+            .to_series()
+            .fill_null(float("nan"))
+            .to_numpy()
+        )
+        stats = RollingStatistics(spread)
+        positions = np.zeros((len(spread), len(param_combinations)))
+
+        columns_by_window: dict[int, list[int]] = {}
+        for i, params in enumerate(param_combinations):
+            columns_by_window.setdefault(int(params["window"]), []).append(i)
+
+        for window, columns in columns_by_window.items():
+            z_score = calculate_z_score(spread, stats.mean(window), stats.std(window))
+            signal = calculate_hysteresis_signals(
+                z_score[:, np.newaxis],
+                np.array(
+                    [float(param_combinations[i]["entry_z_score"]) for i in columns]
+                ),
+                np.array(
+                    [float(param_combinations[i]["exit_z_score"]) for i in columns]
+                ),
+            )
+            positions[1:, columns] = np.diff(signal, axis=0)
+
+        return positions
+
+
+def calculate_z_score(
+    spread: np.ndarray, spread_mean: np.ndarray, spread_std: np.ndarray
+) -> np.ndarray:
+    """
+    Calculates the z-score of the spread as ``generate_signals`` does, with a
+    z-score of 0 where the rolling standard deviation is missing or zero.
+
+    Args:
+        spread: The spread between the two assets.
+        spread_mean: The rolling mean of the spread.
+        spread_std: The rolling standard deviation of the spread.
+
+    Returns:
+        The z-score of the spread, with the same shape as the inputs.
+    """
+    usable = ~np.isnan(spread_std) & (spread_std != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(usable, (spread - spread_mean) / spread_std, 0.0)
+
+
+def calculate_hysteresis_signals(
+    z_score: np.ndarray, entry_z_score: np.ndarray, exit_z_score: np.ndarray
+) -> np.ndarray:
+    """
+    Calculates pairs trading signals for many thresholds at once.
+
+    A signal of -1 or 1 is entered when the z-score crosses the entry
+    threshold, reset to 0 when it falls within the exit threshold, and held
+    in between, matching the forward fill in ``generate_signals``.
+
+    Args:
+        z_score: Z-scores with time along the first axis.
+        entry_z_score: Entry thresholds, broadcast against ``z_score``.
+        exit_z_score: Exit thresholds, broadcast against ``z_score``.
+
+    Returns:
+        The signals, with the broadcast shape of the inputs.
+    """
+    signal = np.where(
+        z_score > entry_z_score,
+        -1.0,
+        np.where(
+            z_score < -entry_z_score,
+            1.0,
+            np.where(np.abs(z_score) < exit_z_score, 0.0, np.nan),
+        ),
+    )
+    if len(signal) == 0:
+        return signal
+
+    # Forward fill by carrying the index of the last set signal down the
+    # time axis, then treat any leading unset signals as flat.
+    time_index = np.arange(len(signal)).reshape((-1,) + (1,) * (signal.ndim - 1))
+    last_set = np.where(np.isnan(signal), 0, time_index)
+    np.maximum.accumulate(last_set, axis=0, out=last_set)
+    signal = np.take_along_axis(signal, last_set, axis=0)
+    signal[np.isnan(signal)] = 0.0
+    return signal
@@ -14,14 +14,16 @@ from quant_trading_strategy_backtester.data import (
     load_yfinance_data_one_ticker,
     load_yfinance_data_two_tickers,
 )
-from quant_trading_strategy_backtester.optimiser import run_optimisation
+from quant_trading_strategy_backtester.optimiser import metrics_cache, run_optimisation
 from quant_trading_strategy_backtester.optimiser_core import (
     optimise_buy_and_hold_ticker,
     optimise_pairs_trading_tickers,
     optimise_single_ticker_strategy_ticker,
     optimise_strategy_params,
 )
+from quant_trading_strategy_backtester.streamlit_ui import streamlit_progress
 from quant_trading_strategy_backtester.utils import (
+    NUM_SCREENED_PAIRS,
     NUM_TOP_COMPANIES_ONE_TICKER,
     NUM_TOP_COMPANIES_TWO_TICKERS,
 )
@@ -41,9 +43,10 @@ def prepare_buy_and_hold_strategy_with_optimisation(
     with st.spinner("Fetching top S&P 500 companies..."):
         top_companies = get_top_sp500_companies(NUM_TOP_COMPANIES_ONE_TICKER)
 
-    best_ticker, _, _ = optimise_buy_and_hold_ticker(
-        top_companies, start_date, end_date
-    )
+    with streamlit_progress() as progress:
+        best_ticker, _, _ = optimise_buy_and_hold_ticker(
+            top_companies, start_date, end_date, progress=progress
+        )
 
     end_time = time.time()
     st.success(
@@ -74,19 +77,28 @@ def prepare_single_ticker_strategy_with_optimisation(
     with st.spinner("Fetching top S&P 500 companies..."):
         top_companies = get_top_sp500_companies(NUM_TOP_COMPANIES_ONE_TICKER)
 
-    best_ticker = optimise_single_ticker_strategy_ticker(
-        top_companies, start_date, end_date, strategy_type, strategy_params
-    )
+    with streamlit_progress() as progress:
+        best_ticker = optimise_single_ticker_strategy_ticker(
+            top_companies,
+            start_date,
+            end_date,
+            strategy_type,
+            strategy_params,
+            progress=progress,
+        )
 
     data = load_yfinance_data_one_ticker(best_ticker, start_date, end_date)
 
     if optimise:
-        best_params, _ = optimise_strategy_params(
-            data,
-            strategy_type,
-            cast(dict[str, range | list[int | float]], strategy_params),
-            best_ticker,
-        )
+        with streamlit_progress() as progress:
+            best_params, _ = optimise_strategy_params(
+                data,
+                strategy_type,
+                cast(dict[str, range | list[int | float]], strategy_params),
+                best_ticker,
+                cache=metrics_cache,
+                progress=progress,
+            )
     else:
         best_params = {
             k: v[0] if isinstance(v, (list, range)) else v
@@ -114,16 +126,24 @@ def prepare_pairs_trading_strategy_with_optimisation(
     """Find the best ticker pair for a pairs trading strategy and optionally optimise."""
     st.info(
         f"Selecting the best pair from the top {NUM_TOP_COMPANIES_TWO_TICKERS} S&P 500 "
-        "companies. This may take a while..."
+        f"companies, backtesting the {NUM_SCREENED_PAIRS} pairs with the most "
+        "correlated returns. This may take a while..."
     )
 
     start_time = time.time()
     with st.spinner("Fetching top S&P 500 companies..."):
         top_companies = get_top_sp500_companies(NUM_TOP_COMPANIES_TWO_TICKERS)
 
-    ticker, strategy_params, _ = optimise_pairs_trading_tickers(
-        top_companies, start_date, end_date, strategy_params, optimise
-    )
+    with streamlit_progress() as progress:
+        ticker, strategy_params, _ = optimise_pairs_trading_tickers(
+            top_companies,
+            start_date,
+            end_date,
+            strategy_params,
+            optimise,
+            screen_top_k=NUM_SCREENED_PAIRS,
+            progress=progress,
+        )
     ticker1, ticker2 = ticker
 
     end_time = time.time()
@@ -193,9 +213,10 @@ def prepare_single_ticker_strategy(
         )
     elif optimise and strategy_type == "Buy and Hold":
         top_companies = get_top_sp500_companies(NUM_TOP_COMPANIES_ONE_TICKER)
-        best_ticker, strategy_params, _ = optimise_buy_and_hold_ticker(
-            top_companies, start_date, end_date
-        )
+        with streamlit_progress() as progress:
+            best_ticker, strategy_params, _ = optimise_buy_and_hold_ticker(
+                top_companies, start_date, end_date, progress=progress
+            )
         ticker = best_ticker
         ticker_display = best_ticker
         data = load_yfinance_data_one_ticker(ticker, start_date, end_date)
@@ -3,11 +3,16 @@ Contains functions to get user inputs from the Streamlit sidebar user
 interface.
 """
 
+import contextlib
 import datetime
-from typing import Any, cast
+from typing import Any, Iterator, cast
 
 import streamlit as st
 
+from quant_trading_strategy_backtester.progress import (
+    ProgressCallback,
+    ThrottledProgress,
+)
 from quant_trading_strategy_backtester.strategies.base import TRADING_STRATEGIES
 from quant_trading_strategy_backtester.utils import (
     NUM_TOP_COMPANIES_ONE_TICKER,
@@ -184,3 +189,32 @@ def get_user_inputs_for_strategy_params(
         params = get_fixed_params(strategy_type)
 
     return optimise, params
+
+
+@contextlib.contextmanager
+def streamlit_progress(min_interval: float = 0.1) -> Iterator[ProgressCallback]:
+    """
+    Shows a progress bar and a status line for the duration of the block.
+
+    Reports are throttled to one every ``min_interval`` seconds, as every
+    Streamlit update is sent to the browser, and both elements are removed
+    when the block exits.
+
+    Args:
+        min_interval: The shortest time between updates, in seconds.
+
+    Yields:
+        The progress callback to pass to the optimisers.
+    """
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+
+    def update(fraction: float, message: str) -> None:
+        progress_bar.progress(min(max(fraction, 0.0), 1.0))
+        status_text.text(message)
+
+    try:
+        yield ThrottledProgress(update, min_interval)
+    finally:
+        progress_bar.empty()
+        status_text.empty()
@@ -0,0 +1,149 @@
+"""
+Contains an on-disk snapshot of the stock universe, so that ticker
+auto-selection does not have to fetch the metadata of every constituent each
+time the app starts.
+"""
+
+import datetime
+import os
+import threading
+from pathlib import Path
+from typing import Callable
+
+import polars as pl
+
+from quant_trading_strategy_backtester.utils import logger
+
+# The columns of a universe snapshot.
+UNIVERSE_SCHEMA = {
+    "Ticker": pl.String,
+    "Market Cap": pl.Float64,
+    "Long Name": pl.String,
+    "Sector": pl.String,
+}
+
+# The smallest share of tickers with a market cap for a fetched universe to
+# replace the snapshot. Fetches that mostly failed, for example because of
+# rate limiting, are rejected so that they don't replace a usable snapshot.
+MIN_MARKET_CAP_SHARE = 0.5
+
+
+class UniverseSnapshot:
+    """
+    Stores the constituents of a stock universe and their metadata as an
+    Arrow IPC file.
+
+    The first load fetches the universe and writes the snapshot. Later loads
+    read the snapshot, and once it is older than the time to live they start
+    a refresh in a background thread while still returning the stale
+    snapshot, so callers never wait for the metadata to be fetched again.
+
+    Attributes:
+        path: The path of the snapshot file.
+        ttl: How long a snapshot is used before it is refreshed.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        ttl: datetime.timedelta,
+        fetch: Callable[[], pl.DataFrame],
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self._fetch = fetch
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+
+    def load(self) -> pl.DataFrame:
+        """
+        Loads the universe, fetching it only if there is no snapshot yet.
+
+        Returns:
+            A DataFrame with one row per ticker and the columns of
+            ``UNIVERSE_SCHEMA``.
+        """
+        if not self.path.exists():
+            return self.refresh()
+        if self.is_stale():
+            self.refresh_in_background()
+        return pl.read_ipc(self.path, memory_map=False)
+
+    def load_if_available(self) -> pl.DataFrame | None:
+        """
+        Loads the snapshot without fetching the universe.
+
+        Returns:
+            The snapshot, or None if there is no snapshot yet.
+        """
+        if not self.path.exists():
+            return None
+        return pl.read_ipc(self.path, memory_map=False)
+
+    def is_stale(self) -> bool:
+        """Checks whether the snapshot is older than its time to live."""
+        modified = datetime.datetime.fromtimestamp(self.path.stat().st_mtime)
+        return datetime.datetime.now() - modified > self.ttl
+
+    def refresh(self) -> pl.DataFrame:
+        """
+        Fetches the universe and replaces the snapshot with it.
+
+        Returns:
+            The fetched universe.
+
+        Raises:
+            ValueError: If fewer than ``MIN_MARKET_CAP_SHARE`` of the fetched
+                        tickers have a market cap, in which case the snapshot
+                        is left unchanged.
+        """
+        universe = self._fetch().select(
+            pl.col(name).cast(dtype) for name, dtype in UNIVERSE_SCHEMA.items()
+        )
+        num_tickers = len(universe)
+        num_market_caps = universe["Market Cap"].drop_nans().count()
+        if not num_market_caps or num_market_caps < MIN_MARKET_CAP_SHARE * num_tickers:
+            raise ValueError(
+                f"Only {num_market_caps} of {num_tickers} tickers in the fetched "
+                "universe have a market cap"
+            )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_suffix(".tmp")
+        universe.write_ipc(temporary_path)
+        os.replace(temporary_path, self.path)
+        return universe
+
+    def refresh_in_background(self) -> threading.Thread:
+        """
+        Starts refreshing the snapshot in a daemon thread, unless a refresh
+        is already running.
+
+        Returns:
+            The thread doing the refresh.
+        """
+        with self._refresh_lock:
+            if self._refresh_thread is None or not self._refresh_thread.is_alive():
+                self._refresh_thread = threading.Thread(
+                    target=self._refresh_logging_errors, daemon=True
+                )
+                self._refresh_thread.start()
+            return self._refresh_thread
+
+    def wait_for_refresh(self, timeout: float | None = None) -> None:
+        """
+        Waits for a background refresh to finish, if one is running.
+
+        Args:
+            timeout: The maximum number of seconds to wait, or None to wait
+                     until the refresh finishes.
+        """
+        with self._refresh_lock:
+            thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _refresh_logging_errors(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Failed to refresh the universe snapshot: {e}")
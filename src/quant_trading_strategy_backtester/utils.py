@@ -2,7 +2,9 @@
 Contains utility code and constants used throughout the project.
 """
 
+import datetime
 import logging
+import os
 
 from sqlalchemy import create_engine
 
@@ -10,7 +12,17 @@ from quant_trading_strategy_backtester.models import Base
 
 logger = logging.getLogger(__name__)
 NUM_TOP_COMPANIES_ONE_TICKER = 100
-NUM_TOP_COMPANIES_TWO_TICKERS = 20
+NUM_TOP_COMPANIES_TWO_TICKERS = 100
+# The number of pairs kept by the correlation screen and then backtested.
+NUM_SCREENED_PAIRS = 20
+PRICE_STORE_DIR = os.environ.get("PRICE_STORE_DIR", "price_store")
+UNIVERSE_SNAPSHOT_PATH = os.environ.get(
+    "UNIVERSE_SNAPSHOT_PATH", "sp500_universe.arrow"
+)
+METRICS_CACHE_PATH = os.environ.get("METRICS_CACHE_PATH", "metrics_cache.db")
+UNIVERSE_SNAPSHOT_TTL = datetime.timedelta(
+    hours=float(os.environ.get("UNIVERSE_SNAPSHOT_TTL_HOURS", "24"))
+)
 
 
 def clear_database():
@@ -23,6 +23,23 @@ def display_performance_metrics(
     sharpe_ratio_col.metric("Sharpe Ratio", f"{metrics['Sharpe Ratio']:.4f}")
     max_drawdown_col.metric("Max Drawdown", f"{metrics['Max Drawdown']:.4%}")
 
+    other_metrics = {
+        name: value
+        for name, value in metrics.items()
+        if name not in {"Total Return", "Sharpe Ratio", "Max Drawdown"}
+    }
+    if other_metrics:
+        with st.expander("Full tearsheet"):
+            st.dataframe(
+                pl.DataFrame(
+                    {
+                        "Metric": list(other_metrics),
+                        "Value": list(other_metrics.values()),
+                    }
+                ),
+                hide_index=True,
+            )
+
 
 def plot_equity_curve(
     results: pl.DataFrame, ticker_display: str, company_name: str | None
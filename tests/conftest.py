@@ -2,6 +2,8 @@
 Contains pytest fixtures for tests, such as mock data.
 """
 
+import datetime
+
 import pandas as pd
 import polars as pl
 import pytest
@@ -9,6 +11,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from quant_trading_strategy_backtester.models import Base
+from quant_trading_strategy_backtester.price_store import PriceStore
+from quant_trading_strategy_backtester.universe import UniverseSnapshot
 
 
 @pytest.fixture
@@ -73,6 +77,50 @@ def mock_db_session(monkeypatch):
     session.close()
 
 
+@pytest.fixture(autouse=True)
+def mock_price_store(monkeypatch, tmp_path) -> PriceStore:
+    store = PriceStore(tmp_path / "price_store")
+    monkeypatch.setattr("quant_trading_strategy_backtester.data.price_store", store)
+    return store
+
+
+@pytest.fixture
+def mock_universe() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "Ticker": ["MSFT", "GOOGL", "AAPL", "GOOG", "XYZ"],
+            "Market Cap": [3.0e12, 2.0e12, 3.5e12, 2.0e12, None],
+            "Long Name": [
+                "Microsoft Corporation",
+                "Alphabet Inc.",
+                "Apple Inc.",
+                "Alphabet Inc.",
+                None,
+            ],
+            "Sector": [
+                "Information Technology",
+                "Communication Services",
+                "Information Technology",
+                "Communication Services",
+                None,
+            ],
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_universe_snapshot(
+    monkeypatch, tmp_path, mock_universe: pl.DataFrame
+) -> UniverseSnapshot:
+    snapshot = UniverseSnapshot(
+        tmp_path / "universe.arrow", datetime.timedelta(days=1), lambda: mock_universe
+    )
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.data.universe_snapshot", snapshot
+    )
+    return snapshot
+
+
 @pytest.fixture(autouse=True)
 def mock_yfinance_functions(monkeypatch):
     def mock_load_one_ticker(*args, **kwargs):
@@ -2,6 +2,7 @@
 Tests for the Mean Reversion strategy class.
 """
 
+import numpy as np
 import polars as pl
 
 from quant_trading_strategy_backtester.strategies.mean_reversion import (
@@ -27,3 +28,22 @@ def test_mean_reversion_strategy_generate_signals(
     for col in EXPECTED_COLS:
         assert col in signals.columns
     assert signals["signal"].is_in([0.0, 1.0, -1.0]).all()
+
+
+def test_mean_reversion_strategy_generate_positions_grid() -> None:
+    rng = np.random.default_rng(0)
+    # Include a flat stretch so that zero standard deviation windows are covered.
+    prices = np.concatenate([100 + np.cumsum(rng.normal(0, 1, 80)), np.full(20, 90.0)])
+    data = pl.DataFrame({"Date": range(len(prices)), "Close": prices})
+    param_combinations = [
+        {"window": window, "std_dev": std_dev}
+        for window in (5, 10, 20)
+        for std_dev in (0.5, 1.0, 2.0)
+    ]
+
+    positions = MeanReversionStrategy.generate_positions_grid(data, param_combinations)
+
+    assert positions.shape == (len(prices), len(param_combinations))
+    for i, params in enumerate(param_combinations):
+        expected = MeanReversionStrategy(params).generate_signals(data)["positions"]
+        np.testing.assert_array_equal(positions[:, i], expected.to_numpy())
@@ -4,6 +4,7 @@ Tests for the Pairs Trading strategy class.
 
 from datetime import date, timedelta
 
+import numpy as np
 import polars as pl
 import pytest
 
@@ -146,3 +147,31 @@ def test_pairs_trading_strategy_with_mock_polars_data():
         signals["spread"] == signals["Close_1"] - signals["Close_2"]
     ).all(), "Spread calculation is incorrect"
     assert signals["z_score"].null_count() == 0, "Z-score contains null values"
+
+
+def test_pairs_trading_strategy_generate_positions_grid() -> None:
+    rng = np.random.default_rng(0)
+    prices1 = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 250)))
+    prices2 = prices1 * np.exp(np.cumsum(rng.normal(0, 0.01, 250)))
+    dates = [date(2020, 1, 1) + timedelta(days=i) for i in range(250)]
+    data = pl.DataFrame({"Date": dates, "Close_1": prices1, "Close_2": prices2})
+    param_combinations = [
+        {"window": window, "entry_z_score": entry, "exit_z_score": exit}
+        for window in (10, 30)
+        for entry in (1.0, 2.0)
+        for exit in (0.1, 0.5)
+    ]
+
+    positions = PairsTradingStrategy.generate_positions_grid(data, param_combinations)
+
+    assert positions.shape == (250, len(param_combinations))
+    for i, params in enumerate(param_combinations):
+        expected = PairsTradingStrategy(params).generate_signals(data)["positions"]
+        np.testing.assert_array_equal(positions[:, i], expected.to_numpy())
+
+
+def test_pairs_trading_strategy_generate_positions_grid_with_invalid_data() -> None:
+    data = pl.DataFrame({"Close_1": [100, 101, 102], "Close_3": [100, 101, 102]})
+    params = {"window": 2, "entry_z_score": 2.0, "exit_z_score": 0.5}
+    with pytest.raises(ValueError):
+        PairsTradingStrategy.generate_positions_grid(data, [params])
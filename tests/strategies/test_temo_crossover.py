@@ -61,3 +61,18 @@ def test_temo_strategy_with_mock_polars_data():
     assert signals["signal"].abs().sum() > 0, "No trading signals generated"
     non_zero_positions = signals.filter(pl.col("positions") != 0)
     assert len(non_zero_positions) > 0, "No position changes"
+
+
+def test_temo_strategy_reuses_indicators_across_position_sizes(
+    mock_polars_data: pl.DataFrame,
+) -> None:
+    small = MovingAverageCrossoverStrategy({"position_size": 0.01})
+    large = MovingAverageCrossoverStrategy({"position_size": 0.05})
+    slow = MovingAverageCrossoverStrategy({"position_size": 0.01, "adx_period": 20})
+
+    indicators = small._calculate_indicators(mock_polars_data)
+    assert large._calculate_indicators(mock_polars_data.clone()) is indicators
+    assert slow._calculate_indicators(mock_polars_data) is not indicators
+
+    signals = large.generate_signals(mock_polars_data)
+    assert (signals["position_size"] == 0.05).all()
@@ -3,15 +3,28 @@ Contains tests for the Backtester class and its methods.
 """
 
 import datetime
+import itertools
 import math
+import operator
 from typing import Any
 
+import numpy as np
 import polars as pl
 import pytest
 
-from quant_trading_strategy_backtester.backtester import Backtester
+from quant_trading_strategy_backtester.backtester import (
+    COMPACT_RESULT_COLUMNS,
+    PERFORMANCE_METRICS,
+    Backtester,
+    _calculate_batch_metrics,
+    build_result_record,
+    save_strategy_results,
+)
 from quant_trading_strategy_backtester.models import StrategyModel
 from quant_trading_strategy_backtester.strategies.base import BaseStrategy
+from quant_trading_strategy_backtester.strategies.buy_and_hold import (
+    BuyAndHoldStrategy,
+)
 from quant_trading_strategy_backtester.strategies.mean_reversion import (
     MeanReversionStrategy,
 )
@@ -118,9 +131,52 @@ def test_backtester_get_performance_metrics(
     backtester.run()
     metrics = backtester.get_performance_metrics()
     assert isinstance(metrics, dict)
-    EXPECTED_METRICS = {"Total Return", "Sharpe Ratio", "Max Drawdown"}
-    for metric in EXPECTED_METRICS:
-        assert metric in metrics
+    assert list(metrics) == PERFORMANCE_METRICS
+
+
+def test_backtester_get_performance_metrics_tearsheet() -> None:
+    strategy_returns = [0.0, 0.1, -0.05, 0.02, -0.1, 0.0]
+    cumulative_returns = list(
+        itertools.accumulate((1 + r for r in strategy_returns), operator.mul)
+    )
+    backtester = Backtester(
+        pl.DataFrame(), BuyAndHoldStrategy({}), initial_capital=100.0
+    )
+    backtester.results = pl.DataFrame(
+        {
+            "positions": [1.0, 0.0, -1.0, 0.0, 0.0, 0.0],
+            "strategy_returns": strategy_returns,
+            "cumulative_returns": cumulative_returns,
+            "equity_curve": [100.0 * c for c in cumulative_returns],
+        }
+    )
+
+    metrics = backtester.get_performance_metrics()
+    assert metrics is not None
+
+    returns = np.array(strategy_returns)
+    cagr = cumulative_returns[-1] ** (252 / 6) - 1
+    max_drawdown = cumulative_returns[4] / cumulative_returns[1] - 1
+    downside_deviation = math.sqrt((0.05**2 + 0.1**2) / 6)
+    deviations = returns - returns.mean()
+    assert metrics == pytest.approx(
+        {
+            "Total Return": cumulative_returns[-1] - 1,
+            "Sharpe Ratio": 252**0.5 * returns.mean() / returns.std(ddof=1),
+            "Max Drawdown": max_drawdown,
+            "CAGR": cagr,
+            "Annualised Volatility": 252**0.5 * returns.std(ddof=1),
+            "Sortino Ratio": 252**0.5 * returns.mean() / downside_deviation,
+            "Calmar Ratio": cagr / abs(max_drawdown),
+            # The equity curve stays below its peak from the third bar on.
+            "Max Drawdown Duration": 4.0,
+            "Hit Rate": 2 / 4,
+            "Skewness": (deviations**3).mean() / (deviations**2).mean() ** 1.5,
+            "Kurtosis": (deviations**4).mean() / (deviations**2).mean() ** 2 - 3,
+            # Only bars after a non-zero position are exposed.
+            "Exposure": 2 / 6,
+        }
+    )
 
 
 @pytest.mark.parametrize(
@@ -238,3 +294,165 @@ def test_backtester_save_results(mock_db_session, mock_polars_data):
     )
 
     assert saved_strategy.max_drawdown is not None
+
+
+@pytest.mark.parametrize(
+    "strategy_class,params_list,data_fixture",
+    [
+        (
+            MeanReversionStrategy,
+            [{"window": 3, "std_dev": 0.5}, {"window": 5, "std_dev": 2.0}],
+            "mock_polars_data",
+        ),
+        (
+            PairsTradingStrategy,
+            [
+                {"window": 5, "entry_z_score": 1.0, "exit_z_score": 0.5},
+                {"window": 10, "entry_z_score": 2.0, "exit_z_score": 0.1},
+            ],
+            "mock_polars_pairs_data",
+        ),
+    ],
+)
+def test_backtester_run_batch_matches_run(
+    request: pytest.FixtureRequest,
+    strategy_class: BaseStrategy,
+    params_list: list[dict[str, Any]],
+    data_fixture: str,
+) -> None:
+    data = request.getfixturevalue(data_fixture)
+    positions = pl.DataFrame(
+        {
+            str(i): strategy_class(params).generate_signals(data)["positions"]  # type: ignore
+            for i, params in enumerate(params_list)
+        }
+    )
+    batch = Backtester(data, strategy_class(params_list[0])).run_batch(positions)  # type: ignore
+
+    assert batch.equity_curves.shape == (len(data), len(params_list))
+    for i, params in enumerate(params_list):
+        backtester = Backtester(data, strategy_class(params))  # type: ignore
+        results = backtester.run()
+        metrics = backtester.get_performance_metrics()
+        assert metrics is not None
+        assert batch.equity_curves[:, i] == pytest.approx(
+            results["equity_curve"].to_numpy()
+        )
+        for name, value in metrics.items():
+            assert batch.metrics[i][name] == pytest.approx(value, nan_ok=True)
+
+
+@pytest.mark.parametrize(
+    "strategy_class,params",
+    [
+        (BuyAndHoldStrategy, {}),
+        (MeanReversionStrategy, {"window": 10, "std_dev": 1.0}),
+        (MovingAverageCrossoverStrategy, {"adx_period": 5, "cmo_period": 5}),
+        (
+            PairsTradingStrategy,
+            {"window": 10, "entry_z_score": 1.0, "exit_z_score": 0.2},
+        ),
+    ],
+)
+def test_backtester_lazy_run_matches_eager_run(
+    strategy_class: BaseStrategy, params: dict[str, Any]
+) -> None:
+    close = [100 + 10 * math.sin(i / 5) + i * 0.1 for i in range(120)]
+    data = pl.DataFrame(
+        {
+            "Date": [
+                datetime.date(2020, 1, 1) + datetime.timedelta(days=i)
+                for i in range(120)
+            ],
+            "High": [price + 1 for price in close],
+            "Low": [price - 1 for price in close],
+            "Close": close,
+            "Close_1": close,
+            "Close_2": [100 + 5 * math.cos(i / 7) for i in range(120)],
+        }
+    )
+    eager = Backtester(data, strategy_class(params))  # type: ignore
+    lazy = Backtester(data, strategy_class(params))  # type: ignore
+
+    assert lazy.run(persist=False, lazy=True).equals(eager.run(persist=False))
+    assert lazy.get_performance_metrics() == pytest.approx(
+        eager.get_performance_metrics(), rel=0, abs=0, nan_ok=True
+    )
+
+
+def test_backtester_run_batch_with_mismatched_rows(mock_polars_data) -> None:
+    backtester = Backtester(
+        mock_polars_data, MeanReversionStrategy({"window": 5, "std_dev": 2.0})
+    )
+    with pytest.raises(ValueError):
+        backtester.run_batch(pl.DataFrame({"0": [0.0, 1.0]}))
+
+
+def test_batch_metrics_without_bars_are_independent() -> None:
+    empty = np.empty((0, 2))
+    metrics = _calculate_batch_metrics(empty, empty, empty, empty)
+
+    assert len(metrics) == 2
+    assert metrics[0] is not metrics[1]
+    metrics[0]["Sharpe Ratio"] = 1.0
+    assert math.isnan(metrics[1]["Sharpe Ratio"])
+
+
+def test_backtester_run_without_persisting(
+    monkeypatch, mock_db_session, mock_polars_data
+):
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.backtester.is_running_locally", lambda: True
+    )
+    backtester = Backtester(
+        mock_polars_data, MovingAverageCrossoverStrategy({}), session=mock_db_session
+    )
+    backtester.run(persist=False)
+
+    assert backtester.get_performance_metrics() is not None
+    assert mock_db_session.query(StrategyModel).count() == 0
+
+
+def test_save_strategy_results_in_bulk(monkeypatch, mock_db_session, mock_polars_data):
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.backtester.is_running_locally", lambda: True
+    )
+    metrics = {"Total Return": 0.1, "Sharpe Ratio": 1.2, "Max Drawdown": -0.05}
+    records = [
+        build_result_record(
+            mock_polars_data,
+            "MeanReversionStrategy",
+            {"window": window, "std_dev": 2.0},
+            metrics,
+            "AAPL",
+        )
+        for window in (5, 10, 20)
+    ]
+
+    save_strategy_results(records, mock_db_session)
+
+    saved = mock_db_session.query(StrategyModel).all()
+    assert len(saved) == 3
+    assert saved[0].start_date == datetime.date(2020, 1, 1)
+    assert saved[0].end_date == datetime.date(2020, 1, 31)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_backtester_compact_run_keeps_full_precision_metrics(
+    mock_polars_data, lazy: bool
+) -> None:
+    strategy = MovingAverageCrossoverStrategy({})
+    full = Backtester(mock_polars_data, strategy)
+    full_results = full.run(persist=False)
+    compact = Backtester(mock_polars_data, strategy)
+
+    results = compact.run(persist=False, lazy=lazy, compact=True, float32=True)
+
+    assert results.columns == COMPACT_RESULT_COLUMNS
+    assert results.schema["equity_curve"] == pl.Float32
+    assert results["equity_curve"].to_list() == pytest.approx(
+        full_results["equity_curve"].to_list(), rel=1e-6
+    )
+    assert compact.get_performance_metrics() == pytest.approx(
+        full.get_performance_metrics(), rel=0, abs=0, nan_ok=True
+    )
@@ -0,0 +1,76 @@
+"""
+Contains tests for the shared caches used by backtests.
+"""
+
+import polars as pl
+import pytest
+
+from quant_trading_strategy_backtester.cache import (
+    LRUCache,
+    clear_derived_returns_cache,
+    dataset_fingerprint,
+    get_derived_returns,
+)
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    # Touch "a" so that "b" becomes the least recently used entry.
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_with_invalid_size() -> None:
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_dataset_fingerprint_depends_on_contents(
+    mock_polars_data: pl.DataFrame,
+) -> None:
+    assert dataset_fingerprint(mock_polars_data) == dataset_fingerprint(
+        mock_polars_data.clone()
+    )
+    changed = mock_polars_data.with_columns(pl.col("Close") * 2)
+    assert dataset_fingerprint(mock_polars_data) != dataset_fingerprint(changed)
+
+
+def test_get_derived_returns_single_asset(mock_polars_data: pl.DataFrame) -> None:
+    clear_derived_returns_cache()
+    derived = get_derived_returns(mock_polars_data)
+
+    assert set(derived) == {"simple_returns", "log_returns"}
+    assert derived["simple_returns"][0] is None
+    assert derived["simple_returns"][1:].to_list() == [0.0] * 30
+    assert derived["log_returns"][1:].to_list() == [0.0] * 30
+    # Repeated calls on the same prices reuse the cached series, even when
+    # the prices are held in a different buffer.
+    assert get_derived_returns(mock_polars_data.clone()) is derived
+    copied = mock_polars_data.with_columns(
+        pl.Series("Close", mock_polars_data["Close"].to_numpy().copy())
+    )
+    assert get_derived_returns(copied) is derived
+    # Different prices are recomputed.
+    changed = mock_polars_data.with_columns(pl.col("Close") * 2)
+    assert get_derived_returns(changed) is not derived
+
+
+def test_get_derived_returns_pairs(mock_polars_pairs_data: pl.DataFrame) -> None:
+    derived = get_derived_returns(mock_polars_pairs_data)
+    close_1 = mock_polars_pairs_data["Close_1"]
+    close_2 = mock_polars_pairs_data["Close_2"]
+    expected = close_1.pct_change() - close_2.pct_change()
+
+    assert derived["spread"][1:].to_list() == pytest.approx(expected[1:].to_list())
+
+
+def test_get_derived_returns_without_close() -> None:
+    with pytest.raises(ValueError):
+        get_derived_returns(pl.DataFrame({"Open": [1.0, 2.0]}))
@@ -8,8 +8,10 @@ import pandas as pd
 import polars as pl
 
 from quant_trading_strategy_backtester.data import (
+    get_company_identity_index,
     get_full_company_name,
     is_same_company,
+    load_yfinance_data_many_tickers,
     load_yfinance_data_one_ticker,
     load_yfinance_data_two_tickers,
 )
@@ -33,6 +35,25 @@ def test_load_yfinance_data_one_ticker(
     assert len(data) == 31
 
 
+def test_load_yfinance_data_one_ticker_reuses_stored_prices(
+    monkeypatch, mock_yfinance_data: pd.DataFrame
+) -> None:
+    downloads = []
+
+    def mock_download(*args, **kwargs):
+        downloads.append(args)
+        return mock_yfinance_data.set_index("Date")
+
+    monkeypatch.setattr("yfinance.download", mock_download)
+
+    start_date, end_date = datetime.date(2020, 1, 1), datetime.date(2020, 1, 31)
+    first = load_yfinance_data_one_ticker("AAPL", start_date, end_date)
+    second = load_yfinance_data_one_ticker("AAPL", start_date, end_date)
+
+    assert len(downloads) == 1
+    assert second.equals(first)
+
+
 def test_load_yfinance_data_two_tickers(
     monkeypatch, mock_yfinance_data: pd.DataFrame
 ) -> None:
@@ -52,6 +73,86 @@ def test_load_yfinance_data_two_tickers(
     assert len(data) == 31
 
 
+def test_load_yfinance_data_two_tickers_joins_on_date(
+    monkeypatch, mock_yfinance_data: pd.DataFrame
+) -> None:
+    downloads = []
+
+    def mock_download(ticker, *args, **kwargs):
+        downloads.append(ticker)
+        prices = mock_yfinance_data.set_index("Date")
+        # MSFT has no price in the first five days.
+        return prices if ticker == "AAPL" else prices.iloc[5:] * 2
+
+    monkeypatch.setattr("yfinance.download", mock_download)
+    # Load each ticker through the price store rather than the autouse mock.
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.data.load_yfinance_data_one_ticker",
+        load_yfinance_data_one_ticker,
+    )
+
+    start_date, end_date = datetime.date(2020, 1, 1), datetime.date(2020, 1, 31)
+    data = load_yfinance_data_two_tickers("AAPL", "MSFT", start_date, end_date)
+    load_yfinance_data_two_tickers("MSFT", "AAPL", start_date, end_date)
+
+    assert downloads == ["AAPL", "MSFT"]
+    assert len(data) == 26
+    assert data["Date"].min() == datetime.datetime(2020, 1, 6)
+    assert data["Close_1"].to_list() == [105.0] * 26
+    assert data["Close_2"].to_list() == [210.0] * 26
+
+
+def test_load_yfinance_data_many_tickers(
+    monkeypatch, mock_yfinance_data: pd.DataFrame
+) -> None:
+    downloads = []
+
+    def mock_download(tickers, *args, **kwargs):
+        downloads.append(list(tickers))
+        prices = mock_yfinance_data.set_index("Date")
+        return pd.concat(
+            {ticker: prices * (i + 1) for i, ticker in enumerate(tickers)}, axis=1
+        )
+
+    monkeypatch.setattr("yfinance.download", mock_download)
+
+    start_date, end_date = datetime.date(2020, 1, 1), datetime.date(2020, 1, 31)
+    data = load_yfinance_data_many_tickers(["MSFT", "AAPL"], start_date, end_date)
+    again = load_yfinance_data_many_tickers(["MSFT", "AAPL"], start_date, end_date)
+
+    # Both tickers come from one batched request, then from the price store.
+    assert downloads == [["MSFT", "AAPL"]]
+    assert again.equals(data)
+    assert data.columns[:2] == ["Date", "Ticker"]
+    assert data["Ticker"].unique(maintain_order=True).to_list() == ["MSFT", "AAPL"]
+    assert data.filter(pl.col("Ticker") == "AAPL")["Close"].to_list() == [210.0] * 31
+
+
+def test_load_yfinance_data_many_tickers_downloads_tickers_missing_from_batch(
+    monkeypatch, mock_yfinance_data: pd.DataFrame
+) -> None:
+    downloads = []
+
+    def mock_download(tickers, *args, **kwargs):
+        downloads.append(tickers)
+        prices = mock_yfinance_data.set_index("Date")
+        if isinstance(tickers, str):
+            return prices.reset_index()
+        # The batched request only returns the first ticker.
+        return pd.concat({tickers[0]: prices}, axis=1)
+
+    monkeypatch.setattr("yfinance.download", mock_download)
+
+    start_date, end_date = datetime.date(2020, 1, 1), datetime.date(2020, 1, 31)
+    data = load_yfinance_data_many_tickers(["MSFT", "AAPL"], start_date, end_date)
+    again = load_yfinance_data_many_tickers(["MSFT", "AAPL"], start_date, end_date)
+
+    assert downloads == [["MSFT", "AAPL"], "AAPL"]
+    assert again.equals(data)
+    assert data["Ticker"].unique(maintain_order=True).to_list() == ["MSFT", "AAPL"]
+    assert data.filter(pl.col("Ticker") == "AAPL")["Close"].to_list() == [105.0] * 31
+
+
 def test_get_full_company_name_success(monkeypatch):
     def mock_ticker_info(*args, **kwargs):
         class MockTicker:
@@ -122,3 +223,30 @@ def test_is_same_company_check_failure(monkeypatch):
 
     monkeypatch.setattr("yfinance.Ticker", mock_ticker_info_error)
     assert is_same_company("ERROR1", "ERROR2") is False
+
+
+def test_get_company_identity_index(monkeypatch, mock_universe_snapshot):
+    mock_universe_snapshot.load()
+    fetched = []
+
+    def mock_ticker_info(ticker):
+        fetched.append(ticker)
+
+        class MockTicker:
+            @property
+            def info(self):
+                return (
+                    {"longName": "Alphabet Inc. (Class C)"} if ticker == "ABC" else {}
+                )
+
+        return MockTicker()
+
+    monkeypatch.setattr("yfinance.Ticker", mock_ticker_info)
+
+    index = get_company_identity_index(["GOOG", "GOOGL", "AAPL", "ABC", "XYZ"])
+
+    # Only tickers without a name in the universe snapshot are looked up.
+    assert sorted(fetched) == ["ABC", "XYZ"]
+    assert index["GOOG"] == index["GOOGL"] == index["ABC"] == "alphabet"
+    assert index["AAPL"] == "apple"
+    assert index["XYZ"] not in {"alphabet", "apple"}
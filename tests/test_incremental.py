@@ -0,0 +1,157 @@
+"""
+Contains tests for the incremental backtester.
+"""
+
+import datetime
+import math
+
+import numpy as np
+import polars as pl
+import pytest
+
+from quant_trading_strategy_backtester.backtester import Backtester
+from quant_trading_strategy_backtester.incremental import (
+    IncrementalBacktester,
+    RollingWindow,
+)
+from quant_trading_strategy_backtester.strategies.buy_and_hold import (
+    BuyAndHoldStrategy,
+)
+from quant_trading_strategy_backtester.strategies.mean_reversion import (
+    MeanReversionStrategy,
+)
+from quant_trading_strategy_backtester.strategies.moving_average_crossover import (
+    MovingAverageCrossoverStrategy,
+)
+from quant_trading_strategy_backtester.strategies.pairs_trading import (
+    PairsTradingStrategy,
+)
+
+
+@pytest.fixture
+def random_walk_data() -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+    return pl.DataFrame(
+        {
+            "Date": [
+                datetime.date(2020, 1, 1) + datetime.timedelta(days=i)
+                for i in range(len(close))
+            ],
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Close_1": close,
+            "Close_2": close * np.exp(rng.normal(0, 0.01, len(close))),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        BuyAndHoldStrategy({}),
+        MeanReversionStrategy({"window": 10, "std_dev": 1.0}),
+        PairsTradingStrategy({"window": 10, "entry_z_score": 1.0, "exit_z_score": 0.3}),
+        MovingAverageCrossoverStrategy({}),
+    ],
+)
+def test_incremental_backtest_matches_full_backtest(
+    random_walk_data: pl.DataFrame, strategy
+) -> None:
+    """
+    Test that appending bars one at a time reproduces a full backtest.
+    """
+    data = random_walk_data
+    if not isinstance(strategy, PairsTradingStrategy):
+        data = data.drop("Close_1", "Close_2")
+    backtester = Backtester(data, strategy)
+    expected = backtester.run(persist=False)
+
+    incremental = IncrementalBacktester(strategy)
+    for bar in data.iter_rows(named=True):
+        incremental.update(bar)
+
+    columns = [
+        "Date",
+        "signal",
+        "positions",
+        "asset_returns",
+        "strategy_returns",
+        "cumulative_returns",
+        "equity_curve",
+    ]
+    assert incremental.results.equals(
+        expected.select(columns).cast({"signal": pl.Float64})
+    )
+    metrics = incremental.get_performance_metrics()
+    expected_metrics = backtester.get_performance_metrics()
+    assert metrics is not None and expected_metrics is not None
+    assert metrics == pytest.approx(expected_metrics, rel=1e-12)
+
+
+def test_incremental_backtest_extend_matches_updates(
+    random_walk_data: pl.DataFrame,
+) -> None:
+    """
+    Test that extending with several bars gives the same rows as updating
+    with one bar at a time.
+    """
+    data = random_walk_data.drop("Close_1", "Close_2")
+    strategy = MeanReversionStrategy({"window": 5, "std_dev": 0.5})
+
+    extended = IncrementalBacktester(strategy)
+    head = extended.extend(data.head(100))
+    tail = extended.extend(data.tail(200))
+    updated = IncrementalBacktester(strategy)
+    for bar in data.iter_rows(named=True):
+        updated.update(bar)
+
+    assert pl.concat([head, tail]).equals(updated.results)
+    assert extended.results.equals(updated.results)
+    assert extended.get_performance_metrics() == updated.get_performance_metrics()
+
+
+def test_incremental_backtest_without_bars_has_no_metrics() -> None:
+    """
+    Test that an incremental backtest has no metrics before any bars.
+    """
+    incremental = IncrementalBacktester(BuyAndHoldStrategy({}))
+
+    assert incremental.get_performance_metrics() is None
+    assert incremental.results.is_empty()
+
+
+def test_rolling_window_matches_polars() -> None:
+    """
+    Test that the rolling window statistics match the Polars rolling
+    functions, with missing values until the window is full.
+    """
+    values = [1.0, 4.0, 2.0, 8.0, 5.0, 7.0, 3.0]
+    window = RollingWindow(3)
+    sums, means, stds = [], [], []
+    for value in values:
+        window.push(value)
+        sums.append(window.sum())
+        means.append(window.mean())
+        stds.append(window.std())
+
+    series = pl.Series(values)
+    assert sums == series.rolling_sum(3).to_list()
+    assert means == series.rolling_mean(3).to_list()
+    assert stds == pytest.approx(series.rolling_std(3).to_list(), rel=1e-12)
+
+
+def test_rolling_window_skips_windows_with_missing_values() -> None:
+    """
+    Test that a window holding a missing value has no statistics, and that
+    they return once the missing value leaves the window.
+    """
+    window = RollingWindow(2)
+    for value in [1.0, None, 3.0]:
+        window.push(value)
+        assert window.mean() is None
+    window.push(5.0)
+
+    assert window.mean() == 4.0
+    assert window.std() == pytest.approx(math.sqrt(2))
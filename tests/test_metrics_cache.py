@@ -0,0 +1,185 @@
+"""
+Contains tests for the persistent backtest metrics cache.
+"""
+
+import datetime
+import math
+
+import numpy as np
+import polars as pl
+import pytest
+
+from quant_trading_strategy_backtester import optimiser_core
+from quant_trading_strategy_backtester.metrics_cache import (
+    MetricsCache,
+    canonical_params,
+)
+from quant_trading_strategy_backtester.optimiser_core import (
+    optimise_strategy_params,
+)
+from quant_trading_strategy_backtester.search import ParameterRanges, random_search
+
+PARAMETER_RANGES: ParameterRanges = {
+    "window": range(5, 30, 5),
+    "std_dev": [1.0, 1.5, 2.0],
+}
+
+
+@pytest.fixture
+def cache(tmp_path) -> MetricsCache:
+    return MetricsCache(tmp_path / "cache" / "metrics.db")
+
+
+@pytest.fixture
+def data() -> pl.DataFrame:
+    rng = np.random.default_rng(3)
+    return pl.DataFrame(
+        {
+            "Date": [
+                datetime.date(2020, 1, 1) + datetime.timedelta(days=i)
+                for i in range(150)
+            ],
+            "Close": 100 * np.cumprod(1 + rng.normal(0, 0.02, size=150)),
+        }
+    )
+
+
+@pytest.fixture
+def evaluated(monkeypatch) -> list[dict]:
+    """Record every combination the optimiser backtests."""
+    combinations: list[dict] = []
+    evaluate = optimiser_core.evaluate_param_combinations
+
+    def recording_evaluate(data, strategy_type, param_combinations, tickers):
+        combinations.extend(param_combinations)
+        return evaluate(data, strategy_type, param_combinations, tickers)
+
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.evaluate_param_combinations",
+        recording_evaluate,
+    )
+    return combinations
+
+
+def test_metrics_cache_round_trip(cache) -> None:
+    metrics = {"Sharpe Ratio": 1.25, "Sortino Ratio": float("nan")}
+
+    assert cache.get("abc", "Mean Reversion", {"window": 5}) is None
+    assert not cache.path.exists()
+
+    cache.put("abc", "Mean Reversion", {"window": 5, "std_dev": 1.0}, metrics)
+
+    cached = cache.get("abc", "Mean Reversion", {"std_dev": 1.0, "window": 5})
+    assert cached is not None
+    assert cached["Sharpe Ratio"] == 1.25
+    assert math.isnan(cached["Sortino Ratio"])
+    assert cache.get("abd", "Mean Reversion", {"window": 5, "std_dev": 1.0}) is None
+    assert cache.get("abc", "Pairs Trading", {"window": 5, "std_dev": 1.0}) is None
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_metrics_cache_persists_across_instances(cache) -> None:
+    cache.put_many(
+        "abc",
+        "Mean Reversion",
+        [{"window": 5}, {"window": 10}],
+        [{"Sharpe Ratio": 1.0}, {"Sharpe Ratio": 2.0}],
+    )
+
+    reopened = MetricsCache(cache.path)
+
+    assert reopened.get_many(
+        "abc", "Mean Reversion", [{"window": 10}, {"window": 15}, {"window": 5}]
+    ) == [{"Sharpe Ratio": 2.0}, None, {"Sharpe Ratio": 1.0}]
+
+
+def test_canonical_params_ignores_order_and_number_types() -> None:
+    assert canonical_params({"window": np.int64(20), "std_dev": 1.0}) == (
+        canonical_params({"std_dev": 1, "window": 20.0})
+    )
+    assert canonical_params({"std_dev": 1.5}) != canonical_params({"std_dev": 1.0})
+
+
+def test_optimise_strategy_params_reuses_cached_metrics(cache, data, evaluated) -> None:
+    expected = optimise_strategy_params(data, "Mean Reversion", PARAMETER_RANGES, "A")
+    evaluated.clear()
+
+    first = optimise_strategy_params(
+        data, "Mean Reversion", PARAMETER_RANGES, "A", cache=cache
+    )
+    assert len(evaluated) == 15
+    evaluated.clear()
+    second = optimise_strategy_params(
+        data, "Mean Reversion", PARAMETER_RANGES, "A", cache=cache
+    )
+
+    assert evaluated == []
+    assert first[0] == second[0] == expected[0]
+    assert second[1] == pytest.approx(expected[1], rel=0, abs=0, nan_ok=True)
+
+
+def test_optimise_strategy_params_resumes_from_partial_cache(
+    cache, data, evaluated
+) -> None:
+    # An earlier, interrupted run only evaluated the shortest window.
+    optimise_strategy_params(
+        data,
+        "Mean Reversion",
+        {"window": [5], "std_dev": PARAMETER_RANGES["std_dev"]},
+        "A",
+        cache=cache,
+    )
+    evaluated.clear()
+
+    params, _ = optimise_strategy_params(
+        data, "Mean Reversion", PARAMETER_RANGES, "A", cache=cache
+    )
+
+    assert len(evaluated) == 12
+    assert all(combination["window"] != 5 for combination in evaluated)
+    assert (
+        params
+        == optimise_strategy_params(data, "Mean Reversion", PARAMETER_RANGES, "A")[0]
+    )
+
+
+def test_cache_is_keyed_by_data_contents(cache, data, evaluated) -> None:
+    optimise_strategy_params(data, "Mean Reversion", PARAMETER_RANGES, "A", cache=cache)
+    evaluated.clear()
+
+    changed = data.with_columns(pl.col("Close") * 1.01)
+    optimise_strategy_params(
+        changed, "Mean Reversion", PARAMETER_RANGES, "A", cache=cache
+    )
+
+    assert len(evaluated) == 15
+
+
+def test_cache_is_keyed_by_version(cache) -> None:
+    params = {"window": 5}
+    cache.put("abc", "Mean Reversion", params, {"Sharpe Ratio": 1.0})
+
+    newer = MetricsCache(cache.path, version="newer")
+
+    assert newer.get("abc", "Mean Reversion", params) is None
+    assert len(newer) == 0
+    newer.put("abc", "Mean Reversion", params, {"Sharpe Ratio": 2.0})
+    assert cache.get("abc", "Mean Reversion", params) == {"Sharpe Ratio": 1.0}
+    assert newer.get("abc", "Mean Reversion", params) == {"Sharpe Ratio": 2.0}
+
+
+def test_search_counts_only_uncached_backtests(cache, data, evaluated) -> None:
+    first = random_search(
+        data, "Mean Reversion", PARAMETER_RANGES, "A", budget=8, seed=4, cache=cache
+    )
+    second = random_search(
+        data, "Mean Reversion", PARAMETER_RANGES, "A", budget=8, seed=4, cache=cache
+    )
+
+    assert first.num_backtests == 8
+    assert second.num_backtests == 1
+    assert second.params == first.params
+    assert len(evaluated) == 7
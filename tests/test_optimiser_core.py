@@ -5,10 +5,13 @@ Contains tests for optimisation functions.
 import datetime
 
 import polars as pl
+import pytest
 
+from quant_trading_strategy_backtester.models import StrategyModel
 from quant_trading_strategy_backtester.optimiser import (
     optimise_buy_and_hold_ticker,
     optimise_pairs_trading_tickers,
+    optimise_strategy_params,
     run_optimisation,
 )
 from quant_trading_strategy_backtester.strategy_preparation import (
@@ -17,6 +20,19 @@ from quant_trading_strategy_backtester.strategy_preparation import (
 )
 
 
+def _load_many_tickers_with(load_one_ticker):
+    """Build a mock of the batched loader from a mock of the per-ticker one."""
+
+    def load_many_tickers(tickers, *args, **kwargs):
+        frames = [
+            load_one_ticker(ticker).with_columns(pl.lit(ticker).alias("Ticker"))
+            for ticker in tickers
+        ]
+        return pl.concat([frame for frame in frames if not frame.is_empty()])
+
+    return load_many_tickers
+
+
 def test_optimise_buy_and_hold_ticker(monkeypatch):
     # Mock data and functions
     mock_top_companies = [("AAPL", 1000000.0), ("GOOGL", 900000.0), ("MSFT", 800000.0)]
@@ -27,14 +43,19 @@ def test_optimise_buy_and_hold_ticker(monkeypatch):
         }
     )
 
-    def mock_load_data(*args, **kwargs):
-        return mock_polars_data
+    def mock_load_data(tickers, *args, **kwargs):
+        return pl.concat(
+            [
+                mock_polars_data.with_columns(pl.lit(ticker).alias("Ticker"))
+                for ticker in tickers
+            ]
+        )
 
     def mock_run_backtest(*args, **kwargs):
         return None, {"Total Return": 0.3, "Sharpe Ratio": 1.5, "Max Drawdown": -0.1}
 
     monkeypatch.setattr(
-        "quant_trading_strategy_backtester.optimiser_core.load_yfinance_data_one_ticker",
+        "quant_trading_strategy_backtester.optimiser_core.load_yfinance_data_many_tickers",
         mock_load_data,
     )
     monkeypatch.setattr(
@@ -197,12 +218,48 @@ def test_optimise_pairs_trading_tickers(monkeypatch):
         mock_optimise_strategy_params,
     )
 
+    def mock_load_one_ticker(*args, **kwargs):
+        return pl.DataFrame(
+            {
+                "Date": [datetime.date(2020, 1, i) for i in range(1, 4)],
+                "Close": [100, 101, 102],
+            }
+        )
+
+    def mock_evaluate_pairs_grid(tickers, prices, ticker_pairs, param_combinations):
+        return pl.DataFrame(
+            [
+                {"Ticker 1": ticker1, "Ticker 2": ticker2, "Combination": i}
+                | params
+                | {"Sharpe Ratio": 1.8 if params["window"] == 25 else 1.2}
+                for ticker1, ticker2 in ticker_pairs
+                for i, params in enumerate(param_combinations)
+            ]
+        )
+
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.load_yfinance_data_many_tickers",
+        _load_many_tickers_with(mock_load_one_ticker),
+    )
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.evaluate_pairs_grid",
+        mock_evaluate_pairs_grid,
+    )
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.PERFORMANCE_METRICS",
+        ["Sharpe Ratio"],
+    )
+
     start_date = datetime.date(2020, 1, 1)
     end_date = datetime.date(2020, 12, 31)
     strategy_params = {"window": 20, "entry_z_score": 2.0, "exit_z_score": 0.5}
     # Test with optimisation
     best_pair, best_params, _ = optimise_pairs_trading_tickers(
-        mock_top_companies, start_date, end_date, strategy_params, True
+        mock_top_companies,
+        start_date,
+        end_date,
+        {"window": [20, 25], "entry_z_score": 2.5, "exit_z_score": 0.6},
+        True,
     )
 
     assert isinstance(best_pair, tuple)
@@ -326,3 +383,324 @@ def test_run_optimisation(monkeypatch):
     assert set(optimised_params.keys()) == set(initial_params.keys())
     assert isinstance(metrics, dict)
     assert "Sharpe Ratio" in metrics
+
+
+def test_optimise_strategy_params_saves_top_k(monkeypatch, mock_db_session):
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.backtester.is_running_locally", lambda: True
+    )
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.backtester.Session", lambda: mock_db_session
+    )
+    data = pl.DataFrame(
+        {
+            "Date": [
+                datetime.date(2020, 1, 1) + datetime.timedelta(days=i)
+                for i in range(60)
+            ],
+            "Close": [100 + (i % 7) - (i % 3) for i in range(60)],
+        }
+    )
+
+    best_params, metrics = optimise_strategy_params(
+        data,
+        "Mean Reversion",
+        {"window": [5, 10], "std_dev": [0.5, 1.0, 2.0]},
+        "AAPL",
+        save_top_k=3,
+    )
+
+    saved = mock_db_session.query(StrategyModel).all()
+    assert len(saved) == 3
+    assert max(s.sharpe_ratio for s in saved) == pytest.approx(metrics["Sharpe Ratio"])
+
+
+def test_optimise_strategy_params_in_parallel_matches_serial():
+    dates = [datetime.date(2020, 1, 1) + datetime.timedelta(days=i) for i in range(120)]
+    data = pl.DataFrame(
+        {
+            "Date": dates,
+            "Close_1": [100 + (i % 11) * 0.7 + i * 0.05 for i in range(120)],
+            "Close_2": [100 + (i % 5) * 0.3 + i * 0.04 for i in range(120)],
+        }
+    )
+    parameter_ranges = {
+        "window": range(10, 41, 10),
+        "entry_z_score": [1.0, 1.5, 2.0],
+        "exit_z_score": [0.1, 0.5],
+    }
+
+    serial = optimise_strategy_params(
+        data, "Pairs Trading", parameter_ranges, ["AAPL", "MSFT"]
+    )
+    parallel = optimise_strategy_params(
+        data,
+        "Pairs Trading",
+        parameter_ranges,
+        ["AAPL", "MSFT"],
+        n_jobs=2,
+        chunk_size=5,
+    )
+
+    assert parallel[0] == serial[0]
+    assert parallel[1] == pytest.approx(serial[1], rel=0, abs=0, nan_ok=True)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 3])
+def test_optimise_strategy_params_lazy_matches_batch(chunk_size):
+    dates = [datetime.date(2020, 1, 1) + datetime.timedelta(days=i) for i in range(90)]
+    data = pl.DataFrame(
+        {
+            "Date": dates,
+            "Close": [100 + (i % 9) * 1.3 + i * 0.05 for i in range(90)],
+        }
+    )
+    parameter_ranges = {"window": range(5, 30, 5), "std_dev": [1.0, 1.5, 2.0]}
+
+    batch = optimise_strategy_params(data, "Mean Reversion", parameter_ranges, "AAPL")
+    lazy = optimise_strategy_params(
+        data,
+        "Mean Reversion",
+        parameter_ranges,
+        "AAPL",
+        chunk_size=chunk_size,
+        lazy=True,
+    )
+
+    assert lazy[0] == batch[0]
+    assert lazy[1] == pytest.approx(batch[1], rel=0, abs=0, nan_ok=True)
+
+
+def test_optimise_strategy_params_reports_progress_per_chunk():
+    reports: list[tuple[float, str]] = []
+    data = pl.DataFrame(
+        {
+            "Date": [
+                datetime.date(2020, 1, 1) + datetime.timedelta(days=i)
+                for i in range(60)
+            ],
+            "Close": [100 + (i % 7) * 1.5 + i * 0.1 for i in range(60)],
+        }
+    )
+
+    optimise_strategy_params(
+        data,
+        "Mean Reversion",
+        {"window": range(5, 25), "std_dev": [1.0, 2.0]},
+        "AAPL",
+        progress=lambda fraction, message: reports.append((fraction, message)),
+    )
+
+    # The 40 combinations are evaluated in several chunks rather than one.
+    fractions = [fraction for fraction, _ in reports]
+    assert len(fractions) > 2
+    assert fractions == sorted(fractions)
+    assert fractions[-1] == 1
+    assert reports[-1][1] == "Evaluated parameter combination 40 / 40"
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_optimise_strategy_params_rejects_invalid_chunk_size(
+    mock_polars_data, chunk_size
+):
+    with pytest.raises(ValueError, match="chunk_size must be positive"):
+        optimise_strategy_params(
+            mock_polars_data,
+            "Mean Reversion",
+            {"window": range(5, 10), "std_dev": [1.0]},
+            "AAPL",
+            chunk_size=chunk_size,
+        )
+
+
+def test_optimise_pairs_trading_tickers_in_parallel_matches_serial(monkeypatch):
+    # GOOG and GOOGL share prices, so optimising that pair finds no Sharpe
+    # ratio and both modes must skip it.
+    mock_top_companies = [
+        ("AAPL", 5.0),
+        ("MSFT", 4.0),
+        ("GOOG", 3.0),
+        ("GOOGL", 2.0),
+        ("AMZN", 1.0),
+    ]
+    dates = [datetime.date(2020, 1, 1) + datetime.timedelta(days=i) for i in range(90)]
+    seeds = {"AAPL": 3, "MSFT": 5, "GOOG": 7, "GOOGL": 7, "AMZN": 11}
+
+    def mock_load_one_ticker(ticker, *args, **kwargs):
+        seed = seeds[ticker]
+        return pl.DataFrame(
+            {
+                "Date": dates,
+                "Close": [100 + ((i * seed) % 13) * 0.5 + i * 0.1 for i in range(90)],
+            }
+        )
+
+    def mock_load_two_tickers(ticker1, ticker2, *args, **kwargs):
+        return pl.DataFrame(
+            {
+                "Date": dates,
+                "Close_1": mock_load_one_ticker(ticker1)["Close"],
+                "Close_2": mock_load_one_ticker(ticker2)["Close"],
+            }
+        )
+
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.load_yfinance_data_many_tickers",
+        _load_many_tickers_with(mock_load_one_ticker),
+    )
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.load_yfinance_data_two_tickers",
+        mock_load_two_tickers,
+    )
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.get_company_identity_index",
+        lambda tickers: {ticker: ticker for ticker in tickers},
+    )
+
+    start_date = datetime.date(2020, 1, 1)
+    end_date = datetime.date(2020, 3, 31)
+    for optimise, strategy_params in [
+        (False, {"window": 20, "entry_z_score": 1.5, "exit_z_score": 0.5}),
+        (
+            True,
+            {"window": [10, 20], "entry_z_score": [1.0, 2.0], "exit_z_score": 0.5},
+        ),
+    ]:
+        serial = optimise_pairs_trading_tickers(
+            mock_top_companies, start_date, end_date, strategy_params, optimise
+        )
+        parallel = optimise_pairs_trading_tickers(
+            mock_top_companies,
+            start_date,
+            end_date,
+            strategy_params,
+            optimise,
+            n_jobs=2,
+        )
+        assert parallel[:2] == serial[:2]
+        assert parallel[2] == pytest.approx(serial[2], rel=0, abs=0, nan_ok=True)
+
+
+def test_optimise_pairs_trading_tickers_matches_per_pair_optimisation(monkeypatch):
+    mock_top_companies = [("AAPL", 4.0), ("MSFT", 3.0), ("AMZN", 2.0), ("NVDA", 1.0)]
+    dates = [datetime.date(2020, 1, 1) + datetime.timedelta(days=i) for i in range(80)]
+    seeds = {"AAPL": 3, "MSFT": 5, "AMZN": 11, "NVDA": 4}
+
+    def mock_load_one_ticker(ticker, *args, **kwargs):
+        seed = seeds[ticker]
+        data = pl.DataFrame(
+            {
+                "Date": dates,
+                "Close": [100 + ((i * seed) % 13) * 0.5 + i * 0.1 for i in range(80)],
+            }
+        )
+        # NVDA starts trading later, so its pairs use fewer dates.
+        return data.slice(15) if ticker == "NVDA" else data
+
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.load_yfinance_data_many_tickers",
+        _load_many_tickers_with(mock_load_one_ticker),
+    )
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.get_company_identity_index",
+        lambda tickers: {ticker: ticker for ticker in tickers},
+    )
+
+    parameter_ranges = {
+        "window": [5, 10, 20],
+        "entry_z_score": [1.0, 1.5, 2.0],
+        "exit_z_score": [0.25, 0.5],
+    }
+    best_pair, best_params, best_metrics = optimise_pairs_trading_tickers(
+        mock_top_companies,
+        datetime.date(2020, 1, 1),
+        datetime.date(2020, 3, 31),
+        parameter_ranges,
+        True,
+    )
+
+    expected = None
+    for ticker1, ticker2 in [
+        ("AAPL", "MSFT"),
+        ("AAPL", "AMZN"),
+        ("AAPL", "NVDA"),
+        ("MSFT", "AMZN"),
+        ("MSFT", "NVDA"),
+        ("AMZN", "NVDA"),
+    ]:
+        data = (
+            mock_load_one_ticker(ticker1)
+            .rename({"Close": "Close_1"})
+            .join(
+                mock_load_one_ticker(ticker2).rename({"Close": "Close_2"}),
+                on="Date",
+            )
+            .with_columns(pl.col("Close_1", "Close_2").cast(pl.Float64))
+        )
+        params, metrics = optimise_strategy_params(
+            data, "Pairs Trading", parameter_ranges, [ticker1, ticker2]
+        )
+        if expected is None or metrics["Sharpe Ratio"] > expected[2]["Sharpe Ratio"]:
+            expected = ((ticker1, ticker2), params, metrics)
+
+    assert expected is not None
+    assert (best_pair, best_params) == expected[:2]
+    assert best_metrics == pytest.approx(expected[2], rel=0, abs=0, nan_ok=True)
+
+
+def test_optimise_pairs_trading_tickers_only_backtests_screened_pairs(monkeypatch):
+    mock_top_companies = [("AAPL", 4.0), ("MSFT", 3.0), ("AMZN", 2.0), ("NVDA", 1.0)]
+    dates = [datetime.date(2020, 1, 1) + datetime.timedelta(days=i) for i in range(80)]
+    seeds = {"AAPL": 3, "MSFT": 5, "AMZN": 11, "NVDA": 4}
+
+    def mock_load_one_ticker(ticker, *args, **kwargs):
+        seed = seeds[ticker]
+        return pl.DataFrame(
+            {
+                "Date": dates,
+                "Close": [100 + ((i * seed) % 13) * 0.5 + i * 0.1 for i in range(80)],
+            }
+        )
+
+    screened = []
+    loaded = []
+    load_many_tickers = _load_many_tickers_with(mock_load_one_ticker)
+
+    def mock_screen_pairs(tickers, prices, ticker_pairs, top_k, method):
+        screened.append((len(ticker_pairs), top_k, method))
+        return [("MSFT", "NVDA")]
+
+    def mock_load_many_tickers(tickers, *args, **kwargs):
+        loaded.append(tickers)
+        return load_many_tickers(tickers)
+
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.load_yfinance_data_many_tickers",
+        mock_load_many_tickers,
+    )
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.get_company_identity_index",
+        lambda tickers: {ticker: ticker for ticker in tickers},
+    )
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.optimiser_core.screen_pairs",
+        mock_screen_pairs,
+    )
+
+    for optimise, strategy_params in [
+        (False, {"window": 10, "entry_z_score": 1.0, "exit_z_score": 0.5}),
+        (True, {"window": [5, 10], "entry_z_score": [1.0, 2.0], "exit_z_score": 0.5}),
+    ]:
+        best_pair, _, _ = optimise_pairs_trading_tickers(
+            mock_top_companies,
+            datetime.date(2020, 1, 1),
+            datetime.date(2020, 3, 31),
+            strategy_params,
+            optimise,
+            screen_top_k=1,
+            screen_method="cointegration",
+        )
+        assert best_pair == ("MSFT", "NVDA")
+    assert screened == [(6, 1, "cointegration")] * 2
+    # Every ticker is loaded in one batched request per search.
+    assert loaded == [["AAPL", "MSFT", "AMZN", "NVDA"]] * 2
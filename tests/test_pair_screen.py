@@ -0,0 +1,102 @@
+"""
+Contains tests for the correlation and cointegration pair screen.
+"""
+
+import numpy as np
+import pytest
+
+from quant_trading_strategy_backtester.pair_screen import (
+    engle_granger_statistics,
+    return_correlation_matrix,
+    screen_pairs,
+)
+
+TICKERS = ["AAPL", "MSFT", "AMZN", "NVDA"]
+
+
+def _prices() -> np.ndarray:
+    rng = np.random.default_rng(11)
+    base = 100 * np.cumprod(1 + rng.normal(0, 0.02, size=120))
+    noise = rng.normal(0, 0.01, size=(120, 4))
+    prices = np.column_stack(
+        [
+            base * (1 + noise[:, 0]),
+            # MSFT tracks AAPL closely, AMZN loosely and NVDA not at all.
+            base * (1 + 0.2 * noise[:, 1]),
+            0.5 * base + 50 * np.cumprod(1 + rng.normal(0, 0.02, size=120)),
+            100 * np.cumprod(1 + rng.normal(0, 0.02, size=120)),
+        ]
+    )
+    prices[:10, 3] = np.nan
+    prices[40:43, 2] = np.nan
+    return prices
+
+
+def test_return_correlation_matrix_matches_pairwise_correlation() -> None:
+    prices = _prices()
+
+    correlation = return_correlation_matrix(prices)
+
+    returns = (prices[1:] - prices[:-1]) / prices[:-1]
+    for i in range(len(TICKERS)):
+        for j in range(len(TICKERS)):
+            both = np.isfinite(returns[:, i]) & np.isfinite(returns[:, j])
+            expected = np.corrcoef(returns[both, i], returns[both, j])[0, 1]
+            assert correlation[i, j] == pytest.approx(expected, abs=1e-12)
+
+
+def test_return_correlation_matrix_is_nan_for_constant_returns() -> None:
+    prices = _prices()
+    prices[:, 1] = 50.0
+
+    correlation = return_correlation_matrix(prices)
+
+    assert np.isnan(correlation[0, 1])
+    assert np.isnan(correlation[1, 1])
+    assert not np.isnan(correlation[0, 2])
+
+
+def test_engle_granger_statistics_match_direct_regression() -> None:
+    prices = _prices()
+    column_pairs = [(0, 1), (0, 3), (2, 3), (1, 2)]
+
+    statistics = engle_granger_statistics(prices, column_pairs)
+
+    for (column1, column2), statistic in zip(column_pairs, statistics):
+        both = np.isfinite(prices[:, column1]) & np.isfinite(prices[:, column2])
+        y, x = prices[both, column1], prices[both, column2]
+        design = np.column_stack([np.ones(len(x)), x])
+        residuals = y - design @ np.linalg.lstsq(design, y, rcond=None)[0]
+        lagged, changes = residuals[:-1], np.diff(residuals)
+        gamma = lagged @ changes / (lagged @ lagged)
+        variance = np.sum((changes - gamma * lagged) ** 2) / (len(changes) - 1)
+        expected = gamma / np.sqrt(variance / (lagged @ lagged))
+        assert statistic == pytest.approx(expected, rel=1e-9)
+
+
+def test_screen_pairs_keeps_most_correlated_pairs_in_order() -> None:
+    ticker_pairs = [
+        ("AAPL", "NVDA"),
+        ("AAPL", "MSFT"),
+        ("AMZN", "TSLA"),
+        ("AAPL", "AMZN"),
+        ("MSFT", "NVDA"),
+    ]
+
+    kept = screen_pairs(TICKERS, _prices(), ticker_pairs, top_k=2)
+
+    assert kept == [("AAPL", "MSFT"), ("AAPL", "AMZN")]
+
+
+def test_screen_pairs_by_cointegration() -> None:
+    prices = _prices()
+    ticker_pairs = [("AAPL", "NVDA"), ("AAPL", "MSFT"), ("AMZN", "NVDA")]
+
+    kept = screen_pairs(TICKERS, prices, ticker_pairs, 1, method="cointegration")
+
+    assert kept == [("AAPL", "MSFT")]
+
+
+def test_screen_pairs_rejects_unknown_method() -> None:
+    with pytest.raises(ValueError, match="Unknown screen method"):
+        screen_pairs(TICKERS, _prices(), [("AAPL", "MSFT")], 1, method="distance")
@@ -0,0 +1,101 @@
+"""
+Contains tests for the all-pairs, all-parameters pairs trading grid.
+"""
+
+import datetime
+import itertools
+
+import numpy as np
+import polars as pl
+import pytest
+
+from quant_trading_strategy_backtester import pairs_grid
+from quant_trading_strategy_backtester.backtester import PERFORMANCE_METRICS
+from quant_trading_strategy_backtester.optimiser_core import (
+    evaluate_param_combinations,
+)
+from quant_trading_strategy_backtester.pairs_grid import evaluate_pairs_grid
+from quant_trading_strategy_backtester.price_matrix import get_pair_data
+
+TICKERS = ["AAPL", "MSFT", "AMZN", "NVDA"]
+PARAM_COMBINATIONS = [
+    {"window": window, "entry_z_score": entry, "exit_z_score": exit_}
+    for window, entry, exit_ in itertools.product([5, 10], [1.0, 2.0], [0.25, 0.5])
+]
+
+
+def _prices() -> np.ndarray:
+    rng = np.random.default_rng(7)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.02, size=(70, len(TICKERS))), axis=0)
+    # NVDA starts later and AMZN has a gap, so the pairs use different dates.
+    prices[:12, 3] = np.nan
+    prices[30:33, 2] = np.nan
+    return prices
+
+
+def _dates() -> pl.Series:
+    return pl.Series(
+        "Date",
+        [datetime.date(2020, 1, 1) + datetime.timedelta(days=i) for i in range(70)],
+    )
+
+
+def test_evaluate_pairs_grid_matches_per_pair_evaluation() -> None:
+    prices = _prices()
+    ticker_pairs = list(itertools.combinations(TICKERS, 2))
+
+    grid = evaluate_pairs_grid(TICKERS, prices, ticker_pairs, PARAM_COMBINATIONS)
+
+    assert grid.height == len(ticker_pairs) * len(PARAM_COMBINATIONS)
+    for (ticker1, ticker2), rows in zip(
+        ticker_pairs, grid.iter_slices(len(PARAM_COMBINATIONS))
+    ):
+        assert rows["Ticker 1"].unique().to_list() == [ticker1]
+        assert rows["Ticker 2"].unique().to_list() == [ticker2]
+        assert rows["Combination"].to_list() == list(range(len(PARAM_COMBINATIONS)))
+        assert rows.select("window", "entry_z_score", "exit_z_score").to_dicts() == (
+            PARAM_COMBINATIONS
+        )
+        data = get_pair_data(
+            _dates(), prices, TICKERS.index(ticker1), TICKERS.index(ticker2)
+        )
+        expected = evaluate_param_combinations(
+            data, "Pairs Trading", PARAM_COMBINATIONS, [ticker1, ticker2]
+        )
+        for metrics, expected_metrics in zip(
+            rows.select(PERFORMANCE_METRICS).to_dicts(), expected
+        ):
+            assert metrics == pytest.approx(expected_metrics, nan_ok=True)
+
+
+def test_evaluate_pairs_grid_is_independent_of_block_size(monkeypatch) -> None:
+    prices = _prices()
+    ticker_pairs = list(itertools.combinations(TICKERS, 2))
+    expected = evaluate_pairs_grid(TICKERS, prices, ticker_pairs, PARAM_COMBINATIONS)
+
+    # Force one pair per block.
+    monkeypatch.setattr(pairs_grid, "MAX_BLOCK_ELEMENTS", 1)
+    grid = evaluate_pairs_grid(TICKERS, prices, ticker_pairs, PARAM_COMBINATIONS)
+
+    assert grid.equals(expected)
+
+
+def test_evaluate_pairs_grid_skips_pairs_without_data() -> None:
+    prices = _prices()
+    prices[:, 1] = np.nan
+
+    grid = evaluate_pairs_grid(
+        TICKERS,
+        prices,
+        [("AAPL", "MSFT"), ("AAPL", "TSLA"), ("AAPL", "AMZN")],
+        PARAM_COMBINATIONS,
+    )
+
+    assert grid.select("Ticker 1", "Ticker 2").unique().rows() == [("AAPL", "AMZN")]
+
+
+def test_evaluate_pairs_grid_without_pairs() -> None:
+    grid = evaluate_pairs_grid(TICKERS, _prices(), [], PARAM_COMBINATIONS)
+
+    assert grid.is_empty()
+    assert {"Ticker 1", "Ticker 2", *PERFORMANCE_METRICS} <= set(grid.columns)
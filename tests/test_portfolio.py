@@ -0,0 +1,236 @@
+"""
+Contains tests for the portfolio backtester.
+"""
+
+import datetime
+import math
+
+import numpy as np
+import polars as pl
+import pytest
+
+from quant_trading_strategy_backtester.backtester import Backtester
+from quant_trading_strategy_backtester.portfolio import PortfolioBacktester
+from quant_trading_strategy_backtester.strategies.buy_and_hold import (
+    BuyAndHoldStrategy,
+)
+from quant_trading_strategy_backtester.strategies.mean_reversion import (
+    MeanReversionStrategy,
+)
+from quant_trading_strategy_backtester.strategies.moving_average_crossover import (
+    MovingAverageCrossoverStrategy,
+)
+from quant_trading_strategy_backtester.strategies.pairs_trading import (
+    PairsTradingStrategy,
+)
+
+
+@pytest.fixture
+def long_price_data() -> pl.DataFrame:
+    rng = np.random.default_rng(1)
+    frames = []
+    # The tickers cover different dates, and are not sorted.
+    for ticker, first_day, num_days in [
+        ("MSFT", 0, 200),
+        ("AAPL", 0, 200),
+        ("GOOG", 50, 150),
+    ]:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, num_days)))
+        frames.append(
+            pl.DataFrame(
+                {
+                    "Date": [
+                        datetime.date(2020, 1, 1)
+                        + datetime.timedelta(days=first_day + i)
+                        for i in range(num_days)
+                    ],
+                    "Ticker": ticker,
+                    "High": close * 1.01,
+                    "Low": close * 0.99,
+                    "Close": close,
+                }
+            )
+        )
+    return pl.concat(frames)
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        BuyAndHoldStrategy({}),
+        MeanReversionStrategy({"window": 10, "std_dev": 1.0}),
+        MovingAverageCrossoverStrategy({}),
+    ],
+)
+def test_portfolio_ticker_results_match_single_ticker_backtests(
+    long_price_data: pl.DataFrame, strategy
+) -> None:
+    """
+    Test that each ticker of a portfolio is backtested as it would be alone.
+    """
+    portfolio = PortfolioBacktester(long_price_data, strategy)
+    portfolio.run()
+    assert portfolio.ticker_results is not None
+
+    for ticker in ["AAPL", "GOOG", "MSFT"]:
+        expected = Backtester(
+            long_price_data.filter(pl.col("Ticker") == ticker).drop("Ticker"), strategy
+        ).run(persist=False)
+        actual = portfolio.ticker_results.filter(pl.col("Ticker") == ticker)
+        for column in ["positions", "asset_returns", "strategy_returns"]:
+            assert actual[column].equals(expected[column])
+
+
+def test_portfolio_returns_are_weighted_sums(long_price_data: pl.DataFrame) -> None:
+    """
+    Test that the portfolio return of each date is the weighted sum of the
+    strategy returns of the tickers priced on it, and that tickers without a
+    weight are left out.
+    """
+    strategy = MeanReversionStrategy({"window": 5, "std_dev": 0.5})
+    weights = {"AAPL": 0.75, "GOOG": 0.25}
+    portfolio = PortfolioBacktester(
+        long_price_data, strategy, weights=weights, initial_capital=1000.0
+    )
+    results = portfolio.run()
+
+    ticker_returns = {
+        ticker: Backtester(
+            long_price_data.filter(pl.col("Ticker") == ticker).drop("Ticker"), strategy
+        )
+        .run(persist=False)
+        .select("Date", pl.col("strategy_returns") * weight)
+        for ticker, weight in weights.items()
+    }
+    expected = (
+        pl.concat(ticker_returns.values())
+        .group_by("Date")
+        .agg(pl.col("strategy_returns").sum())
+        .sort("Date")
+    )
+    assert results["Date"].equals(expected["Date"])
+    assert results["strategy_returns"].to_list() == pytest.approx(
+        expected["strategy_returns"].to_list()
+    )
+    assert results["equity_curve"][-1] == pytest.approx(
+        1000.0 * (1 + expected["strategy_returns"]).product()
+    )
+    metrics = portfolio.get_performance_metrics()
+    assert metrics is not None
+    assert metrics["Total Return"] == pytest.approx(
+        results["cumulative_returns"][-1] - 1
+    )
+
+
+def test_portfolio_ticker_plan_keeps_ticker_and_date_order(
+    long_price_data: pl.DataFrame,
+) -> None:
+    """
+    Test that the per-ticker results are sorted by ticker and date, with each
+    ticker's weight, whatever the order of the rows and weights.
+    """
+    weights = {"MSFT": 0.5, "GOOG": 0.3, "AAPL": 0.2}
+    portfolio = PortfolioBacktester(
+        long_price_data.sample(fraction=1.0, shuffle=True, seed=2),
+        MeanReversionStrategy({"window": 5, "std_dev": 0.5}),
+        weights=weights,
+    )
+
+    ticker_results = portfolio.build_ticker_plan().collect()
+
+    assert ticker_results.equals(ticker_results.sort("Ticker", "Date"))
+    assert (
+        ticker_results["Ticker"]
+        .replace_strict(weights)
+        .equals(ticker_results["weight"])
+    )
+
+
+def test_portfolio_results_do_not_depend_on_row_order(
+    long_price_data: pl.DataFrame,
+) -> None:
+    """
+    Test that the portfolio results and ticker scores are the same when the
+    tickers and dates are given out of order.
+    """
+    strategy = MeanReversionStrategy({"window": 5, "std_dev": 0.5})
+    weights = {"GOOG": 0.25, "AAPL": 0.75}
+    shuffled = long_price_data.sample(fraction=1.0, shuffle=True, seed=3)
+
+    expected = PortfolioBacktester(long_price_data, strategy, weights=weights)
+    actual = PortfolioBacktester(shuffled, strategy, weights=weights)
+
+    assert actual.run().equals(expected.run())
+    assert actual.get_performance_metrics() == pytest.approx(
+        expected.get_performance_metrics(), nan_ok=True
+    )
+    expected_scores = PortfolioBacktester(long_price_data, strategy).score_tickers()
+    actual_scores = PortfolioBacktester(shuffled, strategy).score_tickers()
+    assert actual_scores["Ticker"].equals(expected_scores["Ticker"])
+    for actual_row, expected_row in zip(
+        actual_scores.iter_rows(named=True), expected_scores.iter_rows(named=True)
+    ):
+        assert actual_row == pytest.approx(expected_row, nan_ok=True)
+
+
+def test_portfolio_defaults_to_equal_weights(long_price_data: pl.DataFrame) -> None:
+    portfolio = PortfolioBacktester(long_price_data, BuyAndHoldStrategy({}))
+
+    assert portfolio.weights == pytest.approx(
+        {"MSFT": 1 / 3, "AAPL": 1 / 3, "GOOG": 1 / 3}
+    )
+    assert portfolio.get_performance_metrics() is None
+
+
+def test_portfolio_rejects_unpartitionable_strategies(
+    long_price_data: pl.DataFrame,
+) -> None:
+    strategy = PairsTradingStrategy(
+        {"window": 10, "entry_z_score": 1.0, "exit_z_score": 0.5}
+    )
+    with pytest.raises(ValueError):
+        PortfolioBacktester(long_price_data, strategy).run()
+    with pytest.raises(ValueError):
+        PortfolioBacktester(long_price_data.drop("Ticker"), strategy)
+
+
+def test_score_tickers_ranks_tickers_by_their_backtests(
+    long_price_data: pl.DataFrame,
+) -> None:
+    """
+    Test that scoring the tickers gives each ticker's backtest metrics, from
+    the best to the worst, with NaN scores last.
+    """
+    flat = pl.DataFrame(
+        {
+            "Date": [
+                datetime.date(2020, 1, 1) + datetime.timedelta(days=i)
+                for i in range(30)
+            ],
+            "Ticker": "FLAT",
+            "High": 10.0,
+            "Low": 10.0,
+            "Close": 10.0,
+        }
+    )
+    data = pl.concat([flat, long_price_data])
+    strategy = MeanReversionStrategy({"window": 10, "std_dev": 1.0})
+
+    rankings = PortfolioBacktester(data, strategy).score_tickers()
+
+    assert rankings["Ticker"][-1] == "FLAT"
+    assert math.isnan(rankings["Sharpe Ratio"][-1])
+    sharpe_ratios = rankings["Sharpe Ratio"].head(3).to_list()
+    assert sharpe_ratios == sorted(sharpe_ratios, reverse=True)
+    for metrics in rankings.head(3).iter_rows(named=True):
+        backtester = Backtester(
+            data.filter(pl.col("Ticker") == metrics["Ticker"]).drop("Ticker"), strategy
+        )
+        backtester.run(persist=False)
+        expected = backtester.get_performance_metrics()
+        assert {k: v for k, v in metrics.items() if k != "Ticker"} == pytest.approx(
+            expected, rel=1e-12
+        )
+
+    with pytest.raises(ValueError):
+        PortfolioBacktester(data, strategy).score_tickers("Unknown")
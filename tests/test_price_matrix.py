@@ -0,0 +1,50 @@
+"""
+Contains tests for the aligned and shared price matrix helpers.
+"""
+
+import datetime
+
+import numpy as np
+import polars as pl
+
+from quant_trading_strategy_backtester.price_matrix import (
+    SharedPriceMatrix,
+    build_price_matrix,
+    get_pair_data,
+)
+
+
+def test_build_price_matrix_aligns_dates() -> None:
+    day = [datetime.date(2020, 1, i) for i in range(1, 5)]
+    dates, prices = build_price_matrix(
+        {
+            "AAPL": pl.DataFrame({"Date": day[:3], "Close": [1.0, 2.0, 3.0]}),
+            "MSFT": pl.DataFrame({"Date": day[1:], "Close": [20.0, 30.0, 40.0]}),
+        }
+    )
+
+    assert dates.to_list() == day
+    np.testing.assert_array_equal(
+        prices,
+        [[1.0, np.nan], [2.0, 20.0], [3.0, 30.0], [np.nan, 40.0]],
+    )
+
+    pair_data = get_pair_data(dates, prices, 0, 1)
+    assert pair_data.columns == ["Date", "Close_1", "Close_2"]
+    assert pair_data["Date"].to_list() == day[1:3]
+    assert pair_data["Close_2"].to_list() == [20.0, 30.0]
+
+
+def test_shared_price_matrix_round_trip() -> None:
+    prices = np.arange(12.0).reshape(4, 3)
+    shared = SharedPriceMatrix.create(prices)
+    try:
+        attached = SharedPriceMatrix.attach(shared.name, shared.shape)
+        np.testing.assert_array_equal(attached.array, prices)
+        # Both views read the same memory.
+        shared.array[0, 0] = -1.0
+        assert attached.array[0, 0] == -1.0
+        attached.close()
+    finally:
+        shared.close()
+        shared.unlink()
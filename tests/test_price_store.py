@@ -0,0 +1,98 @@
+"""
+Contains tests for the on-disk price store.
+"""
+
+import datetime
+
+import polars as pl
+import pytest
+
+from quant_trading_strategy_backtester.price_store import PriceStore
+
+
+class RecordingFetcher:
+    """Returns a daily price series and records each requested range."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[datetime.date, datetime.date]] = []
+
+    def __call__(
+        self, ticker: str, start_date: datetime.date, end_date: datetime.date
+    ) -> pl.DataFrame:
+        self.requests.append((start_date, end_date))
+        dates = pl.date_range(start_date, end_date, eager=True)
+        return pl.DataFrame(
+            {
+                "Date": dates.cast(pl.Datetime("ns")),
+                "Close": [float(date.toordinal()) for date in dates],
+            }
+        )
+
+
+@pytest.fixture
+def store(tmp_path) -> PriceStore:
+    return PriceStore(tmp_path)
+
+
+def test_price_store_serves_repeat_and_sub_ranges_locally(store):
+    fetch = RecordingFetcher()
+    start, end = datetime.date(2020, 1, 1), datetime.date(2020, 1, 31)
+
+    first = store.load("AAPL", start, end, fetch)
+    again = store.load("AAPL", start, end, fetch)
+    sub_range = store.load(
+        "AAPL", datetime.date(2020, 1, 10), datetime.date(2020, 1, 20), fetch
+    )
+
+    assert fetch.requests == [(start, end)]
+    assert len(first) == 31
+    assert again.equals(first)
+    assert len(sub_range) == 11
+    assert sub_range["Date"].cast(pl.Date).min() == datetime.date(2020, 1, 10)
+
+
+def test_price_store_fetches_only_missing_head_and_tail(store):
+    fetch = RecordingFetcher()
+    store.load("AAPL", datetime.date(2020, 1, 10), datetime.date(2020, 1, 20), fetch)
+
+    data = store.load(
+        "AAPL", datetime.date(2020, 1, 1), datetime.date(2020, 1, 31), fetch
+    )
+
+    assert fetch.requests[1:] == [
+        (datetime.date(2020, 1, 1), datetime.date(2020, 1, 9)),
+        (datetime.date(2020, 1, 21), datetime.date(2020, 1, 31)),
+    ]
+    assert len(data) == 31
+    assert data["Date"].is_sorted()
+    assert data["Date"].n_unique() == 31
+
+
+def test_price_store_does_not_store_failed_downloads(store):
+    def fetch_nothing(ticker, start_date, end_date):
+        return pl.DataFrame()
+
+    fetch = RecordingFetcher()
+    start, end = datetime.date(2020, 1, 1), datetime.date(2020, 1, 31)
+
+    assert store.load("AAPL", start, end, fetch_nothing).is_empty()
+    assert len(store.load("AAPL", start, end, fetch)) == 31
+    assert fetch.requests == [(start, end)]
+
+
+def test_price_store_retries_ranges_of_failed_downloads(store):
+    def fetch_nothing(ticker, start_date, end_date):
+        return pl.DataFrame()
+
+    fetch = RecordingFetcher()
+    january = (datetime.date(2020, 1, 1), datetime.date(2020, 1, 31))
+    store.load("AAPL", *january, fetch)
+
+    failed = store.load("AAPL", january[0], datetime.date(2020, 3, 31), fetch_nothing)
+
+    assert len(failed) == 31
+    assert store.missing_ranges("AAPL", january[0], datetime.date(2020, 3, 31)) == [
+        (datetime.date(2020, 2, 1), datetime.date(2020, 3, 31))
+    ]
+    data = store.load("AAPL", january[0], datetime.date(2020, 3, 31), fetch)
+    assert len(data) == 91
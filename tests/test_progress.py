@@ -0,0 +1,72 @@
+"""
+Contains tests for the progress reporting of the optimisers.
+"""
+
+import pytest
+
+from quant_trading_strategy_backtester import optimiser_core
+from quant_trading_strategy_backtester.progress import ThrottledProgress
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_throttled_progress_limits_reports_by_time() -> None:
+    reports: list[float] = []
+    clock = FakeClock()
+    progress = ThrottledProgress(
+        lambda fraction, _: reports.append(fraction), min_interval=1.0, clock=clock
+    )
+
+    for i in range(1, 10):
+        progress(i / 10, "")
+        clock.now += 0.25
+
+    # The first report, then one every four reports as a second passes.
+    assert reports == [0.1, 0.5, 0.9]
+
+
+def test_throttled_progress_forwards_every_nth_report() -> None:
+    reports: list[float] = []
+    progress = ThrottledProgress(
+        lambda fraction, _: reports.append(fraction),
+        min_interval=float("inf"),
+        every=3,
+        clock=FakeClock(),
+    )
+
+    for i in range(1, 8):
+        progress(i / 10, "")
+
+    assert reports == [0.1, 0.4, 0.7]
+
+
+def test_throttled_progress_always_forwards_completion() -> None:
+    reports: list[tuple[float, str]] = []
+    progress = ThrottledProgress(
+        lambda fraction, message: reports.append((fraction, message)),
+        min_interval=float("inf"),
+        clock=FakeClock(),
+    )
+
+    progress(0.0, "Starting")
+    progress(0.5, "Halfway")
+    progress(1.0, "Done")
+
+    assert reports == [(0.0, "Starting"), (1.0, "Done")]
+
+
+def test_throttled_progress_rejects_invalid_count() -> None:
+    with pytest.raises(ValueError, match="every must be positive"):
+        ThrottledProgress(lambda *_: None, every=0)
+
+
+def test_optimiser_core_does_not_depend_on_streamlit() -> None:
+    assert not hasattr(optimiser_core, "st")
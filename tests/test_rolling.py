@@ -0,0 +1,52 @@
+"""
+Contains tests for the prefix-sum rolling statistics engine.
+"""
+
+import numpy as np
+import polars as pl
+import pytest
+
+from quant_trading_strategy_backtester.rolling import RollingStatistics
+
+
+@pytest.mark.parametrize("window", [1, 2, 5, 20])
+def test_rolling_statistics_match_polars(window: int) -> None:
+    rng = np.random.default_rng(0)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 200)))
+    series = pl.Series(values)
+    stats = RollingStatistics(values)
+
+    expected_mean = series.rolling_mean(window, min_samples=window).to_numpy()
+    expected_std = series.rolling_std(window, min_samples=window).to_numpy()
+
+    np.testing.assert_allclose(stats.mean(window), expected_mean, rtol=1e-9)
+    np.testing.assert_allclose(
+        stats.std(window), expected_std, rtol=1e-6, equal_nan=True
+    )
+
+
+def test_rolling_statistics_with_missing_values() -> None:
+    values = np.array([1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0])
+    stats = RollingStatistics(values)
+
+    mean = stats.mean(2)
+    # Windows that include the missing value are NaN, later windows recover.
+    assert np.isnan(mean[[0, 2, 3]]).all()
+    np.testing.assert_allclose(mean[[1, 4, 5, 6]], [1.5, 4.5, 5.5, 6.5])
+
+
+def test_rolling_statistics_over_columns() -> None:
+    values = np.column_stack([np.arange(10.0), np.full(10, 3.0)])
+    stats = RollingStatistics(values)
+
+    std = stats.std(4)
+    assert std.shape == (10, 2)
+    np.testing.assert_allclose(std[3:, 0], np.std([0, 1, 2, 3], ddof=1))
+    assert (std[3:, 1] == 0).all()
+
+
+def test_rolling_statistics_with_window_longer_than_data() -> None:
+    stats = RollingStatistics(np.arange(3.0))
+    assert np.isnan(stats.mean(5)).all()
+    with pytest.raises(ValueError):
+        stats.std(0)
@@ -0,0 +1,259 @@
+"""
+Contains tests for the budgeted parameter search strategies.
+"""
+
+import datetime
+import itertools
+
+import numpy as np
+import polars as pl
+import pytest
+
+from quant_trading_strategy_backtester import optimiser_core
+from quant_trading_strategy_backtester.models import StrategyModel
+from quant_trading_strategy_backtester.optimiser_core import (
+    evaluate_param_combinations,
+    optimise_strategy_params,
+)
+from quant_trading_strategy_backtester.search import (
+    ParameterRanges,
+    coarse_to_fine_search,
+    random_search,
+    search_strategy_params,
+    successive_halving,
+)
+
+PARAMETER_RANGES: ParameterRanges = {
+    "window": range(5, 61, 5),
+    "std_dev": [0.5, 1.0, 1.5, 2.0, 2.5],
+}
+GRID_SIZE = 12 * 5
+
+
+@pytest.fixture
+def data() -> pl.DataFrame:
+    rng = np.random.default_rng(5)
+    return pl.DataFrame(
+        {
+            "Date": [
+                datetime.date(2020, 1, 1) + datetime.timedelta(days=i)
+                for i in range(400)
+            ],
+            "Close": 100 * np.cumprod(1 + rng.normal(0, 0.02, size=400)),
+        }
+    )
+
+
+@pytest.fixture
+def evaluated(monkeypatch) -> list[tuple[int, list[dict]]]:
+    """Record the number of rows and the candidates of every evaluation."""
+    calls: list[tuple[int, list[dict]]] = []
+
+    def recording_evaluate(data, strategy_type, candidates, tickers):
+        calls.append((len(data), list(candidates)))
+        return evaluate_param_combinations(data, strategy_type, candidates, tickers)
+
+    monkeypatch.setattr(
+        optimiser_core, "evaluate_param_combinations", recording_evaluate
+    )
+    return calls
+
+
+def test_random_search_covering_the_grid_matches_grid_search(data) -> None:
+    params, metrics = optimise_strategy_params(
+        data, "Mean Reversion", PARAMETER_RANGES, "AAPL"
+    )
+
+    result = random_search(
+        data, "Mean Reversion", PARAMETER_RANGES, "AAPL", budget=1000, seed=1
+    )
+
+    assert result.params == params
+    assert result.metrics == pytest.approx(metrics, rel=0, abs=0, nan_ok=True)
+    assert result.num_backtests == GRID_SIZE + 1
+
+
+def test_random_search_respects_budget(data, evaluated) -> None:
+    result = random_search(
+        data, "Mean Reversion", PARAMETER_RANGES, "AAPL", budget=11, seed=3
+    )
+    again = random_search(
+        data, "Mean Reversion", PARAMETER_RANGES, "AAPL", budget=11, seed=3
+    )
+
+    assert result.num_backtests == 11
+    assert again.params == result.params
+    candidates = evaluated[0][1]
+    assert len(candidates) == 10
+    assert len({tuple(c.items()) for c in candidates}) == 10
+    grid = [
+        dict(zip(PARAMETER_RANGES, values))
+        for values in itertools.product(*PARAMETER_RANGES.values())
+    ]
+    assert all(candidate in grid for candidate in candidates)
+    assert result.params in candidates
+
+
+def test_successive_halving_scores_on_growing_slices(data, evaluated) -> None:
+    result = successive_halving(
+        data,
+        "Mean Reversion",
+        PARAMETER_RANGES,
+        "AAPL",
+        budget=40,
+        seed=0,
+        min_rows=50,
+    )
+
+    rows = [num_rows for num_rows, _ in evaluated]
+    sizes = [len(candidates) for _, candidates in evaluated]
+    assert rows == sorted(rows)
+    assert rows[-1] == len(data)
+    assert sizes == [27, 9, 3]
+    assert result.num_backtests == sum(sizes) + 1 <= 40
+    assert result.params in evaluated[-1][1]
+    # Each round keeps the candidates that scored best in the round before.
+    for (num_rows, candidates), (_, kept) in zip(evaluated, evaluated[1:]):
+        scores = [
+            metrics["Sharpe Ratio"]
+            for metrics in evaluate_param_combinations(
+                data.head(num_rows), "Mean Reversion", candidates, "AAPL"
+            )
+        ]
+        threshold = min(scores[candidates.index(candidate)] for candidate in kept)
+        assert sum(score > threshold for score in scores) < len(kept)
+
+
+def test_coarse_to_fine_search_with_dense_points_matches_grid_search(data) -> None:
+    params, _ = optimise_strategy_params(
+        data, "Mean Reversion", PARAMETER_RANGES, "AAPL"
+    )
+
+    result = coarse_to_fine_search(
+        data,
+        "Mean Reversion",
+        PARAMETER_RANGES,
+        "AAPL",
+        budget=1000,
+        points_per_axis=12,
+    )
+
+    assert result.params == params
+    assert result.num_backtests == GRID_SIZE + 1
+
+
+def test_coarse_to_fine_search_refines_without_repeats(data, evaluated) -> None:
+    result = coarse_to_fine_search(
+        data, "Mean Reversion", PARAMETER_RANGES, "AAPL", budget=30, points_per_axis=3
+    )
+
+    candidates = [
+        tuple(candidate.items()) for _, level in evaluated for candidate in level
+    ]
+    assert len(evaluated) > 1
+    assert len(candidates) == len(set(candidates))
+    assert result.num_backtests == len(candidates) + 1 <= 30
+    # The first level spans the ends of every range.
+    first_level = evaluated[0][1]
+    assert {candidate["window"] for candidate in first_level} == {5, 35, 60}
+    assert {candidate["std_dev"] for candidate in first_level} == {0.5, 1.5, 2.5}
+
+
+def test_search_strategy_params_dispatches_by_method(data) -> None:
+    result = search_strategy_params(
+        data,
+        "Mean Reversion",
+        PARAMETER_RANGES,
+        "AAPL",
+        method="random",
+        budget=8,
+        seed=2,
+    )
+    expected = random_search(
+        data, "Mean Reversion", PARAMETER_RANGES, "AAPL", budget=8, seed=2
+    )
+
+    assert result.params == expected.params
+    assert result.num_backtests == 8
+    grid = search_strategy_params(data, "Mean Reversion", PARAMETER_RANGES, "AAPL")
+    assert grid.num_backtests == GRID_SIZE + 1
+
+
+def test_search_strategy_params_rejects_unknown_method(data) -> None:
+    with pytest.raises(ValueError, match="Unknown search method"):
+        search_strategy_params(
+            data, "Mean Reversion", PARAMETER_RANGES, "AAPL", method="bayesian"
+        )
+
+
+@pytest.mark.parametrize("points_per_axis", [2, 3])
+def test_coarse_to_fine_search_stops_when_ranges_cannot_narrow(
+    data, evaluated, points_per_axis
+) -> None:
+    result = coarse_to_fine_search(
+        data,
+        "Mean Reversion",
+        PARAMETER_RANGES,
+        "AAPL",
+        budget=1000,
+        points_per_axis=points_per_axis,
+    )
+
+    candidates = [
+        tuple(candidate.items()) for _, level in evaluated for candidate in level
+    ]
+    assert len(candidates) == len(set(candidates))
+    assert result.num_backtests == len(candidates) + 1 < GRID_SIZE
+
+
+def test_random_search_in_parallel_and_lazily_matches_serial(data) -> None:
+    serial = random_search(
+        data, "Mean Reversion", PARAMETER_RANGES, "AAPL", budget=13, seed=6
+    )
+    parallel = random_search(
+        data,
+        "Mean Reversion",
+        PARAMETER_RANGES,
+        "AAPL",
+        budget=13,
+        seed=6,
+        n_jobs=2,
+        chunk_size=4,
+        lazy=True,
+    )
+
+    assert parallel.params == serial.params
+    assert parallel.metrics == pytest.approx(serial.metrics, rel=0, abs=0, nan_ok=True)
+    assert parallel.num_backtests == serial.num_backtests
+
+
+def test_successive_halving_saves_top_k_and_reports_progress(
+    monkeypatch, mock_db_session, data
+) -> None:
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.backtester.is_running_locally", lambda: True
+    )
+    monkeypatch.setattr(
+        "quant_trading_strategy_backtester.backtester.Session", lambda: mock_db_session
+    )
+    reports: list[float] = []
+
+    result = successive_halving(
+        data,
+        "Mean Reversion",
+        PARAMETER_RANGES,
+        "AAPL",
+        budget=40,
+        seed=0,
+        save_top_k=2,
+        progress=lambda fraction, _: reports.append(fraction),
+        min_rows=50,
+    )
+
+    saved = mock_db_session.query(StrategyModel).all()
+    assert len(saved) == 2
+    assert max(s.sharpe_ratio for s in saved) == pytest.approx(
+        result.metrics["Sharpe Ratio"]
+    )
+    # Each round reports its own progress up to completion.
+    assert reports.count(1.0) == 3
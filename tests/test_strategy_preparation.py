@@ -8,6 +8,7 @@ import pytest
 
 from quant_trading_strategy_backtester.optimiser import (
     optimise_single_ticker_strategy_ticker,
+    rank_single_ticker_strategy_tickers,
     run_backtest,
 )
 from quant_trading_strategy_backtester.strategy_preparation import (
@@ -71,45 +72,63 @@ def test_run_backtest_invalid_strategy() -> None:
 def test_optimise_single_ticker_strategy_ticker(monkeypatch):
     # Mock data and functions
     mock_top_companies = [("AAPL", 1000000.0), ("GOOGL", 900000.0), ("MSFT", 800000.0)]
-    mock_polars_data = pl.DataFrame(
-        {
-            "Date": [datetime.date(2020, 1, i) for i in range(1, 32)],
-            "Close": [100 + i for i in range(31)],
-        }
-    )
-
-    def mock_load_data(*args, **kwargs):
-        return mock_polars_data
 
-    def mock_run_backtest(*args, **kwargs):
-        strategy_type = args[1]
-        if strategy_type == "Triple EMA Crossover (TEMO)":
-            return None, {"Sharpe Ratio": 1.5}
-        elif strategy_type == "Mean Reversion":
-            return None, {"Sharpe Ratio": 1.2}
-        else:
-            return None, {"Sharpe Ratio": 1.0}
+    def mock_load_data(tickers, *args, **kwargs):
+        # Each ticker oscillates with a different period and trend.
+        return pl.concat(
+            [
+                pl.DataFrame(
+                    {
+                        "Date": [
+                            datetime.date(2020, 1, 1) + datetime.timedelta(days=i)
+                            for i in range(90)
+                        ],
+                        "Ticker": ticker,
+                        "Close": [
+                            100 + (i % (5 + j)) * 1.3 + i * 0.05 * j for i in range(90)
+                        ],
+                    }
+                )
+                for j, ticker in enumerate(tickers)
+            ]
+        )
 
     monkeypatch.setattr(
-        "quant_trading_strategy_backtester.optimiser_core.load_yfinance_data_one_ticker",
+        "quant_trading_strategy_backtester.optimiser_core.load_yfinance_data_many_tickers",
         mock_load_data,
     )
-    monkeypatch.setattr(
-        "quant_trading_strategy_backtester.optimiser_core.run_backtest",
-        mock_run_backtest,
-    )
 
     start_date = datetime.date(2020, 1, 1)
     end_date = datetime.date(2020, 12, 31)
-    strategy_type = "Triple EMA Crossover (TEMO)"
-    strategy_params = {}
+    strategy_type = "Mean Reversion"
+    strategy_params = {"window": [10, 20], "std_dev": 1.0}
 
     best_ticker = optimise_single_ticker_strategy_ticker(
         mock_top_companies, start_date, end_date, strategy_type, strategy_params
     )
+    rankings = rank_single_ticker_strategy_tickers(
+        mock_top_companies, start_date, end_date, strategy_type, strategy_params
+    )
 
-    assert isinstance(best_ticker, str)
-    assert best_ticker in [company[0] for company in mock_top_companies]
+    # The ranking matches running a backtest on each ticker in turn.
+    data = mock_load_data([ticker for ticker, _ in mock_top_companies])
+    sharpe_ratios = {
+        ticker: run_backtest(
+            data.filter(pl.col("Ticker") == ticker).drop("Ticker"),
+            strategy_type,
+            {"window": 10, "std_dev": 1.0},
+            ticker,
+            persist=False,
+        )[1]["Sharpe Ratio"]
+        for ticker, _ in mock_top_companies
+    }
+    assert rankings["Ticker"].to_list() == sorted(
+        sharpe_ratios, key=sharpe_ratios.__getitem__, reverse=True
+    )
+    assert rankings["Sharpe Ratio"].to_list() == pytest.approx(
+        sorted(sharpe_ratios.values(), reverse=True)
+    )
+    assert best_ticker == rankings["Ticker"][0]
 
 
 def test_prepare_single_ticker_strategy_with_optimisation(monkeypatch):
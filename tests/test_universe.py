@@ -0,0 +1,92 @@
+"""
+Contains tests for the universe snapshot.
+"""
+
+import datetime
+import os
+import threading
+
+import polars as pl
+import pytest
+
+from quant_trading_strategy_backtester.data import get_top_sp500_companies
+from quant_trading_strategy_backtester.universe import UniverseSnapshot
+
+
+class CountingFetcher:
+    """Returns a fixed universe and counts how often it is fetched."""
+
+    def __init__(self, universe: pl.DataFrame) -> None:
+        self.universe = universe
+        self.calls = 0
+        # When set, fetches wait for this event before returning.
+        self.gate: threading.Event | None = None
+
+    def __call__(self) -> pl.DataFrame:
+        if self.gate is not None:
+            self.gate.wait(timeout=10)
+        self.calls += 1
+        return self.universe
+
+
+def test_universe_snapshot_fetches_once_while_fresh(tmp_path, mock_universe):
+    fetch = CountingFetcher(mock_universe)
+    snapshot = UniverseSnapshot(
+        tmp_path / "universe.arrow", datetime.timedelta(days=1), fetch
+    )
+
+    first = snapshot.load()
+    second = snapshot.load()
+
+    assert fetch.calls == 1
+    assert second.equals(first)
+    assert second.columns == ["Ticker", "Market Cap", "Long Name", "Sector"]
+
+
+def test_universe_snapshot_refreshes_stale_snapshot_in_background(
+    tmp_path, mock_universe
+):
+    fetch = CountingFetcher(mock_universe)
+    path = tmp_path / "universe.arrow"
+    snapshot = UniverseSnapshot(path, datetime.timedelta(hours=1), fetch)
+    snapshot.load()
+    two_hours_ago = (datetime.datetime.now() - datetime.timedelta(hours=2)).timestamp()
+    os.utime(path, (two_hours_ago, two_hours_ago))
+
+    # Hold the refresh until the stale snapshot has been returned.
+    fetch.gate = threading.Event()
+    fetch.universe = mock_universe.head(1)
+
+    assert len(snapshot.load()) == len(mock_universe)
+    fetch.gate.set()
+    snapshot.wait_for_refresh()
+
+    assert fetch.calls == 2
+    assert not snapshot.is_stale()
+    assert len(snapshot.load()) == 1
+
+
+def test_universe_snapshot_keeps_snapshot_when_market_caps_are_missing(
+    tmp_path, mock_universe
+):
+    fetch = CountingFetcher(mock_universe)
+    snapshot = UniverseSnapshot(
+        tmp_path / "universe.arrow", datetime.timedelta(days=1), fetch
+    )
+    snapshot.load()
+    fetch.universe = mock_universe.with_columns(pl.lit(None).alias("Market Cap"))
+
+    with pytest.raises(ValueError, match="0 of 5 tickers"):
+        snapshot.refresh()
+
+    assert snapshot.load().equals(mock_universe)
+
+
+def test_get_top_sp500_companies_reads_snapshot():
+    assert get_top_sp500_companies(3) == [
+        ("AAPL", 3.5e12),
+        ("MSFT", 3.0e12),
+        ("GOOGL", 2.0e12),
+    ]
+    # Companies without a market cap are left out.
+    assert len(get_top_sp500_companies(0)) == 4